@@ -0,0 +1,172 @@
+# benchmarks/corpus.py
+"""
+Deterministic synthetic corpus generator: resumes and job descriptions as TXT, DOCX and PDF,
+with skills drawn from parser.ALL_SKILLS. The same arguments always produce byte-identical text,
+so benchmark runs on different commits see the same documents.
+
+    python benchmarks/corpus.py --output-dir /tmp/corpus --resumes 1000 --words 400 --skill-density 0.05
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from parser import ALL_SKILLS # noqa: E402
+
+FORMATS = ('txt', 'docx', 'pdf')
+SKILLS = sorted(ALL_SKILLS) # Sorted so the draw does not depend on set iteration order
+
+# Filler vocabulary; none of these are skills (or contain one as a whole word)
+FILLER_WORDS = (
+    "delivered", "owned", "improved", "designed", "built", "maintained", "led", "reviewed", "shipped",
+    "migrated", "reduced", "increased", "customer", "platform", "service", "team", "project", "feature",
+    "release", "pipeline", "latency", "throughput", "reliability", "internal", "external", "tooling",
+    "stakeholders", "requirements", "roadmap", "quarterly", "weekly", "production", "incident", "metrics",
+    "dashboard", "workflow", "onboarding", "billing", "search", "payments", "inventory", "reporting",
+    "across", "with", "for", "the", "and", "of", "to", "in", "a", "our", "new", "legacy", "large", "small",
+)
+RESUME_SECTIONS = ('Summary', 'Experience', 'Projects', 'Education')
+# Lines that parser._is_skill_line treats as explicit requirement / skill lines
+JOB_REQUIREMENT_PREFIXES = ('- Experience with', '- Proficiency in', '- Solid understanding of', '* Experience in')
+
+WORDS_PER_LINE = 12
+LINES_PER_PDF_PAGE = 50
+
+
+def _sentence_lines(rng, num_words, skill_density):
+    # A skill mention replaces a filler word with probability skill_density
+    words = [rng.choice(SKILLS) if rng.random() < skill_density else rng.choice(FILLER_WORDS) for _ in range(num_words)]
+    return [' '.join(words[i:i + WORDS_PER_LINE]) for i in range(0, len(words), WORDS_PER_LINE)]
+
+
+def make_resume_lines(rng, words=400, skill_density=0.05, listed_skills=8):
+    """
+    Lines of one synthetic resume: a name, a 'Skills' bullet list of 'listed_skills' skills and
+    about 'words' words of section text in which each word is a skill with probability skill_density.
+    """
+    lines = [f"Candidate {rng.randrange(10 ** 6):06d}", "Skills"]
+    lines += [f"- {skill}" for skill in rng.sample(SKILLS, listed_skills)]
+    words_per_section = max(1, words // len(RESUME_SECTIONS))
+    for section in RESUME_SECTIONS:
+        lines.append("")
+        lines.append(section)
+        lines += _sentence_lines(rng, words_per_section, skill_density)
+    return lines
+
+
+def make_job_lines(rng, words=250, skill_density=0.05, required_skills=10):
+    """
+    Lines of one synthetic job description: 'required_skills' skills on requirement lines
+    plus about 'words' words of description text.
+    """
+    lines = [f"Software Engineer {rng.randrange(10 ** 4):04d}", "", "About the role"]
+    lines += _sentence_lines(rng, words, skill_density)
+    lines += ["", "Requirements"]
+    lines += [f"{rng.choice(JOB_REQUIREMENT_PREFIXES)} {skill}" for skill in rng.sample(SKILLS, required_skills)]
+    return lines
+
+
+def write_txt(path, lines):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+def write_docx(path, lines):
+    import docx
+
+    document = docx.Document()
+    for line in lines:
+        document.add_paragraph(line)
+    document.save(path)
+
+
+def _pdf_escape(line):
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)').encode('latin-1', 'replace')
+
+
+def write_pdf(path, lines):
+    """
+    Writes a minimal text-only PDF (Helvetica, one text object per page) without any PDF library.
+    """
+    pages = [lines[i:i + LINES_PER_PDF_PAGE] for i in range(0, len(lines), LINES_PER_PDF_PAGE)] or [[]]
+    # Object numbers: 1 catalog, 2 page tree, 3 font, then a (page, content stream) pair per page
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % (4 + 2 * i) for i in range(len(pages))) + b"] /Count %d >>" % len(pages),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    for i, page_lines in enumerate(pages):
+        stream = b"BT /F1 10 Tf 14 TL 50 790 Td\n" + b"".join(b"(" + _pdf_escape(line) + b") Tj T*\n" for line in page_lines) + b"ET"
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] /Resources << /Font << /F1 3 0 R >> >> "
+                       b"/Contents %d 0 R >>" % (5 + 2 * i))
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    with open(path, 'wb') as f:
+        f.write(output)
+
+
+WRITERS = {'txt': write_txt, 'docx': write_docx, 'pdf': write_pdf}
+
+
+def generate_corpus(output_dir, num_resumes, num_jobs=1, formats=FORMATS, words=400, skill_density=0.05, seed=0):
+    """
+    Writes num_resumes resumes to output_dir/resumes and num_jobs job descriptions to output_dir/jobs,
+    cycling through 'formats'. Every document gets its own RNG derived from 'seed', so a corpus of
+    N documents is a prefix of a corpus of M > N documents with the same parameters.
+    An existing corpus with the same parameters (see manifest.json) is reused as is.
+    Returns the manifest.
+    """
+    manifest = {
+        'resumes': num_resumes, 'jobs': num_jobs, 'formats': list(formats),
+        'words': words, 'skill_density': skill_density, 'seed': seed,
+    }
+    manifest_path = os.path.join(output_dir, 'manifest.json')
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            if json.load(f) == manifest:
+                return manifest
+
+    for kind, count, make_lines in (('resumes', num_resumes, make_resume_lines), ('jobs', num_jobs, make_job_lines)):
+        kind_dir = os.path.join(output_dir, kind)
+        os.makedirs(kind_dir, exist_ok=True)
+        for i in range(count):
+            rng = random.Random(f"{seed}:{kind}:{i}")
+            lines = make_lines(rng, words=words if kind == 'resumes' else words * 5 // 8, skill_density=skill_density)
+            file_format = formats[i % len(formats)]
+            WRITERS[file_format](os.path.join(kind_dir, f"{kind[:-1]}_{i:06d}.{file_format}"), lines)
+
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--output-dir', required=True)
+    arg_parser.add_argument('--resumes', type=int, default=100)
+    arg_parser.add_argument('--jobs', type=int, default=1)
+    arg_parser.add_argument('--formats', nargs='+', choices=FORMATS, default=list(FORMATS))
+    arg_parser.add_argument('--words', type=int, default=400, help='Approximate words of section text per resume')
+    arg_parser.add_argument('--skill-density', type=float, default=0.05, help='Probability that a word is a skill mention')
+    arg_parser.add_argument('--seed', type=int, default=0)
+    args = arg_parser.parse_args()
+
+    generate_corpus(args.output_dir, args.resumes, args.jobs, tuple(args.formats), args.words, args.skill_density, args.seed)
+    print(f"Wrote {args.resumes} resumes and {args.jobs} job descriptions to {args.output_dir}")
+
+
+if __name__ == '__main__':
+    main()
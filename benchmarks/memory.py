@@ -0,0 +1,118 @@
+# benchmarks/memory.py
+"""
+Memory benchmark: bytes retained per parsed resume as a list of parse_resume dicts versus a
+CompactStore (with texts dropped, and with texts in an mmap'd blob file), measured with tracemalloc
+on a synthetic TXT corpus (see benchmarks/corpus.py). Also times scoring one JD on each
+representation and checks that CompactStore.score_job agrees with match_resumes_to_job (the pool score).
+
+    python benchmarks/memory.py --resumes 10000 --output memory.json
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.corpus import generate_corpus # noqa: E402
+from compact_store import CompactStore # noqa: E402
+from matcher import match_resumes_to_job # noqa: E402
+from parser import parse_job_description, parse_resume # noqa: E402
+
+DEFAULT_CORPUS_DIR = os.path.join(REPO_ROOT, 'benchmarks', '.corpus')
+
+
+def retained_bytes(build):
+    """
+    Calls build() and returns (result, bytes still allocated afterwards, peak bytes while building).
+    """
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    result = build()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current - baseline, peak - baseline
+
+
+def build_dicts(resume_paths):
+    return [parse_resume(file_path) for file_path in resume_paths]
+
+
+def build_store(resume_paths, text_path=None):
+    store = CompactStore(text_path)
+    for file_path in resume_paths:
+        store.add(parse_resume(file_path)) # The dict is dropped as soon as it is compacted
+    return store
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--resumes', type=int, default=10000)
+    arg_parser.add_argument('--words', type=int, default=400, help='Approximate words of section text per resume')
+    arg_parser.add_argument('--corpus-dir', default=DEFAULT_CORPUS_DIR)
+    arg_parser.add_argument('--output', help='Write the results as JSON to this file')
+    args = arg_parser.parse_args()
+
+    corpus_dir = os.path.join(args.corpus_dir, f'memory-n{args.resumes}-w{args.words}')
+    generate_corpus(corpus_dir, args.resumes, formats=('txt',), words=args.words)
+    resumes_dir = os.path.join(corpus_dir, 'resumes')
+    resume_paths = sorted(os.path.join(resumes_dir, name) for name in os.listdir(resumes_dir))
+    job_path = os.path.join(corpus_dir, 'jobs', sorted(os.listdir(os.path.join(corpus_dir, 'jobs')))[0])
+    job_description_data = parse_job_description(job_path)
+    build_store(resume_paths[:1]) # Warm-up: sklearn analyzer and other one-time allocations
+
+    results = {'resumes': len(resume_paths), 'words': args.words, 'representations': {}}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        text_path = os.path.join(tmp_dir, 'texts.bin')
+        builds = {
+            'dicts': lambda: build_dicts(resume_paths),
+            'compact': lambda: build_store(resume_paths),
+            'compact+text_blob': lambda: build_store(resume_paths, text_path),
+        }
+        representations = {}
+        for name, build in builds.items():
+            representation, retained, peak = retained_bytes(build)
+            representations[name] = representation
+            results['representations'][name] = {
+                'retained_mb': retained / 2 ** 20,
+                'bytes_per_resume': retained / len(resume_paths),
+                'peak_mb': peak / 2 ** 20,
+            }
+        results['representations']['compact+text_blob']['text_blob_mb'] = os.path.getsize(text_path) / 2 ** 20
+
+        resumes_data, store = representations['dicts'], representations['compact']
+        start = time.perf_counter()
+        reference_scores = match_resumes_to_job(resumes_data, job_description_data)
+        results['representations']['dicts']['score_job_seconds'] = time.perf_counter() - start
+        start = time.perf_counter()
+        compact_scores = store.score_job(job_description_data)
+        results['representations']['compact']['score_job_seconds'] = time.perf_counter() - start
+
+        results['max_score_difference'] = float(np.abs(compact_scores - reference_scores).max()) if len(resume_paths) else 0.0
+        representations['compact+text_blob'].close()
+
+    print(f"{len(resume_paths)} resumes, ~{args.words} words each")
+    for name, stats in results['representations'].items():
+        print(f"  {name:<18} {stats['retained_mb']:9.1f} MB retained  {stats['bytes_per_resume']:9.0f} B/resume  "
+              f"peak {stats['peak_mb']:8.1f} MB" + (f"  score {stats['score_job_seconds']:.3f}s" if 'score_job_seconds' in stats else ""))
+    dict_bytes = results['representations']['dicts']['bytes_per_resume']
+    compact_bytes = results['representations']['compact']['bytes_per_resume']
+    print(f"  compact is {dict_bytes / compact_bytes:.1f}x smaller; max |score difference| vs match_resumes_to_job: "
+          f"{results['max_score_difference']:.2e}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+# benchmarks/pdf_backends.py
+"""
+PDF backend benchmark: extraction time and text parity of each installed PDF backend in utils.py
+against the previous implementation (pdfminer.high_level.extract_text on the whole file).
+
+Parity is reported as exact text equality, word-level similarity (difflib ratio over
+whitespace-separated words, so spacing differences don't count) and the skills that
+parser.extract_skills finds in one text but not the other.
+
+    python benchmarks/pdf_backends.py --pdf-dir data --runs 5 --output pdf_backends.json
+    python benchmarks/pdf_backends.py --max-pages 1         # with a page budget
+"""
+import argparse
+import difflib
+import glob
+import json
+import os
+import statistics
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from parser import extract_skills # noqa: E402
+from utils import available_pdf_backends, extract_text_from_pdf # noqa: E402
+
+REFERENCE = 'pdfminer.extract_text'
+
+
+def _reference_text(pdf_path):
+    from pdfminer.high_level import extract_text
+
+    return extract_text(pdf_path)
+
+
+def time_extraction(extract, pdf_path, runs):
+    extract(pdf_path) # Warm-up: imports and font caches
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        text = extract(pdf_path)
+        samples.append(time.perf_counter() - start)
+    return text, statistics.median(samples)
+
+
+def compare_texts(text, reference_text):
+    words, reference_words = text.split(), reference_text.split()
+    skills, reference_skills = extract_skills(text), extract_skills(reference_text)
+    return {
+        'identical': text == reference_text,
+        'word_similarity': difflib.SequenceMatcher(None, words, reference_words, autojunk=False).ratio(),
+        'skills_missing': sorted(reference_skills - skills),
+        'skills_extra': sorted(skills - reference_skills),
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--pdf-dir', default=os.path.join(REPO_ROOT, 'data'))
+    arg_parser.add_argument('--backends', nargs='+', help='Backends to compare (default: every installed backend)')
+    arg_parser.add_argument('--runs', type=int, default=5, help='Timed runs per file and backend (median is reported)')
+    arg_parser.add_argument('--max-pages', type=int, help='Page budget passed to extract_text_from_pdf')
+    arg_parser.add_argument('--max-chars', type=int, help='Character budget passed to extract_text_from_pdf')
+    arg_parser.add_argument('--output', help='Write the results as JSON to this file')
+    args = arg_parser.parse_args()
+
+    pdf_paths = sorted(glob.glob(os.path.join(args.pdf_dir, '*.pdf')))
+    backends = available_pdf_backends(args.backends)
+    results = {'runs': args.runs, 'max_pages': args.max_pages, 'max_chars': args.max_chars, 'files': []}
+    totals = {name: 0.0 for name in [REFERENCE] + backends}
+
+    for pdf_path in pdf_paths:
+        reference_text, reference_seconds = time_extraction(_reference_text, pdf_path, args.runs)
+        totals[REFERENCE] += reference_seconds
+        entry = {'file': os.path.basename(pdf_path), 'reference_seconds': reference_seconds, 'backends': {}}
+        print(f"\n{entry['file']}: {REFERENCE} {reference_seconds * 1000:.1f} ms")
+        for backend in backends:
+            def extract(path, backend=backend):
+                return extract_text_from_pdf(path, backends=(backend,), max_pages=args.max_pages, max_chars=args.max_chars)
+
+            text, seconds = time_extraction(extract, pdf_path, args.runs)
+            totals[backend] += seconds
+            stats = {'seconds': seconds, 'speedup': reference_seconds / seconds if seconds else 0.0, 'chars': len(text)}
+            stats.update(compare_texts(text, reference_text))
+            entry['backends'][backend] = stats
+            print(f"  {backend:<10} {seconds * 1000:8.1f} ms  {stats['speedup']:5.1f}x  identical={stats['identical']!s:<5} "
+                  f"words={stats['word_similarity']:.3f}  skills -{stats['skills_missing']} +{stats['skills_extra']}")
+        results['files'].append(entry)
+
+    results['total_seconds'] = totals
+    print(f"\n--- Total over {len(pdf_paths)} PDFs ---")
+    for name, seconds in totals.items():
+        print(f"  {name:<22} {seconds * 1000:8.1f} ms")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
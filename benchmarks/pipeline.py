@@ -0,0 +1,207 @@
+# benchmarks/pipeline.py
+"""
+Pipeline benchmark: throughput and per-call latency percentiles for each stage of ranking,
+on synthetic corpora (see benchmarks/corpus.py) of several sizes.
+
+Stages, timed one call at a time in this process:
+    extract  utils.extract_text_from_file
+    skills   parser.segment_sections + parser.extract_skill_sections (as in parse_resume)
+    match    matcher.match_resume_to_job (one resume against the JD)
+and 'main', the end-to-end main.py run over the whole corpus directory (worker pool, cold parse cache).
+
+    python benchmarks/pipeline.py --sizes 10 1000 --output bench.json
+    python benchmarks/pipeline.py --sizes 10 1000 --compare bench.json   # after a change
+
+Corpora are generated once under --corpus-dir and reused while their parameters are unchanged.
+The 100k size takes a long time (generation included); --max-stage-docs limits the per-call
+stages to the first N documents while 'main' still runs over the whole corpus.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import main as main_module # noqa: E402
+from benchmarks.corpus import FORMATS, generate_corpus # noqa: E402
+from matcher import match_resume_to_job # noqa: E402
+from parser import extract_skill_sections, parse_job_description, segment_sections # noqa: E402
+from utils import extract_text_from_file # noqa: E402
+
+DEFAULT_SIZES = (10, 1000, 100000)
+DEFAULT_CORPUS_DIR = os.path.join(REPO_ROOT, 'benchmarks', '.corpus')
+PERCENTILES = (50, 90, 99)
+
+
+def latency_stats(samples):
+    """
+    Throughput and latency percentiles (ms) for a list of per-call durations in seconds.
+    """
+    samples = np.asarray(samples, dtype=np.float64)
+    total = float(samples.sum())
+    stats = {
+        'calls': len(samples),
+        'total_seconds': total,
+        'docs_per_second': len(samples) / total if total > 0 else 0.0,
+    }
+    for percentile in PERCENTILES:
+        stats[f'p{percentile}_ms'] = float(np.percentile(samples, percentile)) * 1000 if len(samples) else 0.0
+    stats['max_ms'] = float(samples.max()) * 1000 if len(samples) else 0.0
+    return stats
+
+
+def benchmark_stages(resume_paths, job_description_data):
+    """
+    Runs extract -> skills -> match for each resume, timing every call separately.
+    Each document is dropped after it is scored, so memory does not grow with the corpus.
+    """
+    timings = {'extract': [], 'skills': [], 'match': []}
+    # Warm-up call so lazy imports (sklearn) are not charged to the first document
+    match_resume_to_job(job_description_data, job_description_data)
+    for file_path in resume_paths:
+        start = time.perf_counter()
+        text = extract_text_from_file(file_path)
+        extracted = time.perf_counter()
+        skill_sections = extract_skill_sections(text, segment_sections(text))
+        skilled = time.perf_counter()
+        # match_resume_to_job only reads 'full_text', 'skills' and 'skill_sections', and does its own TF-IDF preprocessing
+        match_resume_to_job({'full_text': text.lower(), 'skills': set(skill_sections), 'skill_sections': skill_sections},
+                            job_description_data)
+        matched = time.perf_counter()
+        timings['extract'].append(extracted - start)
+        timings['skills'].append(skilled - extracted)
+        timings['match'].append(matched - skilled)
+    return {name: latency_stats(samples) for name, samples in timings.items()}
+
+
+def benchmark_main(resumes_dir, job_path, workers, repeat):
+    """
+    Times main.main() end to end over resumes_dir with a cold parse cache on every run.
+    Returns wall-time stats plus the per-stage metrics main itself reports for the last run.
+    """
+    wall_times = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        metrics_path = os.path.join(tmp_dir, 'metrics.json')
+        argv = ['--log-level', 'WARNING', '--metrics-json', metrics_path]
+        if workers:
+            argv += ['--workers', str(workers)]
+        patched = {'RESUMES_DIR': resumes_dir, 'JOB_DESCRIPTION_PATH': job_path}
+        original = {name: getattr(main_module, name) for name in list(patched) + ['PARSE_CACHE_PATH']}
+        try:
+            for name, value in patched.items():
+                setattr(main_module, name, value)
+            for run in range(repeat):
+                main_module.PARSE_CACHE_PATH = os.path.join(tmp_dir, f'cache-{run}.sqlite')
+                start = time.perf_counter()
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                    main_module.main(argv)
+                wall_times.append(time.perf_counter() - start)
+        finally:
+            for name, value in original.items():
+                setattr(main_module, name, value)
+        with open(metrics_path) as f:
+            run_metrics = json.load(f)
+
+    documents = run_metrics['documents']
+    return {
+        'runs': repeat,
+        'documents': documents,
+        'wall_seconds_median': float(np.median(wall_times)),
+        'wall_seconds_max': max(wall_times),
+        'docs_per_second': documents / float(np.median(wall_times)),
+        'stages': run_metrics['stages'],
+        'counters': run_metrics['counters'],
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_comparison(results, baseline):
+    baseline_sizes = {entry['documents']: entry for entry in baseline['sizes']}
+    print(f"\n--- Compared with {baseline.get('commit') or 'baseline'} (docs/sec, new / old) ---")
+    for entry in results['sizes']:
+        old = baseline_sizes.get(entry['documents'])
+        if old is None:
+            continue
+        rows = [(name, stats['docs_per_second'], old['stages'].get(name, {}).get('docs_per_second'))
+                for name, stats in entry['stages'].items()]
+        if 'main' in entry and 'main' in old:
+            rows.append(('main', entry['main']['docs_per_second'], old['main']['docs_per_second']))
+        for name, new_rate, old_rate in rows:
+            ratio = f"{new_rate / old_rate:5.2f}x" if old_rate else "  n/a"
+            print(f"{entry['documents']:>7} {name:<8} {new_rate:10.1f} / {old_rate or 0:10.1f}  {ratio}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help='Corpus sizes (number of resumes)')
+    arg_parser.add_argument('--corpus-dir', default=DEFAULT_CORPUS_DIR)
+    arg_parser.add_argument('--formats', nargs='+', choices=FORMATS, default=list(FORMATS))
+    arg_parser.add_argument('--words', type=int, default=400, help='Approximate words of section text per resume')
+    arg_parser.add_argument('--skill-density', type=float, default=0.05, help='Probability that a word is a skill mention')
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--max-stage-docs', type=int, help='Only time the per-call stages on the first N documents')
+    arg_parser.add_argument('--skip-main', action='store_true', help='Skip the end-to-end main.py run')
+    arg_parser.add_argument('--workers', type=int, help='Parser processes for the main.py run (default: one per CPU)')
+    arg_parser.add_argument('--repeat', type=int, default=1, help='Number of main.py runs per size')
+    arg_parser.add_argument('--output', help='Write the results as JSON to this file')
+    arg_parser.add_argument('--compare', help='Print a throughput comparison with an earlier --output file')
+    args = arg_parser.parse_args()
+
+    results = {
+        'commit': git_commit(),
+        'python': sys.version,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'corpus': {'formats': args.formats, 'words': args.words, 'skill_density': args.skill_density, 'seed': args.seed},
+        'sizes': [],
+    }
+    for size in args.sizes:
+        corpus_dir = os.path.join(args.corpus_dir, f'n{size}')
+        generate_start = time.perf_counter()
+        generate_corpus(corpus_dir, size, num_jobs=1, formats=tuple(args.formats), words=args.words,
+                        skill_density=args.skill_density, seed=args.seed)
+        print(f"Corpus of {size} resumes ready in {time.perf_counter() - generate_start:.1f}s: {corpus_dir}")
+
+        resumes_dir = os.path.join(corpus_dir, 'resumes')
+        job_path = os.path.join(corpus_dir, 'jobs', sorted(os.listdir(os.path.join(corpus_dir, 'jobs')))[0])
+        resume_paths = sorted(os.path.join(resumes_dir, name) for name in os.listdir(resumes_dir))
+        job_description_data = parse_job_description(job_path)
+
+        entry = {'documents': size, 'stages': benchmark_stages(resume_paths[:args.max_stage_docs], job_description_data)}
+        if not args.skip_main:
+            entry['main'] = benchmark_main(resumes_dir, job_path, args.workers, args.repeat)
+        results['sizes'].append(entry)
+
+        for name, stats in entry['stages'].items():
+            print(f"{size:>7} {name:<8} {stats['docs_per_second']:10.1f} docs/s  "
+                  + "  ".join(f"p{p} {stats[f'p{p}_ms']:7.2f} ms" for p in PERCENTILES))
+        if 'main' in entry:
+            print(f"{size:>7} {'main':<8} {entry['main']['docs_per_second']:10.1f} docs/s  "
+                  f"wall {entry['main']['wall_seconds_median']:.2f}s")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(results, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/skill_matching.py
+"""
+Skill matching benchmark: compile time of the skill matcher and per-document scan time as the alias
+table grows. Synthetic aliases (random one- and two-word phrases, each mapped to a random canonical
+skill) are added to the taxonomy's own aliases and scanned over synthetic resume texts
+(see benchmarks/corpus.py).
+
+    python benchmarks/skill_matching.py --aliases 0 1000 5000 20000 --output skill_matching.json
+"""
+import argparse
+import json
+import os
+import random
+import string
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.corpus import make_resume_lines # noqa: E402
+from parser import ALL_SKILLS, SKILL_TAXONOMY, SkillMatcher # noqa: E402
+
+
+def synthetic_aliases(aliases, num_aliases, rng):
+    aliases = dict(aliases)
+    skills = sorted(ALL_SKILLS)
+    target = len(aliases) + num_aliases
+    while len(aliases) < target:
+        words = [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10))) for _ in range(rng.randint(1, 2))]
+        aliases.setdefault(' '.join(words), (rng.choice(skills),))
+    return aliases
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--aliases', type=int, nargs='+', default=[0, 1000, 5000, 20000], help='Synthetic aliases to add')
+    arg_parser.add_argument('--documents', type=int, default=300)
+    arg_parser.add_argument('--words', type=int, default=400)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--output', help='Write the results as JSON to this file')
+    args = arg_parser.parse_args()
+
+    texts = ['\n'.join(make_resume_lines(random.Random(f"{args.seed}:resumes:{i}"), words=args.words)).lower()
+             for i in range(args.documents)]
+    results = {'documents': args.documents, 'words': args.words, 'runs': []}
+    for num_aliases in args.aliases:
+        aliases = synthetic_aliases(SKILL_TAXONOMY.aliases, num_aliases, random.Random(args.seed))
+        start = time.perf_counter()
+        matcher = SkillMatcher(aliases)
+        compile_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        for text in texts:
+            for _ in matcher.finditer(text):
+                pass
+        scan_seconds = time.perf_counter() - start
+        run = {
+            'aliases': len(aliases),
+            'compile_ms': compile_seconds * 1000,
+            'scan_us_per_doc': scan_seconds / len(texts) * 1e6,
+        }
+        results['runs'].append(run)
+        print(f"{run['aliases']:>7} aliases: compile {run['compile_ms']:7.1f} ms, scan {run['scan_us_per_doc']:7.1f} us/doc")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
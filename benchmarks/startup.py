@@ -0,0 +1,83 @@
+# benchmarks/startup.py
+"""
+Startup benchmark: measures the time and peak RSS of importing the matcher modules in a fresh
+interpreter, and checks that heavy dependencies (spaCy, sklearn, pdfminer, ...) are not loaded
+at import time. Exits non-zero if a budget is exceeded, so it can gate regressions.
+
+    python benchmarks/startup.py --runs 5 --output startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('spacy', 'sklearn', 'scipy', 'pdfminer', 'docx')
+
+# Runs in a child interpreter so every measurement starts from a cold import
+_PROBE = '''
+import json, resource, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{
+    'import_seconds': elapsed,
+    'max_rss_mb': rss_kb / 1024 if sys.platform != 'darwin' else rss_kb / (1024 * 1024),
+    'heavy_modules_loaded': sorted(name for name in {heavy!r} if name in sys.modules),
+}}))
+'''
+
+
+def measure_import(module, runs):
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return {
+        'module': module,
+        'runs': runs,
+        'import_seconds_median': statistics.median(s['import_seconds'] for s in samples),
+        'import_seconds_max': max(s['import_seconds'] for s in samples),
+        'max_rss_mb_median': statistics.median(s['max_rss_mb'] for s in samples),
+        'heavy_modules_loaded': samples[-1]['heavy_modules_loaded'],
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--modules', nargs='+', default=['parser', 'matcher', 'utils', 'main'])
+    arg_parser.add_argument('--runs', type=int, default=5)
+    arg_parser.add_argument('--max-seconds', type=float, default=1.0, help='Budget for the median import time of each module')
+    arg_parser.add_argument('--max-rss-mb', type=float, default=150.0, help='Budget for the median peak RSS of each module')
+    arg_parser.add_argument('--output', help='Write the results as JSON to this file')
+    args = arg_parser.parse_args()
+
+    results = [measure_import(module, args.runs) for module in args.modules]
+    failures = []
+    for result in results:
+        print(f"{result['module']:>10}: {result['import_seconds_median'] * 1000:7.1f} ms, "
+              f"{result['max_rss_mb_median']:6.1f} MB RSS, heavy modules: {result['heavy_modules_loaded'] or 'none'}")
+        if result['import_seconds_median'] > args.max_seconds:
+            failures.append(f"{result['module']}: import took {result['import_seconds_median']:.2f}s (budget {args.max_seconds}s)")
+        if result['max_rss_mb_median'] > args.max_rss_mb:
+            failures.append(f"{result['module']}: RSS {result['max_rss_mb_median']:.1f} MB (budget {args.max_rss_mb} MB)")
+        if result['heavy_modules_loaded']:
+            failures.append(f"{result['module']}: loads {', '.join(result['heavy_modules_loaded'])} at import time")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'python': sys.version, 'results': results, 'failures': failures}, f, indent=2)
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+# benchmarks/streaming.py
+"""
+Streaming memory check: runs the bounded-memory pipeline (ingest.iter_resume_scores + top_k_resumes)
+over a synthetic corpus of --resumes documents and checks that the peak RSS of the parent process
+stops growing once the pipeline is warm. To keep disk use small, --distinct synthetic TXT resumes
+(see benchmarks/corpus.py) are written once and the stream cycles over them. Exits non-zero if the
+peak RSS grows by more than --max-growth-mb between the end of warm-up and the end of the run,
+so it can gate regressions.
+
+    python benchmarks/streaming.py --resumes 100000 --workers 8 --output streaming.json
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.corpus import make_job_lines, make_resume_lines, write_txt # noqa: E402
+from ingest import iter_resume_scores, top_k_resumes # noqa: E402
+from parser import extract_required_skills # noqa: E402
+
+WARMUP_FRACTION = 0.1 # Share of the stream processed before the baseline RSS is taken
+
+
+def peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 if sys.platform != 'darwin' else rss / (1024 * 1024)
+
+
+def measure_streaming(file_paths, job_description_data, num_resumes, workers=None, top_k=10):
+    """
+    Streams num_resumes documents (cycling over file_paths) through iter_resume_scores into a
+    top-K heap. Returns the peak RSS of this process after warm-up (of the parsing pass) and at the end, in MB.
+    """
+    warmup = max(1, int(num_resumes * WARMUP_FRACTION))
+    result = {'resumes': num_resumes, 'workers': workers, 'top_k': top_k}
+
+    def file_stream():
+        # Scores only come out once every file has been parsed (pool IDF), so warm-up is counted on the input side
+        for submitted, file_path in enumerate(itertools.islice(itertools.cycle(file_paths), num_resumes), 1):
+            if submitted == warmup:
+                result['warm_rss_mb'] = peak_rss_mb()
+            yield file_path
+
+    def records():
+        scored = 0
+        for scored, record in enumerate(iter_resume_scores(file_stream(), job_description_data, max_workers=workers), 1):
+            yield record
+        result['scored'] = scored
+
+    start = time.perf_counter()
+    result['top'] = [(os.path.basename(file_path), score) for file_path, score, _ in top_k_resumes(records(), top_k)]
+    result['seconds'] = time.perf_counter() - start
+    result['final_rss_mb'] = peak_rss_mb()
+    result['rss_growth_mb'] = result['final_rss_mb'] - result['warm_rss_mb']
+    return result
+
+
+def write_resumes(output_dir, num_resumes, words, seed):
+    paths = []
+    for i in range(num_resumes):
+        path = os.path.join(output_dir, f'resume_{i:05d}.txt')
+        write_txt(path, make_resume_lines(random.Random(f"{seed}:resumes:{i}"), words=words))
+        paths.append(path)
+    return paths
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--resumes', type=int, default=100000, help='Documents streamed through the pipeline')
+    arg_parser.add_argument('--distinct', type=int, default=2000, help='Distinct resume files written (the stream cycles over them)')
+    arg_parser.add_argument('--words', type=int, default=400)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--workers', type=int, help='Parser processes (default: one per CPU; 1 parses in-process)')
+    arg_parser.add_argument('--top-k', type=int, default=10)
+    arg_parser.add_argument('--max-growth-mb', type=float, default=32.0, help='Budget for peak RSS growth after warm-up')
+    arg_parser.add_argument('--output', help='Write the results as JSON to this file')
+    args = arg_parser.parse_args()
+
+    job_text = '\n'.join(make_job_lines(random.Random(f"{args.seed}:jobs:0")))
+    job_description_data = {'full_text': job_text.lower(), 'required_skills': extract_required_skills(job_text)}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_paths = write_resumes(tmp_dir, min(args.distinct, args.resumes), args.words, args.seed)
+        result = measure_streaming(file_paths, job_description_data, args.resumes, args.workers, args.top_k)
+
+    print(f"{result['scored']} resumes in {result['seconds']:.1f}s: peak RSS {result['warm_rss_mb']:.1f} MB after warm-up, "
+          f"{result['final_rss_mb']:.1f} MB at the end (+{result['rss_growth_mb']:.1f} MB)")
+    failures = []
+    if result['rss_growth_mb'] > args.max_growth_mb:
+        failures.append(f"peak RSS grew by {result['rss_growth_mb']:.1f} MB after warm-up (budget {args.max_growth_mb} MB)")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(dict(result, failures=failures), f, indent=2)
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
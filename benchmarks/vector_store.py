@@ -0,0 +1,81 @@
+# benchmarks/vector_store.py
+"""
+Vector store benchmark: build time, on-disk size, open time and per-JD scoring time of a
+VectorStore as the pool grows. Resumes are synthetic (see benchmarks/corpus.py) and are
+generated in memory, so no files are parsed; the store is built once per size and reused.
+
+    python benchmarks/vector_store.py --sizes 1000 10000 100000 1000000 --output vector_store.json
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.corpus import make_job_lines, make_resume_lines # noqa: E402
+from parser import extract_required_skills, extract_skills # noqa: E402
+from vector_store import VectorStore # noqa: E402
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_STORE_DIR = os.path.join(REPO_ROOT, 'benchmarks', '.corpus', 'vector_stores')
+
+
+def synthetic_resumes(num_resumes, words, seed):
+    for i in range(num_resumes):
+        text = '\n'.join(make_resume_lines(random.Random(f"{seed}:resumes:{i}"), words=words))
+        yield f"resume_{i:07d}.txt", {'full_text': text.lower(), 'skills': extract_skills(text)}
+
+
+def directory_bytes(path):
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    arg_parser.add_argument('--words', type=int, default=400)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--runs', type=int, default=5, help='Timed opens / JD scorings per size (median is reported)')
+    arg_parser.add_argument('--store-dir', default=DEFAULT_STORE_DIR)
+    arg_parser.add_argument('--output', help='Write the results as JSON to this file')
+    args = arg_parser.parse_args()
+
+    job_text = '\n'.join(make_job_lines(random.Random(f"{args.seed}:jobs:0")))
+    job_description_data = {'full_text': job_text.lower(), 'required_skills': extract_required_skills(job_text)}
+    results = {'words': args.words, 'sizes': []}
+    for size in args.sizes:
+        store_dir = os.path.join(args.store_dir, f'n{size}-w{args.words}-s{args.seed}')
+        entry = {'resumes': size}
+        if not VectorStore.is_current(store_dir):
+            start = time.perf_counter()
+            VectorStore.build(store_dir, synthetic_resumes(size, args.words, args.seed))
+            entry['build_seconds'] = time.perf_counter() - start
+        entry['store_mb'] = directory_bytes(store_dir) / 2 ** 20
+
+        open_times, score_times = [], []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            vector_store = VectorStore.open(store_dir)
+            open_times.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            vector_store.score_job(job_description_data)
+            score_times.append(time.perf_counter() - start)
+        entry['open_ms'] = statistics.median(open_times) * 1000
+        entry['score_job_ms'] = statistics.median(score_times) * 1000
+        results['sizes'].append(entry)
+        print(f"{size:>8} resumes: store {entry['store_mb']:8.1f} MB, open {entry['open_ms']:6.2f} ms, "
+              f"score one JD {entry['score_job_ms']:9.1f} ms"
+              + (f", built in {entry['build_seconds']:.1f}s" if 'build_seconds' in entry else ""))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+# compact_store.py
+import mmap
+import os
+from array import array
+from collections import Counter
+
+import numpy as np
+
+from ingest import parse_resumes_parallel
+from instrumentation import stage
+from matcher import combine_scores, pool_general_similarity, preprocess_text_for_tfidf, tfidf_analyzer, zero_jobs_without_text
+from skill_index import SkillIndex
+from skill_taxonomy import SKILL_TAXONOMY
+
+# Skill IDs for the default taxonomy are the taxonomy's canonical IDs (sorted order), so they agree across
+# stores and processes; skills outside it get IDs after these. array('H') holds up to 65536 distinct skills.
+DEFAULT_SKILL_IDS = dict(SKILL_TAXONOMY.ids)
+
+
+class CompactDocument:
+    """
+    Lightweight view of one document in a CompactStore (created on access, not stored).
+    """
+    __slots__ = ('store', 'doc_id')
+
+    def __init__(self, store, doc_id):
+        self.store = store
+        self.doc_id = doc_id
+
+    @property
+    def file_name(self):
+        return self.store.file_names[self.doc_id]
+
+    @property
+    def skills(self):
+        return self.store.skills_of(self.doc_id)
+
+    @property
+    def text(self):
+        return self.store.text_of(self.doc_id)
+
+    def __repr__(self):
+        return f"CompactDocument({self.file_name!r}, {len(self.skills)} skills)"
+
+
+class CompactStore:
+    """
+    Columnar, low-overhead representation of parsed resumes, in place of a list of parse_resume dicts.
+    Per document it keeps:
+      - interned skill IDs (array('H')), instead of a set of strings
+      - TF-IDF term IDs and counts (flat array('I') columns with offsets), instead of the processed text
+    Texts are dropped once counted, or appended to a blob file ('text_path') and read back through mmap.
+    Flat columns cost a few bytes per skill/term and no Python objects per document beyond the file name;
+    score_jobs() works directly on them. The store is a pool for matcher.rank_resumes_two_stage and
+    two_stage_recall_report, like matcher.ResumePool.
+    """
+
+    def __init__(self, text_path=None):
+        self.skill_ids = dict(DEFAULT_SKILL_IDS) # skill -> skill ID
+        self.skills = sorted(DEFAULT_SKILL_IDS, key=DEFAULT_SKILL_IDS.get) # skill ID -> skill
+        self.vocabulary = {} # term -> term ID (grow-only)
+        self.file_names = []
+        self.doc_skill_ids = array('H')
+        self.skill_offsets = array('Q', [0])
+        self.term_ids = array('I')
+        self.term_counts = array('I')
+        self.term_offsets = array('Q', [0])
+        self.text_path = text_path
+        self.text_offsets = array('Q', [0])
+        self._text_file = open(text_path, 'ab+') if text_path else None
+        self._text_map = None
+
+    def __len__(self):
+        return len(self.file_names)
+
+    def __getitem__(self, doc_id):
+        if not 0 <= doc_id < len(self):
+            raise IndexError(doc_id)
+        return CompactDocument(self, doc_id)
+
+    def close(self):
+        if self._text_map is not None:
+            self._text_map.close()
+            self._text_map = None
+        if self._text_file is not None:
+            self._text_file.close()
+            self._text_file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _intern_skill(self, skill):
+        skill_id = self.skill_ids.get(skill)
+        if skill_id is None:
+            skill_id = self.skill_ids[skill] = len(self.skills)
+            self.skills.append(skill)
+        return skill_id
+
+    def add(self, resume_data):
+        """
+        Adds a parsed resume (from parse_resume) and returns its document ID. Nothing in the
+        dict is referenced afterwards, so the caller can drop it right away.
+        """
+        term_counts = Counter(tfidf_analyzer()(preprocess_text_for_tfidf(resume_data.get('full_text', ''))))
+        for term, count in term_counts.items():
+            self.term_ids.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+            self.term_counts.append(count)
+        self.term_offsets.append(len(self.term_ids))
+
+        self.doc_skill_ids.extend(sorted(self._intern_skill(skill) for skill in set(resume_data.get('skills', []))))
+        self.skill_offsets.append(len(self.doc_skill_ids))
+
+        if self._text_file is not None:
+            self._text_file.seek(0, os.SEEK_END)
+            self._text_file.write(resume_data.get('full_text', '').encode('utf-8'))
+            self.text_offsets.append(self._text_file.tell())
+        self.file_names.append(resume_data.get('file_name', ''))
+        return len(self.file_names) - 1
+
+    def add_files(self, file_paths, max_workers=None, cache_path=None):
+        """
+        Parses resumes with ingest.parse_resumes_parallel and compacts each one as it arrives,
+        so at most a few chunks of full parse dicts are alive at a time.
+        Returns the file paths that failed to parse.
+        """
+        failed = []
+        for file_path, resume_data in parse_resumes_parallel(file_paths, max_workers=max_workers, cache_path=cache_path):
+            if resume_data is None:
+                failed.append(file_path)
+            else:
+                self.add(resume_data)
+        return failed
+
+    def skills_of(self, doc_id):
+        return {self.skills[skill_id] for skill_id in self.doc_skill_ids[self.skill_offsets[doc_id]:self.skill_offsets[doc_id + 1]]}
+
+    def text_of(self, doc_id):
+        """
+        The processed text of a document, read from the mmap'd text blob (None if texts are not kept).
+        """
+        if self._text_file is None:
+            return None
+        end = self.text_offsets[doc_id + 1]
+        if self._text_map is None or len(self._text_map) < end:
+            self._text_file.flush()
+            if self._text_map is not None:
+                self._text_map.close()
+            self._text_map = mmap.mmap(self._text_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._text_map[self.text_offsets[doc_id]:end].decode('utf-8')
+
+    def nbytes(self):
+        """
+        Bytes held by the columns (excluding the vocabularies and file names).
+        """
+        columns = (self.doc_skill_ids, self.skill_offsets, self.term_ids, self.term_counts, self.term_offsets,
+                   self.text_offsets)
+        return sum(column.itemsize * len(column) for column in columns)
+
+    def skill_index(self):
+        """
+        SkillIndex over the stored documents, keyed by document ID (stage 1 of two-stage ranking).
+        """
+        skill_index = SkillIndex()
+        for doc_id in range(len(self)):
+            skill_index.add(doc_id, self.skills_of(doc_id))
+        return skill_index
+
+    def term_count_matrix(self):
+        """
+        (num_docs, num_terms) sparse term-count matrix over the store's vocabulary, as matcher.term_count_matrix.
+        """
+        from scipy.sparse import csr_matrix
+
+        # Zero-copy NumPy views of the array columns
+        term_ids = np.frombuffer(self.term_ids, dtype=np.uint32)
+        term_counts = np.frombuffer(self.term_counts, dtype=np.uint32).astype(np.float64)
+        term_offsets = np.frombuffer(self.term_offsets, dtype=np.uint64).astype(np.int64)
+        return csr_matrix((term_counts, term_ids, term_offsets), shape=(len(self), len(self.vocabulary)))
+
+    def required_skills_coverage(self, jobs_data, doc_ids=None):
+        """
+        (num_jobs, num_docs) required-skill coverage of the documents at 'doc_ids' (all if None),
+        as matcher.required_skills_coverage_matrix.
+        """
+        from scipy.sparse import csr_matrix
+
+        doc_skill_ids = np.frombuffer(self.doc_skill_ids, dtype=np.uint16)
+        doc_skills = csr_matrix((np.ones(len(doc_skill_ids)), doc_skill_ids,
+                                 np.frombuffer(self.skill_offsets, dtype=np.uint64).astype(np.int64)), shape=(len(self), len(self.skills)))
+        if doc_ids is not None:
+            doc_skills = doc_skills[doc_ids]
+        # Required skills no document has count toward the required weight but can't be matched
+        job_skills = np.zeros((len(jobs_data), len(self.skills)))
+        required_weights = np.zeros((len(jobs_data), 1))
+        for j, job_data in enumerate(jobs_data):
+            for skill in set(job_data.get('required_skills', [])):
+                required_weights[j] += SKILL_TAXONOMY.weight(skill)
+                if skill in self.skill_ids:
+                    job_skills[j, self.skill_ids[skill]] = SKILL_TAXONOMY.weight(skill)
+        matched_weights = np.asarray(doc_skills @ job_skills.T).T
+        return np.divide(matched_weights, required_weights, out=np.zeros_like(matched_weights), where=required_weights > 0)
+
+    def score_jobs(self, jobs_data, doc_ids=None):
+        """
+        Scores the documents at 'doc_ids' (all if None) against each job description, straight from
+        the columns. Scores (0-100, a (num_jobs, num_docs) NumPy array) are the pool score of
+        matcher.match_resumes_to_job over every stored document, whichever documents are scored.
+        """
+        with stage('vectorize'):
+            counts = self.term_count_matrix()
+        with stage('score'):
+            general_similarity = pool_general_similarity(counts, self.vocabulary, jobs_data, doc_ids)
+            required_skills_score_component = self.required_skills_coverage(jobs_data, doc_ids)
+            final_scores = combine_scores(required_skills_score_component, general_similarity)
+        zero_jobs_without_text(final_scores, jobs_data)
+        return final_scores
+
+    def score_job(self, job_description_data, doc_ids=None):
+        """
+        score_jobs for a single job description; returns a NumPy array in document order.
+        """
+        return self.score_jobs([job_description_data], doc_ids)[0]
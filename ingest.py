@@ -0,0 +1,270 @@
+# ingest.py
+import contextlib
+import heapq
+import itertools
+import logging
+import os
+import pickle
+import signal
+import tempfile
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing.util import Finalize
+
+import numpy as np
+
+from parser import parse_resume, parse_cache_version
+from parse_cache import ParseCache
+from matcher import (combine_scores, job_vectors, make_required_skills_scorer, pooled_idf, pooled_similarity, preprocess_text_for_tfidf,
+                     term_counts)
+import instrumentation
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 4 # Files per task sent to a worker (amortizes inter-process overhead)
+DEFAULT_FILE_TIMEOUT = 60 # Seconds one file may take before it is abandoned
+SCORE_BATCH_SIZE = 1024 # Spooled resumes scored per sparse matrix product in iter_resume_scores' second pass
+RESUME_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+
+class ParseTimeout(BaseException):
+    # BaseException so the broad `except Exception` handlers in utils.py don't swallow it
+    pass
+
+
+# Per-process state, set up by _init_worker; each worker opens its own SQLite connection
+_worker_cache = None
+_worker_scorer = None
+
+
+def _init_worker(cache_path, job_description_data=None):
+    global _worker_cache, _worker_scorer
+    # Forked workers inherit the parent's metrics so far; start from zero so nothing is counted twice
+    instrumentation.reset()
+    if cache_path:
+        # The parent already purged stale entries (see _run_chunks); the connection is closed when the worker exits
+        _worker_cache = ParseCache(cache_path, parse_cache_version, purge=False)
+        Finalize(_worker_cache, _worker_cache.close, exitpriority=10)
+    if job_description_data is not None:
+        _worker_scorer = make_required_skills_scorer(job_description_data)
+
+
+def _raise_timeout(signum, frame):
+    raise ParseTimeout()
+
+
+@contextlib.contextmanager
+def time_limit(timeout):
+    """
+    Raises ParseTimeout inside the block once 'timeout' seconds have passed (None or 0: no limit).
+    SIGALRM is only available on Unix and can only be installed from the main thread;
+    elsewhere the block runs without a time limit.
+    """
+    use_alarm = bool(timeout) and hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread()
+    if use_alarm:
+        previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        yield
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+
+
+def _parse_one(file_path, timeout, cache):
+    try:
+        with time_limit(timeout):
+            return parse_resume(file_path, cache=cache)
+    except ParseTimeout:
+        logger.warning("Timed out after %ss parsing %s", timeout, file_path)
+        instrumentation.count('timeouts')
+        return None
+    except Exception as e:
+        logger.error("Error parsing %s: %s", file_path, e)
+        instrumentation.count('parse_errors')
+        return None
+
+
+def _summarize_one(file_path, timeout, cache, scorer):
+    # Only the term counts, skill coverage and matched skills leave this function; the parsed text is dropped here
+    resume_data = _parse_one(file_path, timeout, cache)
+    if resume_data is None:
+        return None
+    with instrumentation.stage('vectorize'):
+        resume_term_counts = term_counts(resume_data)
+    with instrumentation.stage('score'):
+        return (resume_term_counts,) + scorer(resume_data)
+
+
+# Chunk tasks also return the worker's stage timers/counters for the chunk, merged by the parent
+def _parse_chunk(file_paths, timeout):
+    return [_parse_one(file_path, timeout, _worker_cache) for file_path in file_paths], instrumentation.collect()
+
+
+def _summarize_chunk(file_paths, timeout):
+    return [_summarize_one(file_path, timeout, _worker_cache, _worker_scorer) for file_path in file_paths], instrumentation.collect()
+
+
+def _run_chunks(chunk_func, file_paths, max_workers, chunksize, timeout, cache_path, ordered, job_description_data=None):
+    """
+    Runs chunk_func over chunks of file_paths in a process pool and yields (file_path, result) pairs.
+    file_paths is consumed lazily and at most 2 * max_workers chunks are outstanding at any time,
+    so memory stays bounded no matter how many files there are.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    max_outstanding = 2 * max_workers
+    file_paths = iter(file_paths)
+    if cache_path:
+        # Purge stale entries once here rather than in every worker, where the deletes would contend for the write lock
+        ParseCache(cache_path, parse_cache_version).close()
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(cache_path, job_description_data)) as executor:
+        pending = {} # future -> chunk index
+        chunks = {} # chunk index -> file paths, until yielded
+        finished = {} # chunk index -> results, waiting for earlier chunks (ordered mode only)
+        next_submit = next_yield = 0
+        exhausted = False
+        while True:
+            while not exhausted and next_submit - next_yield < max_outstanding:
+                chunk = list(itertools.islice(file_paths, chunksize))
+                if not chunk:
+                    exhausted = True
+                    break
+                chunks[next_submit] = chunk
+                pending[executor.submit(chunk_func, chunk, timeout)] = next_submit
+                next_submit += 1
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk_index = pending.pop(future)
+                results, worker_metrics = future.result()
+                instrumentation.merge(worker_metrics)
+                if ordered:
+                    finished[chunk_index] = results
+                else:
+                    yield from zip(chunks.pop(chunk_index), results)
+                    next_yield += 1
+
+            while next_yield in finished:
+                yield from zip(chunks.pop(next_yield), finished.pop(next_yield))
+                next_yield += 1
+
+
+def iter_resume_files(resumes_dir, exclude=()):
+    """
+    Lazily yields paths of resume files (PDF, DOCX, TXT) in resumes_dir, skipping names in 'exclude'.
+    """
+    with os.scandir(resumes_dir) as entries:
+        for entry in entries:
+            if entry.name in exclude or not entry.is_file():
+                continue
+            if entry.name.lower().endswith(RESUME_EXTENSIONS):
+                yield entry.path
+
+
+def parse_resumes_parallel(file_paths, max_workers=None, chunksize=DEFAULT_CHUNK_SIZE, timeout=DEFAULT_FILE_TIMEOUT,
+                           cache_path=None, ordered=True):
+    """
+    Parses resumes with parse_resume in a ProcessPoolExecutor and yields (file_path, resume_data)
+    pairs as they become available; resume_data is None for files that failed or timed out.
+    With ordered=True results come back in input order (each one as soon as it and everything
+    before it is done); with ordered=False they come back in completion order.
+    Files are submitted in chunks of 'chunksize', with at most 2 * max_workers chunks outstanding,
+    so memory stays bounded for large directories.
+    max_workers=None uses os.cpu_count(); max_workers=1 parses in-process without a pool.
+    """
+    if max_workers == 1:
+        cache = ParseCache(cache_path, parse_cache_version) if cache_path else None
+        try:
+            for file_path in file_paths:
+                yield file_path, _parse_one(file_path, timeout, cache)
+        finally:
+            if cache is not None:
+                cache.close()
+        return
+
+    yield from _run_chunks(_parse_chunk, file_paths, max_workers, chunksize, timeout, cache_path, ordered)
+
+
+def iter_resume_scores(file_paths, job_description_data, max_workers=None, chunksize=DEFAULT_CHUNK_SIZE,
+                       timeout=DEFAULT_FILE_TIMEOUT, cache_path=None, ordered=False):
+    """
+    Streaming pipeline: parses every resume and yields (file_path, score, matched_required_skills)
+    records, with the pool score of matcher.match_resumes_to_job over the files that parsed.
+    Pool IDF needs every document frequency before the first score, so this takes two passes:
+    the first parses the files (in workers when a pool is used) and keeps only each resume's term
+    counts and required-skill coverage, spooled to a temporary file, while the pool's document
+    frequencies are counted; the second reads the spool back and scores it in batches.
+    Parsed documents are dropped inside the first pass, so peak memory grows with the pool's
+    vocabulary, not with the number of files. Records come after every file has been parsed.
+    Files that fail to parse are skipped.
+    """
+    if max_workers == 1:
+        scorer = make_required_skills_scorer(job_description_data)
+        cache = ParseCache(cache_path, parse_cache_version) if cache_path else None
+        try:
+            summaries = ((file_path, _summarize_one(file_path, timeout, cache, scorer)) for file_path in file_paths)
+            yield from _score_pool(summaries, job_description_data)
+        finally:
+            if cache is not None:
+                cache.close()
+        return
+
+    yield from _score_pool(_run_chunks(_summarize_chunk, file_paths, max_workers, chunksize, timeout, cache_path,
+                                       ordered, job_description_data), job_description_data)
+
+
+def _score_pool(summaries, job_description_data):
+    # Both passes of iter_resume_scores over (file_path, summary) pairs from _summarize_one
+    from scipy.sparse import csr_matrix
+
+    vocabulary = {} # term -> term ID
+    document_frequencies = [] # term ID -> number of resumes containing the term
+    num_resumes = 0
+    with tempfile.TemporaryFile() as spool:
+        for file_path, summary in summaries:
+            if summary is None:
+                continue
+            resume_term_counts, required_skills_score_component, matched_required_skills = summary
+            term_ids = np.empty(len(resume_term_counts), dtype=np.int32)
+            for i, term in enumerate(resume_term_counts):
+                term_id = vocabulary.setdefault(term, len(vocabulary))
+                if term_id == len(document_frequencies):
+                    document_frequencies.append(0)
+                document_frequencies[term_id] += 1
+                term_ids[i] = term_id
+            counts = np.fromiter(resume_term_counts.values(), dtype=np.int32, count=len(resume_term_counts))
+            pickle.dump((file_path, term_ids, counts, required_skills_score_component, matched_required_skills), spool,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+            num_resumes += 1
+
+        job_has_text = bool(preprocess_text_for_tfidf(job_description_data.get('full_text', '')))
+        if not job_has_text:
+            logger.error("Job description text is empty. Cannot perform matching.")
+        with instrumentation.stage('vectorize'):
+            idf = pooled_idf(document_frequencies, num_resumes)
+            job_matrix = job_vectors([job_description_data], lambda terms: [vocabulary.get(term, -1) for term in terms], idf, num_resumes)
+        spool.seek(0)
+        for batch_start in range(0, num_resumes, SCORE_BATCH_SIZE):
+            batch = [pickle.load(spool) for _ in range(min(SCORE_BATCH_SIZE, num_resumes - batch_start))]
+            with instrumentation.stage('score'):
+                indptr = np.cumsum([0] + [len(record[1]) for record in batch])
+                resume_counts = csr_matrix((np.concatenate([record[2] for record in batch]).astype(np.float64),
+                                            np.concatenate([record[1] for record in batch]), indptr), shape=(len(batch), len(idf)))
+                general_similarity = pooled_similarity(resume_counts, idf, job_matrix)[0]
+                scores = combine_scores(np.array([record[3] for record in batch]), general_similarity)
+                if not job_has_text:
+                    scores[:] = 0.0
+            for (file_path, _, _, _, matched_required_skills), score in zip(batch, scores.tolist()):
+                yield file_path, score, matched_required_skills
+
+
+def top_k_resumes(score_records, k):
+    """
+    Keeps the k best (file_path, score, matched_required_skills) records from a stream using a
+    bounded heap (O(k) memory), returned best first.
+    """
+    return heapq.nlargest(k, score_records, key=lambda record: record[1])
@@ -0,0 +1,149 @@
+# instrumentation.py
+"""
+Per-stage timers and counters for a run, plus optional profiling.
+
+    with stage('extract'):
+        ...
+    count('documents')
+
+Worker processes send their totals back with collect() and the parent adds them in with merge(),
+so summary() covers the whole run.
+"""
+import contextlib
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_stage_seconds = defaultdict(float)
+_stage_calls = defaultdict(int)
+_counters = defaultdict(int)
+
+
+@contextlib.contextmanager
+def stage(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        with _lock:
+            _stage_seconds[name] += elapsed
+            _stage_calls[name] += 1
+
+
+def count(name, n=1):
+    with _lock:
+        _counters[name] += n
+
+
+def collect(reset=True):
+    """
+    Snapshot of the stage timers and counters (picklable), optionally resetting them.
+    """
+    with _lock:
+        snapshot = {
+            'stages': {name: (_stage_seconds[name], _stage_calls[name]) for name in _stage_seconds},
+            'counters': dict(_counters),
+        }
+        if reset:
+            _stage_seconds.clear()
+            _stage_calls.clear()
+            _counters.clear()
+    return snapshot
+
+
+def merge(snapshot):
+    with _lock:
+        for name, (seconds, calls) in snapshot['stages'].items():
+            _stage_seconds[name] += seconds
+            _stage_calls[name] += calls
+        for name, n in snapshot['counters'].items():
+            _counters[name] += n
+
+
+def reset():
+    collect(reset=True)
+
+
+def summary(wall_seconds):
+    """
+    Machine-readable summary of the run. Stage seconds are summed across worker processes,
+    so with a process pool they can exceed the wall time.
+    """
+    snapshot = collect(reset=False)
+    documents = snapshot['counters'].get('documents', 0)
+    return {
+        'wall_seconds': wall_seconds,
+        'documents': documents,
+        'docs_per_second': documents / wall_seconds if wall_seconds > 0 else 0.0,
+        'stages': {
+            name: {'seconds': seconds, 'calls': calls, 'mean_ms': 1000 * seconds / calls if calls else 0.0}
+            for name, (seconds, calls) in sorted(snapshot['stages'].items())
+        },
+        'counters': dict(sorted(snapshot['counters'].items())),
+    }
+
+
+def log_summary(run_summary):
+    logger.info("Run: %d documents in %.2fs (%.1f docs/sec)",
+                run_summary['documents'], run_summary['wall_seconds'], run_summary['docs_per_second'])
+    for name, stats in run_summary['stages'].items():
+        logger.info("  stage %-12s %8.3fs over %6d calls (%.2f ms/call)", name, stats['seconds'], stats['calls'], stats['mean_ms'])
+    for name, n in run_summary['counters'].items():
+        logger.info("  counter %-10s %d", name, n)
+
+
+def write_summary(path, run_summary):
+    with open(path, 'w') as f:
+        json.dump(run_summary, f, indent=2)
+
+
+@contextlib.contextmanager
+def profiled(profiler=None, output_path=None):
+    """
+    Profiles the enclosed block with 'cprofile' or 'pyinstrument' (optional dependency).
+    Results go to output_path (pstats dump / HTML) if given, otherwise to stdout.
+    Only the current process is profiled; run with a single worker to include parsing.
+    """
+    if profiler is None:
+        yield
+        return
+
+    if profiler == 'cprofile':
+        import cProfile
+        import pstats
+
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            if output_path:
+                profile.dump_stats(output_path)
+            else:
+                pstats.Stats(profile).sort_stats('cumulative').print_stats(30)
+    elif profiler == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+        except ImportError as e:
+            raise ImportError("pyinstrument is not installed. Run: pip install pyinstrument") from e
+
+        profile = Profiler()
+        profile.start()
+        try:
+            yield
+        finally:
+            profile.stop()
+            if output_path:
+                with open(output_path, 'w') as f:
+                    f.write(profile.output_html())
+            else:
+                print(profile.output_text())
+    else:
+        raise ValueError(f"Unknown profiler: {profiler}")
@@ -1,6 +1,15 @@
+import argparse
+import csv
+import logging
 import os
-from parser import parse_resume, parse_job_description
-from matcher import match_resume_to_job
+import time
+from parser import parse_job_description
+from compact_store import CompactStore
+from ingest import iter_resume_files, iter_resume_scores, parse_resumes_parallel, top_k_resumes
+from matcher_index import MatcherIndex
+from vector_store import VectorStore
+import instrumentation
+from matcher import match_resume_to_job, rank_resumes_two_stage, top_k_indices, two_stage_recall_report
 # from document_processor import extract_text_from_pdf, extract_text_from_docx # REMOVE THIS LINE
 # The extract_text_from_file is imported by parser from utils, so main.py doesn't directly need it.
 
@@ -8,71 +17,248 @@ from matcher import match_resume_to_job
 # --- Configuration ---
 JOB_DESCRIPTION_PATH = 'data/job_description.txt'
 RESUMES_DIR = 'data'
+PARSE_CACHE_PATH = '.resume_cache.sqlite' # Extracted text/skills keyed by file content hash
+INGEST_WORKERS = None # Parser processes; None = one per CPU, 1 = parse in-process
+DEFAULT_CANDIDATE_POOL_FACTOR = 5 # With --top-k K, stage 2 rescores the best 5*K by required-skill coverage
+DEFAULT_RANKED_RESUMES = 100 # Resumes listed by a default, --index or --vector-store run unless --max-results says otherwise
+DEFAULT_JOBS_TOP_K = 10 # Resumes listed per JD in --jobs-dir mode when --top-k is not given
 
-def main():
-    print(f"Parsing {JOB_DESCRIPTION_PATH}...")
+logger = logging.getLogger(__name__)
+
+
+def parse_args(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Rank resumes against a job description.")
+    arg_parser.add_argument('--top-k', type=int,
+                            help="Two-stage ranking: only show the best K resumes, rescoring a prefiltered shortlist")
+    arg_parser.add_argument('--max-results', type=int, default=DEFAULT_RANKED_RESUMES,
+                            help=f"Resumes listed by a default, --index or --vector-store run, best first "
+                                 f"(default: {DEFAULT_RANKED_RESUMES}; 0 lists every resume)")
+    arg_parser.add_argument('--candidate-pool', type=int,
+                            help=f"Shortlist size M for --top-k (default: {DEFAULT_CANDIDATE_POOL_FACTOR} * K)")
+    arg_parser.add_argument('--recall-report', action='store_true',
+                            help="With --top-k, report recall of two-stage ranking against exhaustive scoring for several M")
+    arg_parser.add_argument('--index',
+                            help="Incremental mode: keep a persistent matcher index in this directory, re-parse only new or "
+                                 "changed resumes, and score the JD against the stored vectors")
+    arg_parser.add_argument('--sync-only', action='store_true',
+                            help="With --index, only sync the index with the resume directory (no scoring)")
+    arg_parser.add_argument('--vector-store',
+                            help="Rank against precomputed resume vectors in this directory (memory-mapped); the store is "
+                                 "built from the resume directory on first use and rebuilt after a parser/skills change. "
+                                 "Delete the directory to rebuild it")
+    arg_parser.add_argument('--jobs-dir',
+                            help="Match every job description in this directory against every resume (JD x resume matrix)")
+    arg_parser.add_argument('--resumes-dir', default=RESUMES_DIR,
+                            help=f"Resume directory for --jobs-dir mode (default: {RESUMES_DIR})")
+    arg_parser.add_argument('--matrix-csv', help="In --jobs-dir mode, also write the full JD x resume score matrix to this CSV file")
+    arg_parser.add_argument('--workers', type=int, default=INGEST_WORKERS,
+                            help="Parser processes (default: one per CPU; 1 parses in-process)")
+    arg_parser.add_argument('--log-level', default='INFO', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                            help="DEBUG shows per-document parsing and scoring details; WARNING silences progress output")
+    arg_parser.add_argument('--metrics-json', help="Write per-stage timings, counters and docs/sec for this run to a JSON file")
+    arg_parser.add_argument('--profile', choices=['cprofile', 'pyinstrument'],
+                            help="Profile the run (main process only; combine with --workers 1 to include parsing)")
+    arg_parser.add_argument('--profile-output', help="Write profiler output here (pstats dump or HTML) instead of stdout")
+    return arg_parser.parse_args(argv)
+
+
+def match_job_directory(args):
+    """
+    Many-JDs mode: parses every JD in args.jobs_dir and every resume in args.resumes_dir (into a
+    CompactStore, so no parse dicts are kept), scores the full JD x resume matrix in one pass, and
+    prints each JD's top-K resumes and each resume's best-fit JD.
+    """
+    job_paths = sorted(iter_resume_files(args.jobs_dir))
+    jobs_data = []
+    for job_path in job_paths:
+        logger.info("Parsing %s...", job_path)
+        job_data = parse_job_description(job_path)
+        if job_data:
+            jobs_data.append(job_data)
+        else:
+            logger.warning("Failed to parse job description from %s", job_path)
+    if not jobs_data:
+        logger.error("No job descriptions could be parsed from %s. Exiting.", args.jobs_dir)
+        return
+
+    # Don't treat the JDs as resumes when both live in the same directory
+    job_real_paths = {os.path.realpath(job_path) for job_path in job_paths}
+    resume_paths = sorted(path for path in iter_resume_files(args.resumes_dir) if os.path.realpath(path) not in job_real_paths)
+    store = CompactStore()
+    for file_path in store.add_files(resume_paths, max_workers=args.workers, cache_path=PARSE_CACHE_PATH):
+        logger.warning("Failed to parse %s", os.path.basename(file_path))
+    resume_filenames = store.file_names
+
+    score_matrix = store.score_jobs(jobs_data)
+    job_filenames = [job_data['file_name'] for job_data in jobs_data]
+
+    top_k = args.top_k or DEFAULT_JOBS_TOP_K
+    for j, resume_indices in enumerate(top_k_indices(score_matrix, top_k)):
+        print(f"\n--- Top {len(resume_indices)} Resumes for {job_filenames[j]} ---")
+        for i in resume_indices:
+            print(f"{resume_filenames[i]}: {score_matrix[j, i]:.2f}")
+
+    print("\n--- Best-Fit Job per Resume ---")
+    for i, job_indices in enumerate(top_k_indices(score_matrix.T, 1)):
+        for j in job_indices:
+            print(f"{resume_filenames[i]}: {job_filenames[j]} ({score_matrix[j, i]:.2f})")
+
+    if args.matrix_csv:
+        with open(args.matrix_csv, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['job_description'] + resume_filenames)
+            for job_filename, row in zip(job_filenames, score_matrix):
+                writer.writerow([job_filename] + [f"{score:.4f}" for score in row])
+        print(f"\nWrote {score_matrix.shape[0]}x{score_matrix.shape[1]} score matrix to {args.matrix_csv}")
+
+
+def print_ranked_resumes(all_resume_scores, max_results=0, num_ranked=None):
+    """
+    Prints the best 'max_results' entries of all_resume_scores (0: all of them), best first.
+    'num_ranked' is the number of entries that were ranked when only the best ones were passed in;
+    the header says how many are listed whenever the listing is cut short.
+    """
+    # Sort in descending order of scores
+    sorted_resumes = sorted(all_resume_scores.items(), key=lambda item: item[1], reverse=True)
+    num_ranked = max(num_ranked or 0, len(sorted_resumes))
+    if max_results:
+        sorted_resumes = sorted_resumes[:max_results]
+    if len(sorted_resumes) < num_ranked:
+        print(f"\n--- Ranked Resumes (best {len(sorted_resumes)} of {num_ranked}; see --max-results) ---")
+    else:
+        print("\n--- Ranked Resumes ---")
+    for filename, score in sorted_resumes:
+        print(f"{filename}: {score:.2f}")
+
+
+def sync_index(index_dir, max_workers=INGEST_WORKERS):
+    index = MatcherIndex.open(index_dir)
+    sync_stats = index.sync_directory(RESUMES_DIR, exclude=(os.path.basename(JOB_DESCRIPTION_PATH),),
+                                      max_workers=max_workers, cache_path=PARSE_CACHE_PATH)
+    index.save(index_dir)
+    print(f"Synced index {index_dir} with {RESUMES_DIR}: " + ", ".join(f"{count} {status}" for status, count in sync_stats.items()))
+    return index
+
+
+def open_vector_store(store_dir, max_workers=INGEST_WORKERS):
+    if VectorStore.is_current(store_dir):
+        return VectorStore.open(store_dir)
+    if os.path.exists(os.path.join(store_dir, 'meta.json')):
+        logger.info("Vector store %s was built by another store format or parser version; rebuilding it", store_dir)
+    logger.info("Building vector store %s from %s...", store_dir, RESUMES_DIR)
+    file_paths = iter_resume_files(RESUMES_DIR, exclude=(os.path.basename(JOB_DESCRIPTION_PATH),))
+    vector_store = VectorStore.build(store_dir, parse_resumes_parallel(file_paths, max_workers=max_workers, cache_path=PARSE_CACHE_PATH))
+    logger.info("Stored vectors for %d resumes in %s", len(vector_store), store_dir)
+    return vector_store
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=args.log_level, format='%(levelname)s %(name)s: %(message)s')
+
+    instrumentation.reset()
+    start = time.perf_counter()
+    with instrumentation.profiled(args.profile, args.profile_output):
+        run(args)
+    run_summary = instrumentation.summary(time.perf_counter() - start)
+    instrumentation.log_summary(run_summary)
+    if args.metrics_json:
+        instrumentation.write_summary(args.metrics_json, run_summary)
+
+
+def run(args):
+    if args.jobs_dir:
+        match_job_directory(args)
+        return
+    if args.index and args.sync_only:
+        sync_index(args.index, args.workers)
+        return
+
+    logger.info("Parsing %s...", JOB_DESCRIPTION_PATH)
     job_description_data = parse_job_description(JOB_DESCRIPTION_PATH)
 
     if not job_description_data:
-        print(f"Failed to parse job description from {JOB_DESCRIPTION_PATH}. Exiting.")
+        logger.error("Failed to parse job description from %s. Exiting.", JOB_DESCRIPTION_PATH)
         return
 
-    # --- DEBUGGING JOB DESCRIPTION DATA ---
-    print("\n--- DEBUG: Job Description Data ---")
-    print(f"JD Full Text (first 500 chars): {job_description_data.get('full_text', '')[:500]}...")
-    print(f"JD Skills: {job_description_data.get('skills', set())}")
-    print(f"JD Required Skills: {job_description_data.get('required_skills', set())}")
-    # print(f"JD Experience (first entry responsibilities, first 200 chars): {job_description_data.get('experience', [{}])[0].get('responsibilities', ['N/A'])[0][:200]}...")
-    print("-----------------------------------\n")
+    logger.debug("JD Full Text (first 500 chars): %s...", job_description_data.get('full_text', '')[:500])
+    logger.debug("JD Skills: %s", job_description_data.get('skills', set()))
+    logger.debug("JD Required Skills: %s", job_description_data.get('required_skills', set()))
 
     all_resume_scores = {}
 
     # Match job description against itself (for debugging the scoring logic)
     # Treat job description as a resume for a moment to test self-consistency
-    print(f"DEBUG: Matching {JOB_DESCRIPTION_PATH} against itself for score consistency check...")
+    logger.debug("Matching %s against itself for score consistency check...", JOB_DESCRIPTION_PATH)
     # For self-matching, both the resume_data and job_description_data are the same job_description_data
     self_match_score = match_resume_to_job(job_description_data, job_description_data)
     all_resume_scores[JOB_DESCRIPTION_PATH] = self_match_score
-    print(f"DEBUG: Self-match score for {JOB_DESCRIPTION_PATH}: {self_match_score:.2f}")
-
-
-    # Process resumes
-    print("\nProcessing resumes...")
-    for filename in os.listdir(RESUMES_DIR):
-        file_path = os.path.join(RESUMES_DIR, filename)
-        
-        # Skip the job description file itself if it's already processed or being processed separately
-        if filename == os.path.basename(JOB_DESCRIPTION_PATH):
-            continue
-
-        if os.path.isfile(file_path) and (filename.lower().endswith('.pdf') or filename.lower().endswith('.docx') or filename.lower().endswith('.txt')):
-            print(f"Parsing {filename}...")
-            
-            # Use parse_resume for resumes, not parse_job_description
-            resume_data = parse_resume(file_path)
-
-            if resume_data:
-                # --- DEBUGGING RESUME DATA ---
-                print(f"\n--- DEBUG: Resume Data for {filename} ---")
-                print(f"Resume Full Text (first 500 chars): {resume_data.get('full_text', '')[:500]}...")
-                print(f"Resume Skills: {resume_data.get('skills', set())}")
-                # print(f"Resume Experience (first entry responsibilities, first 200 chars): {resume_data.get('experience', [{}])[0].get('responsibilities', ['N/A'])[0][:200]}...") # Uncomment if needed
-                print("-----------------------------------\n")
-
-                score = match_resume_to_job(resume_data, job_description_data)
-                all_resume_scores[filename] = score
-            else:
-                print(f"Failed to parse {filename}")
-        else:
-            print(f"Skipping non-document file: {filename}")
+    logger.debug("Self-match score for %s: %.2f", JOB_DESCRIPTION_PATH, self_match_score)
 
+    if args.vector_store:
+        # Only the JD is vectorized; resumes are scored from the mapped vectors
+        vector_store = open_vector_store(args.vector_store, args.workers)
+        scores = vector_store.score_job(job_description_data)
+        for row, score in enumerate(scores):
+            all_resume_scores[os.path.basename(vector_store.key(row))] = score
+        print_ranked_resumes(all_resume_scores, args.max_results)
+        return
 
-    # Display results
-    print("\n--- Ranked Resumes ---")
-    # Sort in descending order of scores
-    sorted_resumes = sorted(all_resume_scores.items(), key=lambda item: item[1], reverse=True)
-    for filename, score in sorted_resumes:
-        print(f"{filename}: {score:.2f}")
+    if args.index:
+        # Only new or changed resumes are parsed; the JD is scored against the stored resume vectors
+        index = sync_index(args.index, args.workers)
+        keys, scores = index.score_job(job_description_data)
+        for key, score in zip(keys, scores):
+            all_resume_scores[os.path.basename(key)] = score
+        print_ranked_resumes(all_resume_scores, args.max_results)
+        return
+
+    # Resumes are listed lazily and streamed through the worker pool, so nothing below holds the whole directory
+    file_paths = iter_resume_files(RESUMES_DIR, exclude=(os.path.basename(JOB_DESCRIPTION_PATH),))
+
+    if args.top_k:
+        # Two-stage ranking needs every resume's skills for the stage-1 shortlist and its term counts for
+        # pool IDF; both are kept in a CompactStore's columns instead of parse dicts
+        store = CompactStore()
+        for file_path in store.add_files(file_paths, max_workers=args.workers, cache_path=PARSE_CACHE_PATH):
+            logger.warning("Failed to parse %s", os.path.basename(file_path))
+
+        candidate_pool_size = args.candidate_pool or DEFAULT_CANDIDATE_POOL_FACTOR * args.top_k
+        skill_index = store.skill_index() # Stage-1 shortlists for the report and the ranking
+        if args.recall_report:
+            candidate_pool_sizes = sorted({args.top_k, 2 * args.top_k, candidate_pool_size, 10 * args.top_k})
+            recall_report = two_stage_recall_report(store, job_description_data, args.top_k, candidate_pool_sizes, skill_index)
+            print(f"\n--- Two-Stage Recall@{args.top_k} vs Exhaustive ({len(store)} resumes) ---")
+            for pool_size, recall in recall_report.items():
+                print(f"M={pool_size}: {recall:.2%}")
+
+        indices, scores = rank_resumes_two_stage(store, job_description_data, args.top_k, candidate_pool_size, skill_index)
+        print(f"\n--- Top {args.top_k} Resumes (rescored shortlist of {min(candidate_pool_size, len(store))}) ---")
+        for i, score in zip(indices, scores):
+            print(f"{store.file_names[i]}: {score:.2f}")
+        return
+
+    # Stream: each resume is parsed (in a worker) and dropped once its term counts are spooled; resumes are
+    # scored with the pool's IDF, and only the best --max-results are kept, in a bounded heap.
+    # Failed files are logged by the workers.
+    num_scored = 0
+
+    def counted(records):
+        nonlocal num_scored
+        for record in records:
+            num_scored += 1
+            yield record
+
+    score_records = counted(iter_resume_scores(file_paths, job_description_data, max_workers=args.workers,
+                                               cache_path=PARSE_CACHE_PATH, ordered=True))
+    best_records = top_k_resumes(score_records, args.max_results) if args.max_results else sorted(
+        score_records, key=lambda record: record[1], reverse=True)
+    for file_path, score, matched_required_skills in best_records:
+        logger.debug("Matched required skills for %s: %s", os.path.basename(file_path), matched_required_skills)
+        all_resume_scores[os.path.basename(file_path)] = score
+
+    # Display results (the JD's self-match is listed too)
+    print_ranked_resumes(all_resume_scores, args.max_results, num_scored + 1)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
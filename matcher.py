@@ -1,6 +1,15 @@
+import functools
+import math
 import re
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import logging
+from collections import Counter
+import numpy as np
+
+from instrumentation import stage
+from skill_index import SkillIndex
+from skill_taxonomy import SKILL_TAXONOMY
+
+logger = logging.getLogger(__name__)
 
 def preprocess_text_for_tfidf(text):
     """
@@ -15,65 +24,540 @@ def preprocess_text_for_tfidf(text):
     return text.lower()
 
 
+@functools.lru_cache(maxsize=1)
+def tfidf_analyzer():
+    """
+    Tokenizer + stop-word filter used by the TF-IDF vectorizers in this module,
+    for code that counts terms itself (streaming scorer, incremental index).
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    return TfidfVectorizer(stop_words='english', token_pattern=r'\b\w+\b').build_analyzer()
+
+
+def term_counts(document_data):
+    """
+    Counts of the TF-IDF terms in a parsed resume's or JD's 'full_text', as the scorers in this module count them.
+    """
+    return Counter(tfidf_analyzer()(preprocess_text_for_tfidf(document_data.get('full_text', ''))))
+
+
+# The sum of weights should be 1.0. Required skills are heavily prioritized.
+WEIGHT_REQUIRED_SKILLS = 0.75  # 75% from matching explicitly required skills
+WEIGHT_GENERAL_SIMILARITY = 0.25 # 25% from overall content similarity
+
+
+def combine_scores(required_skills_score_component, general_similarity):
+    """
+    Weighted combination of the required-skills component and the general TF-IDF similarity,
+    scaled to 0-100. Works on scalars and NumPy arrays alike.
+    """
+    # This combination is designed to push scores high if required skills are met.
+    return (
+        (required_skills_score_component * WEIGHT_REQUIRED_SKILLS) +
+        (general_similarity * WEIGHT_GENERAL_SIMILARITY)
+    ) * 100 # Scale to 0-100
+
+
+# Smoothed IDF of a two-document TF-IDF fit (resume + JD): ln((1 + n) / (1 + df)) + 1 with n=2,
+# i.e. 1 for terms in both documents (df=2) and ln(3/2) + 1 for terms in only one of them (df=1).
+UNIQUE_TERM_IDF_SQ = (math.log(3 / 2) + 1) ** 2
+
+
+def two_document_similarity(dot_products, resume_sq_totals, resume_shared_sq, job_sq_totals, job_shared_sq):
+    """
+    Cosine similarity of a resume and a JD under two-document IDF, from raw term counts: the dot
+    product of their counts over shared terms, the sums of squared counts over all of each document's
+    terms (*_sq_totals) and over the terms shared with the other document (*_shared_sq).
+    Shared terms have IDF 1, so the dot product needs no weighting and each norm is the unshared
+    norm minus a correction for the shared terms. Works on scalars and (broadcastable) arrays alike.
+    """
+    dot_products = np.asarray(dot_products, dtype=np.float64)
+    resume_sq_norms = UNIQUE_TERM_IDF_SQ * resume_sq_totals - (UNIQUE_TERM_IDF_SQ - 1) * resume_shared_sq
+    job_sq_norms = UNIQUE_TERM_IDF_SQ * job_sq_totals - (UNIQUE_TERM_IDF_SQ - 1) * job_shared_sq
+    return np.divide(dot_products, np.sqrt(resume_sq_norms * job_sq_norms),
+                     out=np.zeros(np.broadcast(dot_products, resume_sq_norms, job_sq_norms).shape), where=dot_products > 0)
+
+
+def two_document_similarity_matrix(job_counts, resume_counts, job_sq_totals, resume_sq_totals):
+    """
+    two_document_similarity for every JD/resume pair, from sparse term-count matrices over one
+    vocabulary: job_counts (num_jobs, terms) and resume_counts (num_resumes, terms). Terms that only
+    one side has can be left out of the matrices, as long as they count toward the *_sq_totals.
+    Returns a dense (num_jobs, num_resumes) array.
+    """
+    dot_products = (job_counts @ resume_counts.T).toarray()
+    resume_shared_sq = (job_counts.sign() @ resume_counts.multiply(resume_counts).T).toarray()
+    job_shared_sq = (job_counts.multiply(job_counts) @ resume_counts.sign().T).toarray()
+    return two_document_similarity(dot_products, np.asarray(resume_sq_totals)[np.newaxis, :], resume_shared_sq,
+                                   np.asarray(job_sq_totals)[:, np.newaxis], job_shared_sq)
+
+
 def match_resume_to_job(resume_data, job_description_data):
-    # Ensure all text is preprocessed for consistent comparison
-    resume_full_text_processed = preprocess_text_for_tfidf(resume_data.get('full_text', ''))
-    job_full_text_processed = preprocess_text_for_tfidf(job_description_data.get('full_text', ''))
+    """
+    Scores a single resume against a job description (0-100), on its own: IDF comes from the
+    resume/JD pair only (see make_resume_scorer). This is the per-pair score of the service and
+    make_jobs_scorer; rankings of a pool use the pool score of match_resumes_to_job instead.
+    """
+    return float(make_resume_scorer(job_description_data)(resume_data)[0])
+
+
+def required_skills_coverage(resumes_data, job_description_data):
+    """
+    Fraction of the job's required skills found in each resume, as a NumPy array aligned with resumes_data.
+    This is the required-skills component of the score, without any TF-IDF work.
+    Skills are compared as integer skill IDs of the taxonomy, and each required skill counts with its
+    taxonomy weight (1.0 unless skills_taxonomy.json says otherwise).
+    """
+    from scipy.sparse import csr_matrix
+
+    # Required skills outside the taxonomy (e.g. from a custom skill_set) get local IDs after the taxonomy's,
+    # with the default weight; they are not added to SKILL_TAXONOMY, so it doesn't grow with every JD
+    required_skills = set(job_description_data.get('required_skills', []))
+    skill_ids = SKILL_TAXONOMY.ids
+    extra_ids = {skill: len(SKILL_TAXONOMY) + i for i, skill in enumerate(sorted(required_skills.difference(skill_ids)))}
+    required_weights = np.zeros(len(SKILL_TAXONOMY) + len(extra_ids))
+    required_ids = SKILL_TAXONOMY.ids_of(required_skills)
+    required_weights[required_ids] = SKILL_TAXONOMY.weights()[required_ids]
+    for skill, skill_id in extra_ids.items():
+        required_weights[skill_id] = SKILL_TAXONOMY.weight(skill)
+    required_weight = required_weights.sum()
+    if required_weight <= 0:
+        return np.zeros(len(resumes_data))
+
+    # Resumes x skill-ID indicator matrix; its product with the required weights is the matched weight.
+    # Resume skills outside the taxonomy only matter if they are required, so the others are skipped.
+    indptr, indices = [0], []
+    for resume_data in resumes_data:
+        for skill in set(resume_data.get('skills', [])): # Note: using 'skills' key from resume_data
+            skill_id = skill_ids.get(skill, extra_ids.get(skill))
+            if skill_id is not None:
+                indices.append(skill_id)
+        indptr.append(len(indices))
+    skill_matrix = csr_matrix(
+        (np.ones(len(indices)), indices, indptr), shape=(len(resumes_data), len(required_weights))
+    )
+    return (skill_matrix @ required_weights) / required_weight
+
+
+def pooled_idf(document_frequencies, num_documents):
+    """
+    Smoothed IDF over a pool of 'num_documents' resumes, as in TfidfVectorizer: ln((1 + n) / (1 + df)) + 1.
+    Terms outside the pool (df=0) get ln(1 + n) + 1.
+    """
+    return np.log((1 + num_documents) / (1 + np.asarray(document_frequencies, dtype=np.float64))) + 1
+
+
+def term_count_matrix(resumes_data):
+    """
+    Term counts of a pool of parsed resumes (see term_counts), as a (num_resumes, num_terms) sparse
+    matrix, and the term -> column vocabulary. Each resume/term pair is stored once, so the number
+    of stored entries per column is the term's document frequency.
+    """
+    from scipy.sparse import csr_matrix
+
+    vocabulary = {}
+    indptr, indices, counts = [0], [], []
+    for resume_data in resumes_data:
+        for term, count in term_counts(resume_data).items():
+            indices.append(vocabulary.setdefault(term, len(vocabulary)))
+            counts.append(count)
+        indptr.append(len(indices))
+    return csr_matrix((np.array(counts, dtype=np.float64), indices, indptr), shape=(len(indptr) - 1, len(vocabulary))), vocabulary
+
+
+def job_vectors(jobs_data, lookup_term_ids, idf, num_documents):
+    """
+    (num_jobs, num_terms) sparse matrix of the JDs' L2-normalized TF-IDF vectors against a pool's
+    vocabulary and IDF (see vectorize_job_description); JD terms outside the pool count toward the
+    norm with df=0. JDs without terms get an all-zero row.
+    """
+    from scipy.sparse import csr_matrix
+
+    unseen_idf = pooled_idf(0, num_documents)
+    indptr, indices, weights = [0], [], []
+    for job_data in jobs_data:
+        job_term_ids, job_weights = vectorize_job_description(job_data, lookup_term_ids, idf, unseen_idf)
+        indices.append(job_term_ids)
+        weights.append(job_weights)
+        indptr.append(indptr[-1] + len(job_term_ids))
+    return csr_matrix((np.concatenate(weights) if weights else np.zeros(0), np.concatenate(indices) if indices else np.zeros(0, dtype=np.int64),
+                       indptr), shape=(len(jobs_data), len(idf)))
+
+
+def pooled_similarity(resume_counts, idf, job_matrix):
+    """
+    (num_jobs, num_resumes) cosine similarities of resumes, given as a sparse term-count matrix over
+    a pool's vocabulary, and JD vectors from job_vectors, under the pool's IDF 'idf'.
+    Empty resumes get a similarity of 0.0.
+    """
+    from scipy.sparse import diags
+
+    if not resume_counts.nnz:
+        return np.zeros((job_matrix.shape[0], resume_counts.shape[0]))
+    resume_vectors = resume_counts @ diags(np.asarray(idf, dtype=np.float64))
+    resume_norms = np.sqrt(np.asarray(resume_vectors.multiply(resume_vectors).sum(axis=1)).ravel())
+    dot_products = (job_matrix @ resume_vectors.T).toarray()
+    return np.divide(dot_products, resume_norms, out=np.zeros_like(dot_products), where=resume_norms > 0)
+
+
+def pool_general_similarity(resume_counts, vocabulary, jobs_data, rows=None):
+    """
+    (num_jobs, num_rows) general similarities of the pool score, for the resumes at 'rows' (all if
+    None) of a pool given as a term-count matrix and its vocabulary (see term_count_matrix).
+    IDF always comes from the whole pool, so a resume's similarity does not depend on 'rows'.
+    """
+    num_resumes = resume_counts.shape[0]
+    idf = pooled_idf(np.bincount(resume_counts.indices, minlength=len(vocabulary)), num_resumes)
+    job_matrix = job_vectors(jobs_data, lambda terms: [vocabulary.get(term, -1) for term in terms], idf, num_resumes)
+    return pooled_similarity(resume_counts if rows is None else resume_counts[rows], idf, job_matrix)
+
+
+def match_resumes_to_job(resumes_data, job_description_data):
+    """
+    Scores a pool of resumes against one job description with the pool score: IDF is computed
+    over the resumes in the pool (smoothed, as in TfidfVectorizer), so a term is weighted by how
+    rare it is among the candidates, and the JD is vectorized against that IDF (its terms that no
+    resume has count with df=0). All cosine similarities come from one sparse matrix product.
+    Every ranking of a pool (main.py's default run, --top-k, --jobs-dir, --index, --vector-store,
+    iter_resume_scores) gives a resume the same score as this function over the same pool.
+    Returns a NumPy array of scores (0-100) aligned with the order of resumes_data.
+    """
+    num_resumes = len(resumes_data)
 
     # If job description text is empty, we can't match
-    if not job_full_text_processed:
-        print("ERROR: Job description text is empty. Cannot perform matching.")
-        return 0.0
+    if not preprocess_text_for_tfidf(job_description_data.get('full_text', '')):
+        logger.error("Job description text is empty. Cannot perform matching.")
+        return np.zeros(num_resumes)
 
     # --- 1. Core TF-IDF Similarity (General Content) ---
     # This acts as a baseline for overall textual relevance.
-    # It should be quite high when matching identical documents.
-    documents_for_tfidf = [resume_full_text_processed, job_full_text_processed]
-    
-    general_similarity = 0.0
-    if not resume_full_text_processed or not job_full_text_processed:
-        general_similarity = 0.0
-        # print("DEBUG: One of the texts is empty for TF-IDF calculation.")
-    else:
-        try:
-            # max_features limits the vocabulary size, stop_words removes common words
-            # token_pattern ensures basic alphanumeric tokens
-            vectorizer = TfidfVectorizer(stop_words='english', max_features=5000, token_pattern=r'\b\w+\b')
-            tfidf_matrix = vectorizer.fit_transform(documents_for_tfidf)
-            general_similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-        except ValueError as e: # Catches "empty vocabulary" if texts are too short/uninformative
-            # print(f"DEBUG: TF-IDF calculation error: {e}. Setting general_similarity to 0.0.")
-            general_similarity = 0.0
+    # No vocabulary cap: it would keep the pool's most frequent terms and drop rare JD terms,
+    # which are the most discriminative ones.
+    with stage('vectorize'):
+        resume_counts, vocabulary = term_count_matrix(resumes_data)
+    # Empty resumes get a similarity of 0.0
+    with stage('score'):
+        general_similarity = pool_general_similarity(resume_counts, vocabulary, [job_description_data])[0]
 
     # --- 2. Required Skills Matching (Dominant Weight) ---
-    job_required_skills = set(job_description_data.get('required_skills', []))
-    resume_extracted_skills = set(resume_data.get('skills', [])) # Note: using 'skills' key from resume_data
-
-    matched_required_skills = job_required_skills.intersection(resume_extracted_skills)
-    
-    required_skills_score_component = 0.0
-    if len(job_required_skills) > 0:
-        required_skills_score_component = (len(matched_required_skills) / len(job_required_skills))
-    
-    # --- 3. Weighted Combination of Scores ---
-    # The sum of weights should be 1.0. Required skills are heavily prioritized.
-    # This combination is designed to push scores high if required skills are met.
+    with stage('score'):
+        required_skills_score_component = required_skills_coverage(resumes_data, job_description_data)
 
-    WEIGHT_REQUIRED_SKILLS = 0.75  # 75% from matching explicitly required skills
-    WEIGHT_GENERAL_SIMILARITY = 0.25 # 25% from overall content similarity
+        # --- 3. Weighted Combination of Scores ---
+        final_scores = combine_scores(required_skills_score_component, general_similarity)
 
-    final_score = (
-        (required_skills_score_component * WEIGHT_REQUIRED_SKILLS) +
-        (general_similarity * WEIGHT_GENERAL_SIMILARITY)
-    ) * 100 # Scale to 0-100
+    # Per-resume score breakdown; skipped entirely unless DEBUG logging is on
+    if logger.isEnabledFor(logging.DEBUG):
+        job_required_skills = set(job_description_data.get('required_skills', []))
+        for i, resume_data in enumerate(resumes_data):
+            resume_extracted_skills = set(resume_data.get('skills', []))
+            matched_required_skills = job_required_skills.intersection(resume_extracted_skills)
+            logger.debug("Resume: %s", resume_data.get('file_name', 'N/A'))
+            logger.debug("Job Required Skills: %s", job_required_skills)
+            logger.debug("Resume Extracted Skills: %s", resume_extracted_skills)
+            logger.debug("Matched Required Skills: %s (Count: %d)", matched_required_skills, len(matched_required_skills))
+            logger.debug("Required Skills Component: %.2f (%d/%d)", required_skills_score_component[i], len(matched_required_skills), len(job_required_skills))
+            logger.debug("General TF-IDF Similarity: %.2f", general_similarity[i])
+            logger.debug("Calculated Final Score: %.2f", final_scores[i])
+
+    return final_scores
+
+
+def build_skill_index(resumes_data):
+    """
+    SkillIndex over a pool of parsed resumes, keyed by position in resumes_data.
+    """
+    skill_index = SkillIndex()
+    for i, resume_data in enumerate(resumes_data):
+        skill_index.add(i, resume_data.get('skills', []))
+    return skill_index
+
+
+class ResumePool:
+    """
+    A list of parsed resumes prepared for pool scoring: their term counts (term_count_matrix) are
+    counted once and shared by every JD and shortlist scored against the pool.
+    CompactStore offers the same score_jobs/skill_index interface on its columns, so the two-stage
+    functions below take either.
+    """
+
+    def __init__(self, resumes_data):
+        self.resumes_data = resumes_data
+        with stage('vectorize'):
+            self.resume_counts, self.vocabulary = term_count_matrix(resumes_data)
+
+    def __len__(self):
+        return len(self.resumes_data)
+
+    def skill_index(self):
+        return build_skill_index(self.resumes_data)
+
+    def score_jobs(self, jobs_data, rows=None):
+        """
+        (num_jobs, num_rows) pool scores (0-100) of the resumes at 'rows' (all if None) against each JD.
+        """
+        resumes_data = self.resumes_data if rows is None else [self.resumes_data[i] for i in rows]
+        with stage('score'):
+            general_similarity = pool_general_similarity(self.resume_counts, self.vocabulary, jobs_data, rows)
+            required_skills_score_component = required_skills_coverage_matrix(resumes_data, jobs_data)
+            final_scores = combine_scores(required_skills_score_component, general_similarity)
+        zero_jobs_without_text(final_scores, jobs_data)
+        return final_scores
+
+
+def zero_jobs_without_text(final_scores, jobs_data):
+    """
+    Zeroes the rows of a (num_jobs, num_resumes) score matrix whose JD has no text: it can't be matched.
+    """
+    for j, job_data in enumerate(jobs_data):
+        if not preprocess_text_for_tfidf(job_data.get('full_text', '')):
+            logger.error("Job description text is empty for %s. Cannot perform matching.", job_data.get('file_name', 'N/A'))
+            final_scores[j] = 0.0
+
+
+def rank_resumes_two_stage(resumes, job_description_data, top_k, candidate_pool_size, skill_index=None):
+    """
+    Two-stage ranking. Stage 1 takes the 'candidate_pool_size' resumes with the highest
+    required-skill coverage from a SkillIndex (cheap: no TF-IDF, one bitmap per required skill).
+    Stage 2 scores that shortlist only, with the pool score of match_resumes_to_job: IDF still comes
+    from the whole pool, so a kept resume gets the same score whatever 'candidate_pool_size' is, and
+    the same as exhaustive scoring in two_stage_recall_report.
+    'resumes' is a list of parsed resume dicts, a ResumePool or a CompactStore; pass a ResumePool
+    (or store) and its 'skill_index' to reuse them across JDs and pool sizes.
+    Returns (indices, scores) of the best 'top_k' resumes, best first; indices are positions in 'resumes'.
+    """
+    if not hasattr(resumes, 'score_jobs'):
+        resumes = ResumePool(resumes)
+    if skill_index is None:
+        skill_index = resumes.skill_index()
+    with stage('score'):
+        keys, coverage = skill_index.coverage(job_description_data.get('required_skills', []))
+    # Keys are positions in insertion order and the sort is stable, so ties keep input order
+    shortlist = np.array(keys, dtype=np.int64)[np.argsort(-coverage, kind='stable')[:candidate_pool_size]]
+    scores = resumes.score_jobs([job_description_data], shortlist)[0]
+    order = np.argsort(-scores, kind='stable')[:top_k]
+    return shortlist[order], scores[order]
+
+
+def two_stage_recall_report(resumes, job_description_data, top_k, candidate_pool_sizes, skill_index=None):
+    """
+    Recall@top_k of rank_resumes_two_stage against exhaustive scoring (the pool score of every
+    resume), for each candidate pool size M. 'resumes' is as in rank_resumes_two_stage; its term
+    counts and one SkillIndex are shared by every M.
+    Returns {M: fraction of the exhaustive top_k that the two-stage ranking also returns}.
+    """
+    if not hasattr(resumes, 'score_jobs'):
+        resumes = ResumePool(resumes)
+    if skill_index is None:
+        skill_index = resumes.skill_index()
+    exhaustive_scores = resumes.score_jobs([job_description_data])[0]
+    exhaustive_top = set(np.argsort(-exhaustive_scores, kind='stable')[:top_k].tolist())
+    report = {}
+    for candidate_pool_size in candidate_pool_sizes:
+        indices, _ = rank_resumes_two_stage(resumes, job_description_data, top_k, candidate_pool_size, skill_index)
+        report[candidate_pool_size] = len(exhaustive_top.intersection(indices.tolist())) / len(exhaustive_top) if exhaustive_top else 1.0
+    return report
+
+
+def required_skills_coverage_matrix(resumes_data, jobs_data):
+    """
+    (num_jobs, num_resumes) matrix of required-skill coverage, from one dense matrix product:
+    JD required-skill weights x resume skill indicators, over the union of all required skills.
+    """
+    skill_vocabulary = sorted(set().union(*(job_data.get('required_skills', []) for job_data in jobs_data)))
+    skill_index = {skill: i for i, skill in enumerate(skill_vocabulary)}
+    skill_weights = np.array([SKILL_TAXONOMY.weight(skill) for skill in skill_vocabulary])
+
+    job_skills = np.zeros((len(jobs_data), len(skill_vocabulary)))
+    for j, job_data in enumerate(jobs_data):
+        job_required_ids = [skill_index[skill] for skill in set(job_data.get('required_skills', []))]
+        job_skills[j, job_required_ids] = skill_weights[job_required_ids]
+    resume_skills = np.zeros((len(resumes_data), len(skill_vocabulary)))
+    for i, resume_data in enumerate(resumes_data):
+        resume_skills[i, [skill_index[skill] for skill in set(resume_data.get('skills', [])) if skill in skill_index]] = 1.0
+
+    # Weights x 0/1 indicators: each entry is the total weight of the required skills a resume matches
+    matched_weights = job_skills @ resume_skills.T
+    required_weights = job_skills.sum(axis=1)[:, np.newaxis]
+    return np.divide(matched_weights, required_weights, out=np.zeros_like(matched_weights), where=required_weights > 0)
+
+
+def match_resumes_to_jobs(resumes_data, jobs_data):
+    """
+    Scores every resume against every job description, with the pool score of match_resumes_to_job
+    for each JD: IDF over the resumes, so a JD's scores don't depend on the other JDs. All cosine
+    similarities come from one sparse-sparse product, and skill coverage from
+    required_skills_coverage_matrix (see ResumePool.score_jobs).
+    Returns a (num_jobs, num_resumes) NumPy array of scores (0-100), aligned with the input orders.
+    """
+    return ResumePool(resumes_data).score_jobs(jobs_data)
+
+
+def top_k_indices(score_matrix, k):
+    """
+    Column indices of the k highest scores in each row of score_matrix, best first; tied scores
+    keep column order (lower index first), also at the cutoff. k larger than the number of columns
+    returns every column.
+    For a (jobs, resumes) matrix this is the per-JD top-K; pass score_matrix.T for each resume's best-fit JDs.
+    """
+    k = min(k, score_matrix.shape[1])
+    if k <= 0:
+        return np.zeros((score_matrix.shape[0], 0), dtype=np.int64)
+    candidates = np.argpartition(-score_matrix, k - 1, axis=1)[:, :k]
+    # argpartition keeps an arbitrary subset of the columns tied at the cutoff; those rows are redone with a stable sort
+    cutoff_scores = np.take_along_axis(score_matrix, candidates, axis=1).min(axis=1, keepdims=True)
+    for row in np.flatnonzero((score_matrix >= cutoff_scores).sum(axis=1) > k):
+        candidates[row] = np.argsort(-score_matrix[row], kind='stable')[:k]
+    candidates.sort(axis=1)
+    order = np.argsort(-np.take_along_axis(score_matrix, candidates, axis=1), axis=1, kind='stable')
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+def make_required_skills_scorer(job_description_data):
+    """
+    Builds a function that returns (required_skills_score_component, matched_required_skills) for
+    one resume against a fixed job description: the required-skills part of the score, as in
+    required_skills_coverage, without any TF-IDF work.
+    """
+    job_required_skills = frozenset(job_description_data.get('required_skills', []))
+    required_weight = sum(SKILL_TAXONOMY.weight(skill) for skill in job_required_skills)
 
-    # Debugging prints (keep these for now, they are invaluable)
-    print(f"DEBUG: Resume: {resume_data.get('file_name', 'N/A')}")
-    print(f"DEBUG: Job Required Skills: {job_required_skills}")
-    print(f"DEBUG: Resume Extracted Skills: {resume_extracted_skills}")
-    print(f"DEBUG: Matched Required Skills: {matched_required_skills} (Count: {len(matched_required_skills)})")
-    print(f"DEBUG: Required Skills Component: {required_skills_score_component:.2f} ({len(matched_required_skills)}/{len(job_required_skills)})")
-    print(f"DEBUG: General TF-IDF Similarity: {general_similarity:.2f}")
-    print(f"DEBUG: Calculated Final Score: {final_score:.2f}")
+    def score_required_skills(resume_data):
+        matched_required_skills = job_required_skills.intersection(resume_data.get('skills', []))
+        required_skills_score_component = 0.0
+        if required_weight > 0:
+            required_skills_score_component = sum(SKILL_TAXONOMY.weight(skill) for skill in matched_required_skills) / required_weight
+        return required_skills_score_component, matched_required_skills
 
-    return final_score
\ No newline at end of file
+    return score_required_skills
+
+
+def make_resume_scorer(job_description_data):
+    """
+    Builds a function that scores one resume at a time against a fixed job description and
+    returns (score, matched_required_skills). Scores are the same as match_resume_to_job:
+    in a two-document TF-IDF fit the IDF of a term only depends on whether it occurs in both
+    documents, so it is computed from token counts directly and nothing is fitted per resume.
+    Nothing is retained between calls.
+    """
+    analyzer = tfidf_analyzer()
+    job_full_text_processed = preprocess_text_for_tfidf(job_description_data.get('full_text', ''))
+    job_counts = Counter(analyzer(job_full_text_processed))
+    score_required_skills = make_required_skills_scorer(job_description_data)
+
+    job_sq_total = sum(count * count for count in job_counts.values())
+
+    def score_resume(resume_data):
+        with stage('score'):
+            return _score_resume(resume_data)
+
+    def _score_resume(resume_data):
+        general_similarity = 0.0
+        if job_counts:
+            resume_counts = Counter(analyzer(preprocess_text_for_tfidf(resume_data.get('full_text', ''))))
+            dot_product = resume_sq_total = resume_shared_sq = job_shared_sq = 0
+            for term, count in resume_counts.items():
+                resume_sq_total += count * count
+                job_count = job_counts.get(term)
+                if job_count:
+                    dot_product += count * job_count
+                    resume_shared_sq += count * count
+                    job_shared_sq += job_count * job_count
+            general_similarity = float(two_document_similarity(dot_product, resume_sq_total, resume_shared_sq, job_sq_total, job_shared_sq))
+
+        required_skills_score_component, matched_required_skills = score_required_skills(resume_data)
+        if not job_full_text_processed:
+            return 0.0, matched_required_skills # A JD without text can't be matched
+        return combine_scores(required_skills_score_component, general_similarity), matched_required_skills
+
+    return score_resume
+
+
+def make_jobs_scorer(jobs_data, jobs_term_counts=None):
+    """
+    Builds a function that scores a batch of resumes against a fixed set of job descriptions and
+    returns a (num_jobs, num_resumes) array of scores (0-100). Every score is the same as
+    match_resume_to_job for that resume/JD pair, so a resume's scores do not depend on what else
+    is in the batch. The JDs' term counts are computed once; a batch then takes three sparse matrix products:
+    with two-document IDF (1 for shared terms, ln(3/2) + 1 otherwise) the dot product and both
+    norms only depend on per-term sums over the terms a resume shares with each JD.
+    'jobs_term_counts' (term_counts() of each JD, aligned with jobs_data) skips counting them again
+    when a caller rebuilds the scorer for a changing set of JDs.
+    """
+    from scipy.sparse import csr_matrix
+
+    analyzer = tfidf_analyzer()
+    if jobs_term_counts is None:
+        jobs_term_counts = [term_counts(job_data) for job_data in jobs_data]
+
+    vocabulary = {} # Terms of the JDs; resume terms outside it only add to the resume's norm
+    indptr, indices, counts = [0], [], []
+    job_has_text = np.zeros(len(jobs_data), dtype=bool)
+    for j, (job_data, job_term_counts) in enumerate(zip(jobs_data, jobs_term_counts)):
+        # A JD whose text is all stop words has no terms but still counts as having text
+        job_has_text[j] = bool(job_term_counts) or bool(preprocess_text_for_tfidf(job_data.get('full_text', '')))
+        for term, count in job_term_counts.items():
+            indices.append(vocabulary.setdefault(term, len(vocabulary)))
+            counts.append(count)
+        indptr.append(len(indices))
+    job_counts = csr_matrix((np.array(counts, dtype=np.float64), indices, indptr), shape=(len(jobs_data), len(vocabulary)))
+    job_sq_totals = np.asarray(job_counts.multiply(job_counts).sum(axis=1)).ravel()
+
+    skill_vocabulary = sorted(set().union(*(job_data.get('required_skills', []) for job_data in jobs_data)))
+    skill_index = {skill: i for i, skill in enumerate(skill_vocabulary)}
+    skill_weights = np.array([SKILL_TAXONOMY.weight(skill) for skill in skill_vocabulary])
+    job_skills = np.zeros((len(jobs_data), len(skill_vocabulary)))
+    for j, job_data in enumerate(jobs_data):
+        job_required_ids = [skill_index[skill] for skill in set(job_data.get('required_skills', []))]
+        job_skills[j, job_required_ids] = skill_weights[job_required_ids]
+    required_weights = job_skills.sum(axis=1)[:, np.newaxis]
+
+    def score_resumes(resumes_data):
+        num_resumes = len(resumes_data)
+        with stage('vectorize'):
+            indptr, indices, counts = [0], [], []
+            resume_sq_totals = np.zeros(num_resumes)
+            resume_skills = np.zeros((num_resumes, len(skill_vocabulary)))
+            for i, resume_data in enumerate(resumes_data):
+                for term, count in Counter(analyzer(preprocess_text_for_tfidf(resume_data.get('full_text', '')))).items():
+                    resume_sq_totals[i] += count * count
+                    term_id = vocabulary.get(term)
+                    if term_id is not None:
+                        indices.append(term_id)
+                        counts.append(count)
+                indptr.append(len(indices))
+                resume_skills[i, [skill_index[skill] for skill in set(resume_data.get('skills', [])) if skill in skill_index]] = 1.0
+            resume_counts = csr_matrix((np.array(counts, dtype=np.float64), indices, indptr), shape=(num_resumes, len(vocabulary)))
+
+        with stage('score'):
+            general_similarity = two_document_similarity_matrix(job_counts, resume_counts, job_sq_totals, resume_sq_totals)
+
+            matched_weights = job_skills @ resume_skills.T
+            required_skills_score_component = np.divide(matched_weights, required_weights,
+                                                        out=np.zeros_like(matched_weights), where=required_weights > 0)
+            final_scores = combine_scores(required_skills_score_component, general_similarity)
+            final_scores[~job_has_text] = 0.0 # A JD without text can't be matched, as in match_resume_to_job
+        return final_scores
+
+    return score_resumes
+
+
+def vectorize_job_description(job_description_data, lookup_term_ids, idf, unseen_idf):
+    """
+    TF-IDF vector of a job description against a stored vocabulary and IDF, for scoring it against
+    precomputed (L2-normalized) resume vectors with one sparse dot product.
+    lookup_term_ids(terms) returns an array of term IDs, -1 for terms outside the vocabulary; those
+    terms still count toward the JD's norm with 'unseen_idf' (their IDF over the stored pool).
+    Returns (term_ids, weights), L2-normalized; both are empty if the JD has no terms.
+    """
+    job_term_counts = Counter(tfidf_analyzer()(preprocess_text_for_tfidf(job_description_data.get('full_text', ''))))
+    if not job_term_counts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0)
+    term_ids = np.asarray(lookup_term_ids(list(job_term_counts)), dtype=np.int64)
+    seen = term_ids >= 0
+    idf = np.asarray(idf)
+    weights = np.fromiter(job_term_counts.values(), dtype=np.float64, count=len(job_term_counts))
+    weights *= np.where(seen, idf[np.where(seen, term_ids, 0)] if len(idf) else 0.0, unseen_idf)
+    norm = math.sqrt(float(weights @ weights))
+    return term_ids[seen], weights[seen] / norm
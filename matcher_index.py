@@ -0,0 +1,235 @@
+# matcher_index.py
+import logging
+import os
+
+import numpy as np
+
+from ingest import iter_resume_files, parse_resumes_parallel
+from parser import parse_cache_version
+from matcher import combine_scores, pooled_idf, preprocess_text_for_tfidf, term_counts, vectorize_job_description
+from parse_cache import hash_file
+from instrumentation import stage
+from skill_index import SkillIndex
+from skill_taxonomy import SKILL_TAXONOMY
+
+logger = logging.getLogger(__name__)
+
+
+class MatcherIndex:
+    """
+    Persistent, incrementally updated matching state for a candidate pool: the TF-IDF vocabulary,
+    document frequencies, per-resume term counts and skill sets (in a SkillIndex).
+    Resumes can be added, updated and removed one at a time; document frequencies are adjusted
+    in place instead of being recomputed, and the L2-normalized TF-IDF matrix is derived from them
+    on the first query after a change. Scoring a new JD never touches the resume files.
+    Scores are the pool score of match_resumes_to_job over the indexed resumes.
+    The index is stamped with the parser/taxonomy version (parse_cache_version()) its documents were
+    parsed with; sync_directory re-parses everything when that version has changed.
+    """
+
+    def __init__(self):
+        self.vocabulary = {} # term -> term ID (grow-only)
+        self.document_frequencies = [] # term ID -> number of indexed resumes containing the term
+        self.documents = {} # key (absolute file path) -> {'content_hash', 'mtime', 'size', 'term_ids', 'term_counts'}
+        self.skill_index = SkillIndex()
+        self._tfidf = None # Cached (keys, normalized TF-IDF matrix, idf, skill IDs); reset on every change
+        self.parse_version = parse_cache_version() # Parser/taxonomy version of the indexed documents
+
+    def __len__(self):
+        return len(self.documents)
+
+    def __contains__(self, key):
+        return key in self.documents
+
+    def add(self, key, resume_data, content_hash=None, mtime=None, size=None):
+        """
+        Indexes a parsed resume (from parse_resume) under 'key', replacing any previous version.
+        """
+        if key in self.documents:
+            self.remove(key)
+        resume_term_counts = term_counts(resume_data)
+        term_ids = []
+        for term in resume_term_counts:
+            term_id = self.vocabulary.setdefault(term, len(self.vocabulary))
+            if term_id == len(self.document_frequencies):
+                self.document_frequencies.append(0)
+            self.document_frequencies[term_id] += 1
+            term_ids.append(term_id)
+        self.documents[key] = {
+            'content_hash': content_hash,
+            'mtime': mtime,
+            'size': size,
+            'term_ids': np.array(term_ids, dtype=np.int32),
+            'term_counts': np.array(list(resume_term_counts.values()), dtype=np.int32),
+        }
+        self.skill_index.add(key, resume_data.get('skills', []))
+        self._tfidf = None
+
+    def update(self, key, resume_data, content_hash=None, mtime=None, size=None):
+        self.add(key, resume_data, content_hash, mtime, size)
+
+    def remove(self, key_or_hash):
+        """
+        Removes a resume by key (file path) or, failing that, every resume with that content hash.
+        """
+        if key_or_hash in self.documents:
+            keys = [key_or_hash]
+        else:
+            keys = [key for key, document in self.documents.items() if document['content_hash'] == key_or_hash]
+            if not keys:
+                raise KeyError(key_or_hash)
+        for key in keys:
+            document = self.documents.pop(key)
+            for term_id in document['term_ids'].tolist():
+                self.document_frequencies[term_id] -= 1
+            self.skill_index.remove(key)
+        self._tfidf = None
+
+    def sync_directory(self, resumes_dir, exclude=(), max_workers=None, cache_path=None):
+        """
+        Brings the index in line with the resume files in resumes_dir. Files whose mtime and size are
+        unchanged are skipped without being read; otherwise the content hash decides whether the file
+        is re-parsed. Indexed files that no longer exist in the directory are removed.
+        If the index was built with another parser/taxonomy version, every file is re-parsed and
+        documents from other directories (which can't be re-parsed here) are removed.
+        Returns counts of 'added', 'updated', 'removed', 'unchanged' and 'failed' files.
+        """
+        resumes_dir = os.path.abspath(resumes_dir)
+        parse_version = parse_cache_version()
+        stale = self.parse_version != parse_version
+        if stale:
+            logger.info("Index was built with parser version %s (now %s); re-parsing every resume",
+                        self.parse_version, parse_version)
+        stats = dict.fromkeys(('added', 'updated', 'removed', 'unchanged', 'failed'), 0)
+        seen_keys = set()
+        to_parse = [] # (key, content_hash, stat)
+        for file_path in iter_resume_files(resumes_dir, exclude):
+            key = os.path.abspath(file_path)
+            seen_keys.add(key)
+            stat = os.stat(key)
+            document = self.documents.get(key)
+            if not stale and document is not None and document['mtime'] == stat.st_mtime and document['size'] == stat.st_size:
+                stats['unchanged'] += 1
+                continue
+            content_hash = hash_file(key)
+            if not stale and document is not None and document['content_hash'] == content_hash:
+                # Touched but not modified: refresh the stat info only
+                document['mtime'], document['size'] = stat.st_mtime, stat.st_size
+                stats['unchanged'] += 1
+                continue
+            to_parse.append((key, content_hash, stat))
+
+        parsed = parse_resumes_parallel([key for key, _, _ in to_parse], max_workers=max_workers, cache_path=cache_path)
+        for (key, content_hash, stat), (_, resume_data) in zip(to_parse, parsed):
+            if resume_data is None:
+                stats['failed'] += 1
+                if key in self.documents:
+                    self.remove(key)
+                continue
+            stats['updated' if key in self.documents else 'added'] += 1
+            self.add(key, resume_data, content_hash, stat.st_mtime, stat.st_size)
+
+        for key in [key for key in self.documents if (stale or os.path.dirname(key) == resumes_dir) and key not in seen_keys]:
+            self.remove(key)
+            stats['removed'] += 1
+        self.parse_version = parse_version
+        return stats
+
+    def _tfidf_state(self):
+        if self._tfidf is None:
+            from scipy.sparse import csr_matrix
+            from sklearn.preprocessing import normalize
+
+            keys = list(self.documents)
+            documents = [self.documents[key] for key in keys]
+            indptr = np.cumsum([0] + [len(document['term_ids']) for document in documents])
+            term_ids = np.concatenate([document['term_ids'] for document in documents]) if documents else np.zeros(0, dtype=np.int32)
+            term_counts = np.concatenate([document['term_counts'] for document in documents]) if documents else np.zeros(0, dtype=np.int32)
+
+            idf = pooled_idf(self.document_frequencies, len(keys))
+            matrix = csr_matrix((term_counts * idf[term_ids], term_ids, indptr), shape=(len(keys), len(self.vocabulary)))
+            skill_ids = np.array([self.skill_index.ids[key] for key in keys], dtype=np.int64)
+            self._tfidf = (keys, normalize(matrix) if keys else matrix, idf, skill_ids)
+        return self._tfidf
+
+    def score_job(self, job_description_data):
+        """
+        Scores every indexed resume against a job description.
+        Only the JD is vectorized; similarities are one sparse matrix-vector product.
+        Returns (keys, scores) with scores (0-100) as a NumPy array aligned with keys.
+        """
+        with stage('vectorize'):
+            keys, matrix, idf, skill_ids = self._tfidf_state()
+        if not preprocess_text_for_tfidf(job_description_data.get('full_text', '')):
+            logger.error("Job description text is empty. Cannot perform matching.")
+            return keys, np.zeros(len(keys))
+
+        with stage('vectorize'):
+            job_term_ids, job_weights = vectorize_job_description(
+                job_description_data, lambda terms: [self.vocabulary.get(term, -1) for term in terms], idf, pooled_idf(0, len(keys)))
+
+        with stage('score'):
+            job_vector = np.zeros(len(self.vocabulary))
+            job_vector[job_term_ids] = job_weights
+            general_similarity = matrix @ job_vector
+
+            job_required_skills = set(job_description_data.get('required_skills', []))
+            required_weight = sum(SKILL_TAXONOMY.weight(skill) for skill in job_required_skills)
+            required_skills_score_component = np.zeros(len(keys))
+            if required_weight > 0:
+                required_skills_score_component = self.skill_index.match_weights(job_required_skills)[skill_ids] / required_weight
+
+            final_scores = combine_scores(required_skills_score_component, general_similarity)
+        return keys, final_scores
+
+    def save(self, index_dir):
+        os.makedirs(index_dir, exist_ok=True)
+        self.skill_index.save(os.path.join(index_dir, 'skills.npz'))
+        keys = list(self.documents)
+        documents = [self.documents[key] for key in keys]
+        terms = [None] * len(self.vocabulary)
+        for term, term_id in self.vocabulary.items():
+            terms[term_id] = term
+        np.savez_compressed(
+            os.path.join(index_dir, 'tfidf.npz'),
+            parse_version=np.array(self.parse_version or '', dtype=str),
+            terms=np.array(terms, dtype=str),
+            document_frequencies=np.array(self.document_frequencies, dtype=np.int64),
+            keys=np.array(keys, dtype=str),
+            content_hashes=np.array([document['content_hash'] or '' for document in documents], dtype=str),
+            mtimes=np.array([document['mtime'] if document['mtime'] is not None else np.nan for document in documents], dtype=np.float64),
+            sizes=np.array([document['size'] if document['size'] is not None else -1 for document in documents], dtype=np.int64),
+            indptr=np.cumsum([0] + [len(document['term_ids']) for document in documents]),
+            term_ids=np.concatenate([document['term_ids'] for document in documents]) if documents else np.zeros(0, dtype=np.int32),
+            term_counts=np.concatenate([document['term_counts'] for document in documents]) if documents else np.zeros(0, dtype=np.int32),
+        )
+
+    @classmethod
+    def load(cls, index_dir):
+        index = cls()
+        index.skill_index = SkillIndex.load(os.path.join(index_dir, 'skills.npz'))
+        with np.load(os.path.join(index_dir, 'tfidf.npz')) as data:
+            # Indexes saved before the version was stored count as stale
+            index.parse_version = str(data['parse_version']) if 'parse_version' in data else None
+            index.vocabulary = {str(term): term_id for term_id, term in enumerate(data['terms'])}
+            index.document_frequencies = data['document_frequencies'].tolist()
+            indptr, term_ids, term_counts = data['indptr'], data['term_ids'], data['term_counts']
+            for i, key in enumerate(data['keys']):
+                mtime, size = float(data['mtimes'][i]), int(data['sizes'][i])
+                index.documents[str(key)] = {
+                    'content_hash': str(data['content_hashes'][i]) or None,
+                    'mtime': None if np.isnan(mtime) else mtime,
+                    'size': None if size < 0 else size,
+                    'term_ids': term_ids[indptr[i]:indptr[i + 1]].copy(),
+                    'term_counts': term_counts[indptr[i]:indptr[i + 1]].copy(),
+                }
+        return index
+
+    @classmethod
+    def open(cls, index_dir):
+        """
+        Loads the index from index_dir, or returns an empty one if it doesn't exist yet.
+        """
+        if os.path.exists(os.path.join(index_dir, 'tfidf.npz')):
+            return cls.load(index_dir)
+        return cls()
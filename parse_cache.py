@@ -0,0 +1,174 @@
+# parse_cache.py
+import hashlib
+import json
+import sqlite3
+import time
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024 # 512 MB of cached text before LRU eviction kicks in
+DEFAULT_BATCH_SIZE = 64 # Buffered writes per transaction
+BUSY_TIMEOUT = 60 # Seconds a connection waits for another process's write lock before giving up
+
+
+def hash_file(file_path):
+    """
+    Content hash of a file (sha256 hex digest). Renamed or copied files share a cache entry.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """
+    On-disk, content-addressed cache of parse results backed by SQLite.
+    Entries are keyed by the file's content hash and stamped with a parser/taxonomy version;
+    entries written under any other version are ignored, and dropped when the cache is opened with purge=True.
+    'version' is a string or a function returning the version in effect (e.g. parser.parse_cache_version),
+    which is then called on every get and put, so settings changed while the cache is open take effect.
+    The total size of cached text is capped at max_bytes, evicting least recently used entries first.
+    Several processes may share one cache file: it is opened in WAL mode with a busy timeout, and
+    worker processes should open it with purge=False after the parent has purged it once.
+    Writes (new entries and last-used times of hits) are buffered and committed every batch_size
+    writes and on flush()/close().
+    """
+
+    def __init__(self, db_path, version, max_bytes=DEFAULT_MAX_BYTES, purge=True, batch_size=DEFAULT_BATCH_SIZE):
+        self._version = version
+        self.max_bytes = max_bytes
+        self.batch_size = batch_size
+        self._pending_puts = {} # content hash -> entries row, not yet written
+        self._pending_touches = {} # content hash -> last used time, not yet written
+        self.conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT)
+        # WAL lets readers run alongside a writer; it is a property of the file, so this only writes once
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " content_hash TEXT PRIMARY KEY,"
+                " version TEXT NOT NULL,"
+                " raw_text TEXT NOT NULL,"
+                " processed_text TEXT NOT NULL,"
+                " skills TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+            # Running total of entries.size, kept up to date by triggers so eviction never has to sum the table
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            self.conn.execute("INSERT OR IGNORE INTO meta SELECT 'total_size', COALESCE(SUM(size), 0) FROM entries")
+            self.conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS entries_insert_size AFTER INSERT ON entries BEGIN"
+                " UPDATE meta SET value = value + NEW.size WHERE key = 'total_size'; END"
+            )
+            self.conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS entries_update_size AFTER UPDATE OF size ON entries BEGIN"
+                " UPDATE meta SET value = value + NEW.size - OLD.size WHERE key = 'total_size'; END"
+            )
+            self.conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS entries_delete_size AFTER DELETE ON entries BEGIN"
+                " UPDATE meta SET value = value - OLD.size WHERE key = 'total_size'; END"
+            )
+        if purge:
+            self.purge()
+
+    @property
+    def version(self):
+        return self._version() if callable(self._version) else self._version
+
+    def purge(self):
+        """
+        Drops entries written under any other version (the parser or skill taxonomy changed).
+        """
+        with self.conn:
+            self.conn.execute("DELETE FROM entries WHERE version != ?", (self.version,))
+
+    def total_size(self):
+        """
+        Bytes of cached text currently stored (not counting unflushed writes).
+        """
+        return self.conn.execute("SELECT value FROM meta WHERE key = 'total_size'").fetchone()[0]
+
+    def get(self, content_hash):
+        """
+        Returns {'raw_text', 'processed_text', 'skills', 'skill_sections'} for a cached file, or None on a miss.
+        """
+        version = self.version
+        row = self._pending_puts.get(content_hash)
+        if row is not None and row[1] == version:
+            row = row[2:5]
+        else:
+            row = self.conn.execute(
+                "SELECT raw_text, processed_text, skills FROM entries WHERE content_hash = ? AND version = ?",
+                (content_hash, version),
+            ).fetchone()
+            if row is None:
+                return None
+            self._pending_touches[content_hash] = time.time()
+            self._maybe_flush()
+        raw_text, processed_text, skills = row
+        skill_sections = {skill: tuple(sections) for skill, sections in json.loads(skills).items()}
+        return {'raw_text': raw_text, 'processed_text': processed_text, 'skills': set(skill_sections), 'skill_sections': skill_sections}
+
+    def put(self, content_hash, raw_text, processed_text, skill_sections):
+        """
+        Caches a parse; 'skill_sections' maps each skill to the sections it was found in (parser.extract_skill_sections).
+        """
+        skills_json = json.dumps(dict(sorted(skill_sections.items())))
+        size = len(raw_text.encode('utf-8')) + len(processed_text.encode('utf-8')) + len(skills_json)
+        self._pending_puts[content_hash] = (content_hash, self.version, raw_text, processed_text, skills_json, size, time.time())
+        self._pending_touches.pop(content_hash, None)
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if len(self._pending_puts) + len(self._pending_touches) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes buffered entries and last-used times in one transaction, then evicts if over max_bytes.
+        """
+        if not self._pending_puts and not self._pending_touches:
+            return
+        # On any error (including a parse timeout signal) the transaction is rolled back and the writes stay buffered
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            # An upsert rather than INSERT OR REPLACE, so the size triggers see the replaced row
+            self.conn.executemany(
+                "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (content_hash) DO UPDATE SET"
+                " version = excluded.version, raw_text = excluded.raw_text, processed_text = excluded.processed_text,"
+                " skills = excluded.skills, size = excluded.size, last_used = excluded.last_used",
+                self._pending_puts.values(),
+            )
+            self.conn.executemany(
+                "UPDATE entries SET last_used = ? WHERE content_hash = ?",
+                ((last_used, content_hash) for content_hash, last_used in self._pending_touches.items()),
+            )
+            if self._pending_puts:
+                self._evict()
+        self._pending_puts.clear()
+        self._pending_touches.clear()
+
+    def _evict(self):
+        total_size = self.total_size()
+        if total_size <= self.max_bytes:
+            return
+        stale_hashes = []
+        for content_hash, size in self.conn.execute("SELECT content_hash, size FROM entries ORDER BY last_used"):
+            if total_size <= self.max_bytes:
+                break
+            stale_hashes.append((content_hash,))
+            total_size -= size
+        self.conn.executemany("DELETE FROM entries WHERE content_hash = ?", stale_hashes)
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
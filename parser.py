@@ -1,128 +1,182 @@
-import spacy
 import re
+import bisect
+import functools
+import logging
 import os # ADDED: Import os for os.path.basename
-from utils import extract_text_from_file # Ensure utils.py exists and has extract_text_from_file
-
-# Load a pre-trained spaCy model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("Downloading spaCy model 'en_core_web_sm' (this may take a moment)...")
-    spacy.cli.download("en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
-
-# Define a more comprehensive list of software skills and related terms
-# Expanded significantly to capture terms from your job description and common SDE skills
-SOFTWARE_SKILLS = {
-    # Programming Languages
-    "python", "java", "c++", "c#", "javascript", "typescript", "ruby", "php", "go", "swift",
-    "kotlin", "scala", "rust", "html", "css", "sql", "r", "perl", "bash", "shell scripting",
-    "matlab", "vb.net", "vba", "objective-c", "dart", "elixir", "haskell", "clojure", "lisp", "fortran", "assembly",
-
-    # Frameworks & Libraries
-    "react", "angular", "vue.js", "node.js", "express.js", "django", "flask", "ruby on rails", "spring boot",
-    "spring", "asp.net", "laravel", "symfony", "react native", "flutter", "xamarin", "tensorflow", "pytorch",
-    "keras", "scikit-learn", "numpy", "pandas", "matplotlib", "seaborn", "bootstrap", "jquery", "tailwind css",
-    "graphql", "rest api", "ajax", "redux", "mobx", "jest", "mocha", "cypress", "selenium", "pytest", "junit",
-
-    # Databases
-    "mysql", "postgresql", "mongodb", "redis", "cassandra", "couchbase", "sqlite", "oracle", "sql server",
-    "dynamodb", "mariadb", "neo4j", "elasticsearch", "firebase",
-
-    # Cloud Platforms & Services
-    "aws", "amazon web services", "azure", "google cloud platform", "gcp", "docker", "kubernetes", "jenkins",
-    "gitlab ci", "github actions", "terraform", "ansible", "puppet", "chef", "heroku", "netlify", "vercel",
-    "lambda", "ec2", "s3", "rds", "azure devops", "azure functions", "google kubernetes engine", "eks", "ecs",
-
-    # DevOps & CI/CD
-    "devops", "ci/cd", "continuous integration", "continuous delivery", "jenkins", "travis ci", "circleci",
-    "github", "gitlab", "bitbucket", "svn", "git", "version control", "containerization", "microservices",
-    "api gateway", "service mesh", "grafana", "prometheus", "elk stack", "logstash", "kibana", "terraform",
-    "ansible", "puppet", "chef", "argocd", "fluxcd",
-
-    # Operating Systems
-    "linux", "unix", "windows", "macos", "ubuntu", "centos", "redhat", "debian",
-
-    # Methodologies & Concepts
-    "agile", "scrum", "kanban", "devsecops", "test-driven development", "tdd", "object-oriented programming",
-    "oop", "functional programming", "data structures", "algorithms", "design patterns", "microservices architecture",
-    "serverless", "responsive web design", "ui/ux", "user interface", "user experience", "restful api",
-    "web sockets", "message queues", "kafka", "rabbitmq", "apache kafka", "load balancing", "caching",
-    "distributed systems", "system design", "network security", "data encryption", "cybersecurity",
-    "machine learning", "deep learning", "natural language processing", "nlp", "computer vision", "big data",
-    "hadoop", "spark", "data analysis", "data science", "etl", "data warehousing", "business intelligence",
-    "cloud computing", "virtualization", "networking", "tcp/ip", "dns", "http/https", "rest", "soap",
-    "unit testing", "integration testing", "end-to-end testing", "api testing", "performance testing",
-    "security testing", "sdlc", "software development life cycle", "data modeling", "data governance",
-    "data mining", "data visualization", "business analysis", "technical writing", "documentation",
-    "project management", "jira", "confluence", "trello", "asana", "microsoft project",
-    "customer relationship management", "crm", "enterprise resource planning", "erp",
-    "quality assurance", "qa", "software testing", "test automation", "api development", "web development",
-    "mobile development", "android development", "ios development", "desktop development", "game development",
-    "cloud native", "observability", "site reliability engineering", "sre", "it operations", "automation",
-    "scripting", "bash scripting", "powershell", "shell scripting", "frontend", "backend", "full stack",
-    "front-end development", "back-end development", "full-stack development", "github pipelines",
-    # Specific skills directly from your job description's body/requirements:
-    "user interfaces", "coding", "testing", "debugging", "problem-solving", "analytical skills", "teamwork", "communication"
-}
+from utils import extract_text_from_file, pdf_extraction_version # Ensure utils.py exists and has extract_text_from_file
+from parse_cache import hash_file
+from skill_taxonomy import SKILL_TAXONOMY
+from instrumentation import count, stage
 
-# Add common soft skills that might appear explicitly
-SOFT_SKILLS = {
-    "communication", "teamwork", "problem-solving", "analytical skills", "leadership", "adaptability",
-    "time management", "critical thinking", "creativity", "collaboration", "interpersonal skills",
-    "negotiation", "attention to detail", "organization", "project management", "client management",
-    "presentation skills", "mentoring", "coaching"
-}
+logger = logging.getLogger(__name__)
+
+# spaCy is heavy (seconds to import, hundreds of MB) and none of the default parsing needs it,
+# so the model is only loaded by NLP-based features that call get_nlp(), and never downloaded implicitly.
+SPACY_MODEL = "en_core_web_sm"
+_nlp = None
+
+
+def get_nlp():
+    """
+    Returns the spaCy pipeline, loading it on first use.
+    Raises OSError if the model is not installed (python -m spacy download en_core_web_sm).
+    """
+    global _nlp
+    if _nlp is None:
+        import spacy
+        try:
+            _nlp = spacy.load(SPACY_MODEL)
+        except OSError as e:
+            raise OSError(f"spaCy model '{SPACY_MODEL}' is not installed. Run: python -m spacy download {SPACY_MODEL}") from e
+    return _nlp
+
+# Skills, their aliases and coverage weights come from the taxonomy file (skills_taxonomy.json).
+# Skill extraction only ever emits canonical skills: aliases such as "k8s" or "amazon web services"
+# are reported as "kubernetes" and "aws".
+SOFTWARE_SKILLS = set(SKILL_TAXONOMY.groups.get('software', ()))
+SOFT_SKILLS = set(SKILL_TAXONOMY.groups.get('soft', ()))
 
 # Combine all skills for general extraction
-ALL_SKILLS = SOFTWARE_SKILLS.union(SOFT_SKILLS)
+ALL_SKILLS = set(SKILL_TAXONOMY.skills)
+
+# Bump PARSER_VERSION whenever text processing or skill extraction logic changes.
+# The skill taxonomy (skills and aliases) and the PDF backend/budgets are folded in, so editing
+# skills_taxonomy.json or the PDF settings in utils.py invalidates cached parses automatically.
+PARSER_VERSION = 3
+SKILLS_VERSION = SKILL_TAXONOMY.version
+
+
+def parse_cache_version():
+    """
+    Version of parse results: keys the parse cache and stamps MatcherIndex and VectorStore.
+    Evaluated at call time, since the PDF backends and budgets (utils.PDF_*) can change at runtime.
+    """
+    return f"{PARSER_VERSION}:{SKILLS_VERSION}:{pdf_extraction_version()}"
+
+
+class SkillMatcher:
+    """
+    Precompiled multi-pattern matcher over a skill set or an alias table.
+    All aliases are folded into one trie-shaped regex, so a document is scanned once
+    (instead of once per alias) and every occurrence is reported with its offsets, as the
+    canonical skill(s) the alias stands for. The cost of a scan grows with the length of the
+    matched aliases, not with their number, so large alias tables stay cheap.
+    Matching semantics are the same as r'\b' + re.escape(alias) + r'\b' per alias.
+    """
+
+    def __init__(self, skills):
+        """
+        'skills' is either {alias: canonical skills} (e.g. SkillTaxonomy.aliases) or an iterable
+        of skills, each matching only itself.
+        """
+        if not isinstance(skills, dict):
+            skills = {skill: (skill,) for skill in skills}
+        self.aliases = {alias: tuple(canonical) for alias, canonical in skills.items() if alias and canonical}
+        self.skills = frozenset(skill for canonical in self.aliases.values() for skill in canonical)
+        trie = {}
+        for alias in self.aliases:
+            node = trie
+            for char in alias:
+                node = node.setdefault(char, {})
+            node[_TRIE_END] = True
+        # The lookahead keeps the match zero-width, so finditer tries every position
+        # and overlapping skills (e.g. "bash scripting" / "scripting") are all seen.
+        # At one position the trie tries longer continuations first; shorter aliases that
+        # are prefixes of the longest hit are recovered via self._prefixes.
+        self._pattern = re.compile(r'\b(?=(' + _trie_to_regex(trie) + '))') if trie else None
+        self._prefixes = {alias: _trie_prefixes(trie, alias) for alias in self.aliases}
+
+    def finditer(self, text_lower):
+        """
+        Yields (start, end, skill) for every skill occurrence in 'text_lower', in order of start offset,
+        where 'skill' is canonical and start/end are the offsets of the alias that matched.
+        'text_lower' should already be lowercased (aliases are lowercase).
+        """
+        if self._pattern is None:
+            return
+        for match in self._pattern.finditer(text_lower):
+            start, longest = match.start(1), match.group(1)
+            end = start + len(longest)
+            for skill in self.aliases[longest]:
+                yield start, end, skill
+            for prefix_length in self._prefixes[longest]:
+                end = start + prefix_length
+                if _WORD_BOUNDARY.match(text_lower, end):
+                    for skill in self.aliases[longest[:prefix_length]]:
+                        yield start, end, skill
+
+
+_TRIE_END = ''
+_WORD_BOUNDARY = re.compile(r'\b')
+
+
+def _trie_prefixes(trie, alias):
+    # Lengths of the other aliases that are prefixes of 'alias', longest first (one walk down the trie)
+    lengths, node = [], trie
+    for length, char in enumerate(alias[:-1], 1):
+        node = node[char]
+        if _TRIE_END in node:
+            lengths.append(length)
+    return lengths[::-1]
+
+
+def _trie_to_regex(node):
+    alternatives = [re.escape(char) + _trie_to_regex(child) for char, child in sorted(node.items()) if char != _TRIE_END]
+    if _TRIE_END in node:
+        alternatives.append(r'\b') # Listed last so longer skills win at a given position
+    if len(alternatives) == 1:
+        return alternatives[0]
+    return '(?:' + '|'.join(alternatives) + ')'
+
+
+# Compiled once at import for the default skill set (every alias in the taxonomy)
+ALL_SKILLS_MATCHER = SkillMatcher(SKILL_TAXONOMY.aliases)
+
+
+def get_skill_matcher(skill_set=ALL_SKILLS):
+    if skill_set is ALL_SKILLS:
+        return ALL_SKILLS_MATCHER
+    return _compile_skill_matcher(frozenset(skill_set))
+
+
+@functools.lru_cache(maxsize=16)
+def _compile_skill_matcher(skill_set):
+    # Taxonomy aliases of the skills in the set, plus the skills themselves (including any outside the taxonomy)
+    aliases = {skill: (skill,) for skill in skill_set}
+    for alias, canonical in SKILL_TAXONOMY.aliases.items():
+        canonical = tuple(skill for skill in canonical if skill in skill_set)
+        if canonical:
+            aliases[alias] = canonical
+    return SkillMatcher(aliases)
+
+
+def find_skill_matches(text_raw, skill_set=ALL_SKILLS):
+    """
+    Returns a list of (start, end, skill) tuples for every skill found in the text,
+    with offsets into text_raw.lower().
+    """
+    return list(get_skill_matcher(skill_set).finditer(text_raw.lower()))
+
+
+def _is_skill_line(line_lower):
+    # Check for patterns indicating explicit skill mention in the line
+    return line_lower.startswith('·') or line_lower.startswith('-') or line_lower.startswith('*') or line_lower.startswith('•') or \
+           "experience with" in line_lower or "experience in" in line_lower or "solid understanding of" in line_lower or \
+           "proficiency in" in line_lower or "proficient in" in line_lower
 
 
 def extract_skills(text_raw, skill_set=ALL_SKILLS):
     """
     Extracts skills from text by matching against a predefined skill_set.
-    Also looks for skills within common requirement phrases or bullet points.
+    Aliases from the skill taxonomy (e.g. "k8s", "micro service") are reported as their canonical skill.
     'text_raw' should be the original full text (not overly processed yet)
     """
-    found_skills = set()
     text_lower = text_raw.lower() # Only lowercase once here
 
-    # 1. Direct keyword matching (most robust)
-    for skill in skill_set:
-        # Use word boundaries to match whole words/phrases precisely
-        if re.search(r'\b' + re.escape(skill) + r'\b', text_lower):
-            found_skills.add(skill)
-
-    # 2. Enhanced pattern matching for common skill listing formats
-    # This catches skills listed with bullet points or introductory phrases
-    lines = text_raw.split('\n') # Split original text (preserves bullet points etc.)
-    for line in lines:
-        line_lower = line.strip().lower()
-        
-        # Check for patterns indicating explicit skill mention in the line
-        if line_lower.startswith('·') or line_lower.startswith('-') or line_lower.startswith('*') or line_lower.startswith('•') or \
-           "experience with" in line_lower or "experience in" in line_lower or "solid understanding of" in line_lower or \
-           "proficiency in" in line_lower or "proficient in" in line_lower:
-            
-            # Specific matches for job description's critical keywords/phrases
-            if "java development" in line_lower:
-                found_skills.add("java")
-            if "postgresql" in line_lower:
-                found_skills.add("postgresql")
-            if "micro service" in line_lower or "microservices" in line_lower:
-                found_skills.add("microservices")
-            if "gitlab" in line_lower:
-                found_skills.add("gitlab")
-            if "github pipelines" in line_lower:
-                found_skills.add("github pipelines")
-                found_skills.add("github") # Also add general github
-
-            # Also, extract any general skills from these specific lines (prevents redundancy if already added by direct match)
-            for skill in skill_set:
-                if re.search(r'\b' + re.escape(skill) + r'\b', line_lower):
-                    found_skills.add(skill)
-
-    print(f"DEBUG: Extracted raw skills for text (from extract_skills): {found_skills}")
+    # One pass of the precompiled matcher finds every skill and alias
+    found_skills = {skill for _, _, skill in get_skill_matcher(skill_set).finditer(text_lower)}
+
+    logger.debug("Extracted raw skills for text (from extract_skills): %s", found_skills)
     return found_skills
 
 
@@ -132,92 +186,169 @@ def extract_required_skills(text_raw):
     This function should produce the comprehensive set of skills that ARE required.
     'text_raw' should be the original full text.
     """
-    required_skills = set()
     text_lower = text_raw.lower() # Only lowercase once here
 
-    # Heuristic: Extracting from lines starting with bullet points or strong indicators
-    lines = text_raw.split('\n') # Use raw text split to preserve formatting like bullet points
-    for line in lines:
-        line_lower = line.strip().lower()
-        
-        # Check for patterns indicating explicit skill mention in the line
-        if line_lower.startswith('·') or line_lower.startswith('-') or line_lower.startswith('*') or line_lower.startswith('•') or \
-           "experience with" in line_lower or "experience in" in line_lower or "solid understanding of" in line_lower or \
-           "proficiency in" in line_lower or "proficient in" in line_lower or "required skills:" in line_lower:
-            
-            # Specific matches for job description's critical keywords/phrases from YOUR JD
-            if "java development" in line_lower:
-                required_skills.add("java")
-            if "postgresql" in line_lower:
-                required_skills.add("postgresql")
-            if "micro service" in line_lower or "microservices" in line_lower:
-                required_skills.add("microservices")
-            if "gitlab" in line_lower:
-                required_skills.add("gitlab")
-            if "github pipelines" in line_lower:
-                required_skills.add("github pipelines")
-                required_skills.add("github") # Also add general github
-            if "ability to quickly grasp concepts" in line_lower: # Example of a soft skill from JD
-                required_skills.add("problem-solving") # Map to a broader skill
-                required_skills.add("analytical skills") # Map to a broader skill
-                required_skills.add("adaptability") # Map to a broader skill
-
-
-            # Additionally, search for any general skills within these specific requirement lines
-            for skill in ALL_SKILLS:
-                if re.search(r'\b' + re.escape(skill) + r'\b', line_lower):
-                    required_skills.add(skill)
-
-    # Crucial: Augment required skills with *all* general skills found throughout the JD text.
-    # This ensures that if a skill is mentioned anywhere in the JD (even if not in a bullet point),
-    # it is considered part of the 'required' set for the purpose of the JD's own self-matching,
-    # and therefore, for high scores.
-    # We use extract_skills with the full raw text to capture everything.
-    augmented_required_skills = required_skills.copy() # Start with explicitly found skills
-    
-    # Pass the raw text to extract_skills, which handles its own lowercasing and processing
-    augmented_required_skills.update(extract_skills(text_raw, skill_set=ALL_SKILLS))
-
-    print(f"DEBUG: Extracted Required Skills (Initial): {required_skills}")
-    print(f"DEBUG: Extracted Required Skills (Augmented): {augmented_required_skills}")
+    # Scan the whole document once
+    matches = list(ALL_SKILLS_MATCHER.finditer(text_lower))
+
+    # Crucial: every skill mentioned anywhere in the JD (even if not in a bullet point) is
+    # considered required, so the JD's own self-matching scores high.
+    augmented_required_skills = {skill for _, _, skill in matches}
+
+    if logger.isEnabledFor(logging.DEBUG):
+        # Heuristic: the skills on lines starting with bullet points or strong indicators are the explicit requirements
+        match_starts = [start for start, _, _ in matches]
+        required_skills = set()
+        line_start = 0
+        for line in text_lower.split('\n'):
+            line_end = line_start + len(line)
+            line_lower = line.strip()
+            if _is_skill_line(line_lower) or "required skills:" in line_lower:
+                for i in range(bisect.bisect_left(match_starts, line_start), bisect.bisect_right(match_starts, line_end)):
+                    required_skills.add(matches[i][2])
+            line_start = line_end + 1
+        logger.debug("Extracted Required Skills (Initial): %s", required_skills)
+        logger.debug("Extracted Required Skills (Augmented): %s", augmented_required_skills)
     return augmented_required_skills
 
 
-def extract_experience(text):
-    # This is a basic placeholder. For real-world use, you'd need more sophisticated NLP
-    # to identify sections like "Work Experience", "Projects", "Education", etc.
-    # and then parse content within those sections.
-    # Given the current PDF/DOCX parsing (often general content), we'll treat the whole
-    # document as one "experience" block for now.
-    parsed_experiences = []
-    parsed_experiences.append({
-        'title': 'General Document Content',
-        'responsibilities': [text] # Return the whole text
-    })
-    return parsed_experiences
+# Resume section headers: a line holding only one of these (any case, optionally followed by ':')
+# starts that section. Headers under 'other' (summary, certifications, ...) just end the previous section.
+SECTION_HEADERS = {
+    'experience': ('experience', 'work experience', 'professional experience', 'relevant experience', 'employment',
+                   'employment history', 'work history', 'career history', 'internships', 'internship experience'),
+    'skills': ('skills', 'technical skills', 'key skills', 'core skills', 'skill set', 'skillset', 'skills and tools',
+               'core competencies', 'technical proficiencies', 'tech stack'),
+    'education': ('education', 'academic background', 'academic qualifications', 'educational qualifications',
+                  'academics', 'education and training'),
+    'projects': ('projects', 'academic projects', 'personal projects', 'key projects', 'selected projects', 'side projects'),
+    'other': ('summary', 'professional summary', 'profile', 'objective', 'career objective', 'about me', 'certifications',
+              'certificates', 'licenses and certifications', 'awards', 'honors and awards', 'achievements',
+              'key achievements', 'key achievements and strengths', 'publications', 'languages', 'interests', 'hobbies',
+              'activities', 'extracurricular activities', 'volunteering', 'references', 'contact', 'personal details',
+              'declaration'),
+}
+_SECTION_OF_HEADER = {header: section for section, headers in SECTION_HEADERS.items() for header in headers}
+_MAX_HEADER_LINE = max(map(len, _SECTION_OF_HEADER)) + 16 # Longer lines can't be headers (room for padding and ':')
+_HEADER_PADDING = ' \t\f\v\r:'
 
 
-def parse_resume(file_path):
-    full_text = extract_text_from_file(file_path)
-    if not full_text:
-        return None
+def segment_sections(text):
+    """
+    Splits a document into sections in one streaming pass over its lines.
+    Returns a list of (section, start, end) spans covering the whole text in order, as offsets into
+    'text' (nothing is copied; only short lines are looked at as header candidates); 'section' is a
+    key of SECTION_HEADERS. A span starts at its header line; text before the first header
+    (name, contact details) is 'other'.
+    Offsets also hold for text.lower() and for the processed 'full_text' of parse_resume, which keep
+    the length of the text (except in the rare case where lowercasing changes it, e.g. for 'İ').
+    """
+    sections = []
+    section, section_start = 'other', 0
+    line_start, text_length = 0, len(text)
+    while line_start < text_length:
+        line_end = text.find('\n', line_start)
+        if line_end < 0:
+            line_end = text_length
+        if line_end - line_start <= _MAX_HEADER_LINE:
+            header_section = _SECTION_OF_HEADER.get(text[line_start:line_end].strip(_HEADER_PADDING).lower())
+            if header_section is not None:
+                if line_start > section_start:
+                    sections.append((section, section_start, line_start))
+                section, section_start = header_section, line_start
+        line_start = line_end + 1
+    if text_length > section_start or not sections:
+        sections.append((section, section_start, text_length))
+    return sections
+
+
+def extract_skill_sections(text_raw, sections=None, skill_set=ALL_SKILLS):
+    """
+    Extracts skills like extract_skills, tagging each with the sections it was found in.
+    Returns {skill: tuple of sections (sorted)}; 'sections' are the spans from segment_sections(text_raw).
+    The text is scanned once: matches arrive in offset order, so sections are walked alongside them.
+    """
+    if sections is None:
+        sections = segment_sections(text_raw)
+    matcher = get_skill_matcher(skill_set)
+    text_lower = text_raw.lower() # Only lowercase once here
+    found_sections = {}
+    if len(text_lower) == len(text_raw):
+        i = 0
+        for start, _, skill in matcher.finditer(text_lower):
+            while start >= sections[i][2]:
+                i += 1
+            found_sections.setdefault(skill, set()).add(sections[i][0])
+    else:
+        # Lowercasing moved the offsets: scan section by section instead (spans start and end at line breaks)
+        for section, start, end in sections:
+            for _, _, skill in matcher.finditer(text_raw[start:end].lower()):
+                found_sections.setdefault(skill, set()).add(section)
+
+    logger.debug("Extracted skills by section: %s", found_sections)
+    return {skill: tuple(sorted(skill_sections)) for skill, skill_sections in found_sections.items()}
+
+
+def extract_section_spans(sections, section, title):
+    """
+    The spans of one kind of section (e.g. 'experience'), as [{'title', 'start', 'end'}] offsets into the text.
+    """
+    return [{'title': title, 'start': start, 'end': end} for name, start, end in sections if name == section]
 
-    # Use the raw text for skill extraction initially to preserve formatting
-    # Then create a processed text for TF-IDF
-    # Ensure processed_text_for_tfidf is always defined
-    processed_text_for_tfidf = full_text.lower() if full_text else ""
-    processed_text_for_tfidf = re.sub(r'[^a-zA-Z0-9\s\.\,\-\+\#]', ' ', processed_text_for_tfidf)
 
-    # Call extract_skills with the raw text (lowercased) for robust matching
-    skills = extract_skills(full_text, skill_set=ALL_SKILLS) if full_text else set() # Ensure skills is defined even if text is empty
-    experience = extract_experience(full_text) if full_text else [] # Ensure experience is defined
+def extract_experience(text, sections=None):
+    """
+    Experience sections of a document as [{'title', 'start', 'end'}] offsets into 'text'.
+    A document without any section headers is treated as one "experience" block.
+    """
+    if sections is None:
+        sections = segment_sections(text)
+    if all(section == 'other' for section, _, _ in sections):
+        return [{'title': 'General Document Content', 'start': 0, 'end': len(text)}]
+    return extract_section_spans(sections, 'experience', 'Experience')
+
+
+def parse_resume(file_path, cache=None):
+    """
+    Parses a resume file. If a ParseCache is given, extraction and skill matching are
+    skipped for files whose contents were already parsed under the current parse_cache_version().
+    """
+    content_hash = hash_file(file_path) if cache is not None else None
+    cached = cache.get(content_hash) if cache is not None else None
+    if cached is not None:
+        count('cache_hits')
+        full_text = cached['raw_text']
+        processed_text_for_tfidf = cached['processed_text']
+        skill_sections = cached['skill_sections']
+        sections = segment_sections(full_text) # Cheap (header lines only); the skill scan is what the cache saves
+    else:
+        full_text = extract_text_from_file(file_path)
+        if not full_text:
+            return None
+
+        # Use the raw text for skill extraction initially to preserve formatting
+        # Then create a processed text for TF-IDF
+        # Ensure processed_text_for_tfidf is always defined
+        processed_text_for_tfidf = full_text.lower() if full_text else ""
+        processed_text_for_tfidf = re.sub(r'[^a-zA-Z0-9\s\.\,\-\+\#]', ' ', processed_text_for_tfidf)
+
+        # One pass over the lines for the section spans, one scan of the precompiled matcher for the skills
+        with stage('skill-scan'):
+            sections = segment_sections(full_text)
+            skill_sections = extract_skill_sections(full_text, sections, skill_set=ALL_SKILLS)
+        if cache is not None:
+            cache.put(content_hash, full_text, processed_text_for_tfidf, skill_sections)
+
+    count('documents')
 
     return {
         'file_name': os.path.basename(file_path),
         'full_text': processed_text_for_tfidf, # This is used for TF-IDF in matcher.py
-        'skills': skills, # This is the set of skills identified in the resume
-        'experience': experience,
-        'education': [], # Placeholder
+        'skills': set(skill_sections), # This is the set of skills identified in the resume
+        'skill_sections': skill_sections, # skill -> sections it appears in
+        'sections': sections, # (section, start, end) offsets into the extracted text (and 'full_text')
+        'experience': extract_experience(full_text, sections),
+        'education': extract_section_spans(sections, 'education', 'Education'),
         'contact_info': {} # Placeholder
     }
 
@@ -227,7 +358,8 @@ def parse_job_description(file_path):
         return None
 
     # Use the raw text for required_skills extraction
-    required_skills = extract_required_skills(full_text)
+    with stage('skill-scan'):
+        required_skills = extract_required_skills(full_text)
     
     # The 'skills' for the job description itself should ideally be the same as its 'required_skills'
     # to ensure perfect self-matching.
@@ -238,14 +370,15 @@ def parse_job_description(file_path):
     processed_text_for_tfidf = full_text.lower() if full_text else ""
     processed_text_for_tfidf = re.sub(r'[^a-zA-Z0-9\s\.\,\-\+\#]', ' ', processed_text_for_tfidf)
 
-    experience = extract_experience(full_text) if full_text else [] # Ensure experience is defined
+    sections = segment_sections(full_text)
 
     return {
         'file_name': os.path.basename(file_path),
         'full_text': processed_text_for_tfidf, # This is used for TF-IDF in matcher.py
         'skills': skills_for_jd, # IMPORTANT: Set JD's general skills to its required skills for self-consistency
         'required_skills': required_skills, # This is the specific set of "must-have" skills
-        'experience': experience,
-        'education': [], # Placeholder
+        'sections': sections,
+        'experience': extract_experience(full_text, sections),
+        'education': extract_section_spans(sections, 'education', 'Education'),
         'contact_info': {} # Placeholder
     }
\ No newline at end of file
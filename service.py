@@ -0,0 +1,434 @@
+# service.py
+"""
+Low-latency scoring service (asyncio, standard library only).
+
+Job descriptions are parsed once and kept in memory together with their term counts (see
+matcher.make_jobs_scorer) and the compiled skill matcher, so an upload only costs its own parse
+and a slice of one vectorized scoring call. Registering a JD counts only its own terms; the scorer
+is rebuilt from the cached counts on the scoring thread. Parsing runs in a process pool; uploads that arrive
+within --batch-window-ms of each other are scored together in one call, on a scoring thread so
+the event loop keeps serving requests meanwhile. A file that takes longer than --file-timeout
+seconds to parse is rejected with 422.
+
+    python service.py --jobs-dir jobs/ --port 8080
+
+    POST   /jobs?id=backend-eng&filename=jd.txt   body: JD file   register (or replace) a JD
+    GET    /jobs                                                  list registered JD IDs
+    DELETE /jobs/<id>                                             unregister a JD (id URL-encoded)
+    POST   /score?filename=cv.pdf                 body: resume    scores against every registered JD
+    POST   /score/batch    body: {"resumes": [{"filename": "cv.pdf", "content_base64": "..."}, ...]}
+    GET    /health
+
+Scores are the same as match_resume_to_job for each resume/JD pair.
+"""
+import argparse
+import asyncio
+import base64
+import binascii
+import json
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from ingest import DEFAULT_FILE_TIMEOUT, RESUME_EXTENSIONS, ParseTimeout, iter_resume_files, time_limit
+from matcher import make_jobs_scorer, term_counts
+from parser import parse_job_description, parse_resume
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+DEFAULT_BATCH_WINDOW_MS = 5 # How long the first upload in a batch waits for others to join it
+DEFAULT_MAX_BATCH_SIZE = 64 # A full batch is scored right away
+MAX_BODY_BYTES = 20 * 1024 * 1024 # Larger uploads are rejected with 413
+KEEP_ALIVE_TIMEOUT = 30 # Seconds an idle connection is kept open
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _score_batch(score_batch, job_required_skills, resumes_data):
+    # Runs on the scoring thread with a snapshot of the JD set taken when the batch was flushed:
+    # one vectorized call for the whole batch, (num_jobs, num_resumes) scores
+    if score_batch is None:
+        return [[] for _ in resumes_data]
+    score_matrix = score_batch(resumes_data)
+    results = []
+    for i, resume_data in enumerate(resumes_data):
+        resume_skills = set(resume_data.get('skills', []))
+        scores = [
+            {
+                'job_id': job_id,
+                'score': round(float(score_matrix[j, i]), 2),
+                'matched_required_skills': sorted(resume_skills.intersection(required_skills)),
+            }
+            for j, (job_id, required_skills) in enumerate(job_required_skills)
+        ]
+        scores.sort(key=lambda entry: entry['score'], reverse=True)
+        results.append(scores)
+    return results
+
+
+def _count_terms(jobs_data):
+    # Runs on the scoring thread: term counts of newly registered JDs, kept for every later rebuild
+    return [term_counts(job_description_data) for job_description_data in jobs_data]
+
+
+def _build_scorer(jobs_data, jobs_term_counts):
+    # Runs on the scoring thread, after any batch flushed before the JD set changed
+    return make_jobs_scorer(jobs_data, jobs_term_counts) if jobs_data else None
+
+
+def _parse_upload(kind, filename, content, timeout=DEFAULT_FILE_TIMEOUT):
+    # Runs in a pool worker: the parsers take a path, so the upload goes through a temporary file
+    # with the original extension (which picks the text extractor)
+    suffix = os.path.splitext(filename)[1].lower()
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
+        f.write(content)
+    try:
+        with time_limit(timeout):
+            document_data = parse_job_description(f.name) if kind == 'job' else parse_resume(f.name)
+    except ParseTimeout:
+        # ParseTimeout is a BaseException; send back an ordinary exception through the pool
+        raise TimeoutError(f"Timed out after {timeout}s parsing {filename}") from None
+    finally:
+        os.unlink(f.name)
+    if document_data is not None:
+        document_data['file_name'] = os.path.basename(filename)
+    return document_data
+
+
+class MicroBatcher:
+    """
+    Collects items submitted within 'window' seconds of the first one (or until 'max_batch_size'
+    items are waiting) and passes them to process_batch(items) in one call, which must return an
+    awaitable (e.g. an executor future) of one result per item. submit() resolves to the item's result.
+    """
+
+    def __init__(self, process_batch, window, max_batch_size):
+        self.process_batch = process_batch
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._pending = [] # (item, future)
+        self._flush_handle = None
+        self._deliveries = set() # Tasks waiting on process_batch results (referenced so they aren't collected)
+
+    def submit(self, item):
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size:
+            self.flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.window, self.flush)
+        return future
+
+    def flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        try:
+            results = self.process_batch([item for item, _ in batch])
+        except Exception as e:
+            self._fail(batch, e)
+            return
+        delivery = asyncio.ensure_future(self._deliver(batch, results))
+        self._deliveries.add(delivery)
+        delivery.add_done_callback(self._deliveries.discard)
+
+    async def _deliver(self, batch, results):
+        try:
+            results = await results
+        except Exception as e:
+            self._fail(batch, e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    @staticmethod
+    def _fail(batch, exception):
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(exception)
+
+
+class ScoringService:
+    """
+    Warm in-memory state: registered JDs, the scorer built from them, the parser pool and the scoring thread.
+    """
+
+    def __init__(self, max_workers=None, batch_window=DEFAULT_BATCH_WINDOW_MS / 1000, max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+                 file_timeout=DEFAULT_FILE_TIMEOUT):
+        self.executor = ProcessPoolExecutor(max_workers=max_workers)
+        # One thread, so batches are scored in order and the event loop is never blocked by scoring
+        self.score_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='score')
+        self.file_timeout = file_timeout
+        self.jobs = {} # JD ID -> parsed JD
+        self._job_term_counts = {} # JD ID -> matcher.term_counts of the JD
+        self._job_ids = []
+        self._score_batch = None
+        self._jobs_lock = asyncio.Lock() # Serializes changes to the JD set
+        self.batcher = MicroBatcher(self._score_resumes, batch_window, max_batch_size)
+        self.stats = {'requests': 0, 'resumes_scored': 0, 'batches': 0}
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+        self.score_executor.shutdown(cancel_futures=True)
+
+    async def parse(self, kind, filename, content):
+        if not filename.lower().endswith(RESUME_EXTENSIONS):
+            raise HTTPError(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, f"Unsupported file type: {filename} (expected {', '.join(RESUME_EXTENSIONS)})")
+        loop = asyncio.get_running_loop()
+        try:
+            document_data = await loop.run_in_executor(self.executor, _parse_upload, kind, filename, content, self.file_timeout)
+        except TimeoutError as e:
+            raise HTTPError(HTTPStatus.UNPROCESSABLE_ENTITY, str(e)) from e
+        if document_data is None:
+            raise HTTPError(HTTPStatus.UNPROCESSABLE_ENTITY, f"No text could be extracted from {filename}")
+        return document_data
+
+    async def register_jobs(self, jobs):
+        """
+        Registers (or replaces) parsed JDs, given as {JD ID: parsed JD}, and rebuilds the scorer once.
+        """
+        async with self._jobs_lock:
+            counted = await asyncio.get_running_loop().run_in_executor(self.score_executor, _count_terms, list(jobs.values()))
+            await self._replace_jobs({**self.jobs, **jobs}, {**self._job_term_counts, **dict(zip(jobs, counted))})
+
+    async def register_job(self, job_id, job_description_data):
+        await self.register_jobs({job_id: job_description_data})
+
+    async def unregister_job(self, job_id):
+        async with self._jobs_lock:
+            if job_id not in self.jobs:
+                raise HTTPError(HTTPStatus.NOT_FOUND, f"Unknown job: {job_id}")
+            jobs = {other_id: job for other_id, job in self.jobs.items() if other_id != job_id}
+            await self._replace_jobs(jobs, {other_id: self._job_term_counts[other_id] for other_id in jobs})
+
+    async def _replace_jobs(self, jobs, job_term_counts):
+        # Uploads waiting in the batcher were submitted against the old JD set; score them first.
+        # The scorer is built on the scoring thread, so the event loop keeps serving requests, and
+        # the new JD set only takes effect once it is ready.
+        self.batcher.flush()
+        job_ids = list(jobs)
+        score_batch = await asyncio.get_running_loop().run_in_executor(
+            self.score_executor, _build_scorer, [jobs[job_id] for job_id in job_ids], [job_term_counts[job_id] for job_id in job_ids])
+        self.jobs, self._job_term_counts, self._job_ids, self._score_batch = jobs, job_term_counts, job_ids, score_batch
+
+    def _score_resumes(self, resumes_data):
+        # Called by the batcher on the event loop; the JD set is captured now and scoring runs on the scoring thread
+        self.stats['batches'] += 1
+        self.stats['resumes_scored'] += len(resumes_data)
+        job_required_skills = [(job_id, self.jobs[job_id].get('required_skills', [])) for job_id in self._job_ids]
+        return asyncio.get_running_loop().run_in_executor(self.score_executor, _score_batch, self._score_batch,
+                                                          job_required_skills, resumes_data)
+
+    async def score(self, uploads):
+        """
+        Parses (filename, content) uploads concurrently in the pool, then submits them to the batcher
+        together so they are scored in one call. Returns one result (or exception) per upload.
+        """
+        parsed = await asyncio.gather(*(self.parse('resume', filename, content) for filename, content in uploads),
+                                      return_exceptions=True)
+        scored = [parsed_data if isinstance(parsed_data, Exception) else self.batcher.submit(parsed_data) for parsed_data in parsed]
+        results = []
+        for parsed_data, scores in zip(parsed, scored):
+            if isinstance(parsed_data, Exception):
+                results.append(parsed_data)
+                continue
+            try:
+                scores = await scores
+            except Exception as e:
+                results.append(e)
+                continue
+            results.append({'filename': parsed_data['file_name'], 'skills': sorted(parsed_data.get('skills', [])), 'scores': scores})
+        return results
+
+    async def handle(self, method, path, query, body):
+        """
+        Routes one request; returns (status, JSON-serializable payload).
+        """
+        self.stats['requests'] += 1
+        if path == '/health' and method == 'GET':
+            return HTTPStatus.OK, {'status': 'ok', 'jobs': len(self.jobs), **self.stats}
+        if path == '/jobs' and method == 'GET':
+            return HTTPStatus.OK, {'jobs': self._job_ids}
+        if path == '/jobs' and method == 'POST':
+            filename = _query_value(query, 'filename', 'job_description.txt')
+            job_id = _query_value(query, 'id', os.path.splitext(os.path.basename(filename))[0])
+            job_description_data = await self.parse('job', filename, body)
+            await self.register_job(job_id, job_description_data)
+            return HTTPStatus.CREATED, {'job_id': job_id, 'required_skills': sorted(job_description_data['required_skills'])}
+        if path.startswith('/jobs/') and method == 'DELETE':
+            await self.unregister_job(unquote(path[len('/jobs/'):]))
+            return HTTPStatus.OK, {'jobs': self._job_ids}
+        if path == '/score' and method == 'POST':
+            result, = await self.score([(_query_value(query, 'filename'), body)])
+            if isinstance(result, Exception):
+                raise result
+            return HTTPStatus.OK, result
+        if path == '/score/batch' and method == 'POST':
+            uploads = _decode_batch(body)
+            results = await self.score(uploads)
+            return HTTPStatus.OK, {'results': [
+                {'filename': filename, 'error': result.message if isinstance(result, HTTPError) else str(result)}
+                if isinstance(result, Exception) else result
+                for (filename, _), result in zip(uploads, results)
+            ]}
+        if path in ('/health', '/jobs', '/score', '/score/batch') or path.startswith('/jobs/'):
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed on {path}")
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"No route for {path}")
+
+
+def _query_value(query, name, default=None):
+    values = query.get(name)
+    if values:
+        return values[0]
+    if default is None:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"Missing query parameter: {name}")
+    return default
+
+
+def _decode_batch(body):
+    try:
+        uploads = []
+        for resume in json.loads(body)['resumes']:
+            filename = resume['filename']
+            if not isinstance(filename, str):
+                raise TypeError(f"filename must be a string, not {type(filename).__name__}")
+            uploads.append((filename, base64.b64decode(resume['content_base64'], validate=True)))
+        return uploads
+    except (ValueError, KeyError, TypeError, binascii.Error) as e:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"Expected {{\"resumes\": [{{\"filename\", \"content_base64\"}}, ...]}}: {e}") from e
+
+
+async def _read_request(reader):
+    """
+    Reads one HTTP/1.1 request; returns (method, target, headers, body), or None at end of stream.
+    """
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    try:
+        method, target, _ = request_line.decode('latin-1').split()
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        raise HTTPError(HTTPStatus.LENGTH_REQUIRED, "Chunked uploads are not supported; send Content-Length")
+    try:
+        content_length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+    if content_length > MAX_BODY_BYTES:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Body exceeds {MAX_BODY_BYTES} bytes")
+    body = await reader.readexactly(content_length) if content_length else b''
+    return method.upper(), target, headers, body
+
+
+def _write_response(writer, status, payload, keep_alive):
+    body = json.dumps(payload).encode('utf-8')
+    writer.write(
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + body
+    )
+
+
+async def handle_connection(service, reader, writer):
+    try:
+        while True:
+            keep_alive = False
+            try:
+                request = await asyncio.wait_for(_read_request(reader), KEEP_ALIVE_TIMEOUT)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                url = urlsplit(target)
+                start = time.perf_counter()
+                status, payload = await service.handle(method, url.path, parse_qs(url.query), body)
+                logger.info("%s %s -> %d in %.1f ms", method, url.path, status, (time.perf_counter() - start) * 1000)
+            except HTTPError as e:
+                status, payload = e.status, {'error': e.message}
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                break
+            except Exception as e:
+                logger.exception("Error handling request")
+                status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(e)}
+            _write_response(writer, status, payload, keep_alive)
+            await writer.drain()
+            if not keep_alive:
+                break
+    finally:
+        writer.close()
+
+
+def _read_file(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+async def serve(host, port, jobs_dir=None, max_workers=None, batch_window=DEFAULT_BATCH_WINDOW_MS / 1000,
+                max_batch_size=DEFAULT_MAX_BATCH_SIZE, file_timeout=DEFAULT_FILE_TIMEOUT):
+    service = ScoringService(max_workers, batch_window, max_batch_size, file_timeout)
+    try:
+        if jobs_dir:
+            # Parsed concurrently in the pool, then registered together so the scorer is built once
+            job_paths = sorted(iter_resume_files(jobs_dir))
+            jobs_data = await asyncio.gather(*(service.parse('job', os.path.basename(job_path), _read_file(job_path))
+                                               for job_path in job_paths))
+            await service.register_jobs({os.path.splitext(os.path.basename(job_path))[0]: job_description_data
+                                         for job_path, job_description_data in zip(job_paths, jobs_data)})
+            logger.info("Registered %d job descriptions from %s", len(service.jobs), jobs_dir)
+
+        server = await asyncio.start_server(lambda reader, writer: handle_connection(service, reader, writer), host, port)
+        logger.info("Listening on http://%s:%d", host, port)
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Serve resume scoring over HTTP.")
+    arg_parser.add_argument('--host', default=DEFAULT_HOST)
+    arg_parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    arg_parser.add_argument('--jobs-dir', help="Register every job description in this directory at startup (ID = file name without extension)")
+    arg_parser.add_argument('--workers', type=int, help="Parser processes (default: one per CPU)")
+    arg_parser.add_argument('--batch-window-ms', type=float, default=DEFAULT_BATCH_WINDOW_MS,
+                            help="Uploads arriving within this window are scored in one call")
+    arg_parser.add_argument('--max-batch-size', type=int, default=DEFAULT_MAX_BATCH_SIZE)
+    arg_parser.add_argument('--file-timeout', type=float, default=DEFAULT_FILE_TIMEOUT,
+                            help="Seconds one uploaded file may take to parse before it is rejected")
+    arg_parser.add_argument('--log-level', default='INFO', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'])
+    args = arg_parser.parse_args(argv)
+    logging.basicConfig(level=args.log_level, format='%(levelname)s %(name)s: %(message)s')
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.jobs_dir, args.workers, args.batch_window_ms / 1000, args.max_batch_size,
+                          args.file_timeout))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
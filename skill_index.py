@@ -0,0 +1,198 @@
+# skill_index.py
+import numpy as np
+
+from skill_taxonomy import SKILL_TAXONOMY
+
+
+def _bitmap_to_array(bitmap, num_ids):
+    # Bit i of the bitmap (byte i // 8, bit i % 8) becomes element i; bits past the end are 0
+    bits = np.unpackbits(np.frombuffer(bitmap, dtype=np.uint8), bitorder='little', count=min(num_ids, 8 * len(bitmap)))
+    if len(bits) < num_ids:
+        bits = np.concatenate((bits, np.zeros(num_ids - len(bits), dtype=np.uint8)))
+    return bits
+
+
+def _ids_to_bitmap(ids, num_ids):
+    bits = np.zeros(num_ids, dtype=np.uint8)
+    bits[ids] = 1
+    return bytearray(np.packbits(bits, bitorder='little').tobytes())
+
+
+class SkillIndex:
+    """
+    Inverted index from skill to the candidates (resumes) that have it.
+    Candidates get integer IDs; each skill's posting list is held in memory as a bitmap
+    (a bytearray, bit i set = candidate i has the skill) that is updated in place, so adding or
+    removing a candidate costs O(1) per skill, and AND/OR/count queries are vectorized over the
+    bitmap bytes. On disk, postings are stored as sorted integer arrays in a compressed .npz file.
+    """
+
+    def __init__(self):
+        self.keys = [] # candidate ID -> key (e.g. file path); None once removed
+        self.ids = {} # key -> candidate ID
+        self.postings = {} # skill -> bitmap of candidate IDs (only skills that at least one candidate has)
+        self._posting_sizes = {} # skill -> number of candidates with the skill
+        self._candidate_skills = [] # candidate ID -> skills, so removal only touches its own postings
+        self._free_ids = []
+        self._live = None # Cached (candidate IDs, keys) of the indexed candidates; reset on every change
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, key):
+        return key in self.ids
+
+    def add(self, key, skills):
+        """
+        Adds a candidate (or replaces its skills if the key is already indexed).
+        """
+        if key in self.ids:
+            self.remove(key)
+        if self._free_ids:
+            candidate_id = self._free_ids.pop()
+            self.keys[candidate_id] = key
+            self._candidate_skills[candidate_id] = frozenset(skills)
+        else:
+            candidate_id = len(self.keys)
+            self.keys.append(key)
+            self._candidate_skills.append(frozenset(skills))
+        self.ids[key] = candidate_id
+        byte, bit = candidate_id >> 3, 1 << (candidate_id & 7)
+        for skill in self._candidate_skills[candidate_id]:
+            bitmap = self.postings.get(skill)
+            if bitmap is None:
+                bitmap = self.postings[skill] = bytearray()
+                self._posting_sizes[skill] = 0
+            if byte >= len(bitmap):
+                bitmap.extend(bytes(max(byte + 1, 2 * len(bitmap)) - len(bitmap))) # Amortized doubling
+            bitmap[byte] |= bit
+            self._posting_sizes[skill] += 1
+        self._live = None
+        return candidate_id
+
+    def remove(self, key):
+        candidate_id = self.ids.pop(key)
+        byte, mask = candidate_id >> 3, ~(1 << (candidate_id & 7)) & 0xFF
+        for skill in self._candidate_skills[candidate_id]:
+            self._posting_sizes[skill] -= 1
+            if self._posting_sizes[skill]:
+                self.postings[skill][byte] &= mask
+            else:
+                del self.postings[skill], self._posting_sizes[skill]
+        self.keys[candidate_id] = None
+        self._candidate_skills[candidate_id] = frozenset()
+        self._free_ids.append(candidate_id)
+        self._live = None
+
+    def _live_candidates(self):
+        if self._live is None:
+            live_ids = np.fromiter(self.ids.values(), dtype=np.int64, count=len(self.ids))
+            self._live = (live_ids, list(self.ids))
+        return self._live
+
+    def _posting_array(self, skill):
+        return _bitmap_to_array(self.postings.get(skill, b''), len(self.keys))
+
+    def _bitmap_keys(self, bits):
+        return [self.keys[candidate_id] for candidate_id in np.flatnonzero(bits)]
+
+    def all_of(self, skills):
+        """
+        Keys of candidates that have every skill in 'skills'.
+        """
+        skills = list(skills)
+        if not skills:
+            return [key for key in self.keys if key is not None]
+        bits = self._posting_array(skills[0])
+        for skill in skills[1:]:
+            if not bits.any():
+                break
+            bits &= self._posting_array(skill)
+        return self._bitmap_keys(bits)
+
+    def any_of(self, skills):
+        """
+        Keys of candidates that have at least one skill in 'skills'.
+        """
+        bits = np.zeros(len(self.keys), dtype=np.uint8)
+        for skill in skills:
+            if skill in self.postings:
+                bits |= self._posting_array(skill)
+        return self._bitmap_keys(bits)
+
+    def match_counts(self, skills):
+        """
+        Number of 'skills' each candidate has, as an array indexed by candidate ID
+        (removed IDs count 0). Computed for the whole pool by unpacking the posting bitmaps.
+        """
+        counts = np.zeros(len(self.keys), dtype=np.int32)
+        for skill in set(skills):
+            if skill in self.postings:
+                counts += self._posting_array(skill)
+        return counts
+
+    def match_weights(self, skills):
+        """
+        Like match_counts, but sums the taxonomy weights of the matched skills instead of counting them.
+        """
+        weights = np.zeros(len(self.keys))
+        for skill in set(skills):
+            if skill in self.postings:
+                weights += SKILL_TAXONOMY.weight(skill) * self._posting_array(skill)
+        return weights
+
+    def coverage(self, required_skills):
+        """
+        Returns (keys, coverage) for every indexed candidate, where coverage is the (weighted) fraction of
+        'required_skills' the candidate has (the required-skills component of match_resume_to_job).
+        Keys are in insertion order; the list is shared between calls until the index changes.
+        """
+        required_skills = set(required_skills)
+        required_weight = sum(SKILL_TAXONOMY.weight(skill) for skill in required_skills)
+        live_ids, keys = self._live_candidates()
+        if required_weight <= 0:
+            return keys, np.zeros(len(keys))
+        return keys, self.match_weights(required_skills)[live_ids] / required_weight
+
+    def at_least(self, required_skills, min_coverage):
+        """
+        Keys of candidates covering at least 'min_coverage' (0-1) of 'required_skills', best first.
+        """
+        keys, coverage = self.coverage(required_skills)
+        order = np.argsort(-coverage, kind='stable')
+        return [keys[i] for i in order if coverage[i] >= min_coverage]
+
+    def save(self, path):
+        skills = sorted(self.postings)
+        posting_ids = [np.flatnonzero(self._posting_array(skill)).astype(np.uint32) for skill in skills]
+        offsets = np.cumsum([0] + [len(ids) for ids in posting_ids])
+        np.savez_compressed(
+            path,
+            keys=np.array(['' if key is None else key for key in self.keys], dtype=str),
+            removed=np.array([key is None for key in self.keys], dtype=bool),
+            skills=np.array(skills, dtype=str),
+            posting_offsets=offsets,
+            posting_ids=np.concatenate(posting_ids) if posting_ids else np.zeros(0, dtype=np.uint32),
+        )
+
+    @classmethod
+    def load(cls, path):
+        index = cls()
+        with np.load(path) as data:
+            removed = data['removed']
+            index.keys = [None if is_removed else str(key) for key, is_removed in zip(data['keys'], removed)]
+            candidate_skills = [set() for _ in index.keys]
+            offsets, posting_ids = data['posting_offsets'], data['posting_ids']
+            for i, skill in enumerate(data['skills']):
+                skill = str(skill)
+                ids = posting_ids[offsets[i]:offsets[i + 1]]
+                for candidate_id in ids.tolist():
+                    candidate_skills[candidate_id].add(skill)
+                if len(ids):
+                    index.postings[skill] = _ids_to_bitmap(ids, len(index.keys))
+                    index._posting_sizes[skill] = len(ids)
+        index._candidate_skills = [frozenset(skills) for skills in candidate_skills]
+        index.ids = {key: candidate_id for candidate_id, key in enumerate(index.keys) if key is not None}
+        index._free_ids = [candidate_id for candidate_id, key in enumerate(index.keys) if key is None]
+        return index
+
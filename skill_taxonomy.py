@@ -0,0 +1,92 @@
+# skill_taxonomy.py
+import hashlib
+import json
+import os
+
+import numpy as np
+
+# The skill taxonomy file: canonical skills by group, aliases and optional coverage weights.
+# Point this at another file (same format) to use a different taxonomy.
+SKILL_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skills_taxonomy.json')
+DEFAULT_SKILL_WEIGHT = 1.0
+
+
+class SkillTaxonomy:
+    """
+    Canonical skills with their aliases and coverage weights.
+    Canonical skills get integer IDs in sorted order, so IDs agree across processes for the same file.
+    The taxonomy is never modified after loading: skills outside it (e.g. from a custom skill_set)
+    have no ID and weigh DEFAULT_SKILL_WEIGHT.
+    """
+
+    def __init__(self, groups, aliases=None, weights=None):
+        self.groups = {group: frozenset(skill.lower() for skill in skills) for group, skills in groups.items()}
+        self.skills = sorted(set().union(*self.groups.values())) # skill ID -> canonical skill
+        self.ids = {skill: skill_id for skill_id, skill in enumerate(self.skills)} # canonical skill -> skill ID
+
+        # alias -> canonical skills it counts as (a canonical skill is its own alias)
+        self.aliases = {skill: (skill,) for skill in self.skills}
+        for skill, skill_aliases in (aliases or {}).items():
+            skill = skill.lower()
+            if skill not in self.ids:
+                raise ValueError(f"Aliases given for unknown skill '{skill}'")
+            for alias in skill_aliases:
+                alias = alias.lower()
+                if alias in self.ids:
+                    raise ValueError(f"'{alias}' is both a skill and an alias of '{skill}'")
+                if skill not in self.aliases.setdefault(alias, ()):
+                    self.aliases[alias] += (skill,)
+
+        self._weights = [DEFAULT_SKILL_WEIGHT] * len(self.skills)
+        for skill, weight in (weights or {}).items():
+            if skill.lower() not in self.ids:
+                raise ValueError(f"Weight given for unknown skill '{skill}'")
+            self._weights[self.ids[skill.lower()]] = float(weight)
+
+        # Changes whenever extraction output can change (skills or aliases, not weights)
+        self.version = hashlib.sha256(
+            json.dumps(sorted(self.aliases.items()), separators=(',', ':')).encode('utf-8')
+        ).hexdigest()[:16]
+
+    def __len__(self):
+        return len(self.skills)
+
+    def __contains__(self, skill):
+        return skill in self.ids
+
+    def skill_id(self, skill):
+        """
+        ID of a canonical skill, or None for a skill outside the taxonomy.
+        """
+        return self.ids.get(skill)
+
+    def ids_of(self, skills):
+        """
+        Sorted NumPy array (int32) of the IDs of those 'skills' that are in the taxonomy, without duplicates.
+        """
+        ids = self.ids
+        return np.unique(np.fromiter((ids[skill] for skill in skills if skill in ids), dtype=np.int32))
+
+    def weight(self, skill):
+        skill_id = self.ids.get(skill)
+        return DEFAULT_SKILL_WEIGHT if skill_id is None else self._weights[skill_id]
+
+    def weights(self):
+        """
+        Skill ID -> coverage weight, as a NumPy array.
+        """
+        return np.array(self._weights)
+
+
+def load_skill_taxonomy(path=SKILL_TAXONOMY_PATH):
+    """
+    Loads a taxonomy file: {"skills": {group: [skill, ...]}, "aliases": {skill: [alias, ...]},
+    "weights": {skill: weight}}. Keys starting with '_' (comments) are ignored.
+    """
+    with open(path, encoding='utf-8') as f:
+        taxonomy = json.load(f)
+    return SkillTaxonomy(taxonomy['skills'], taxonomy.get('aliases'), taxonomy.get('weights'))
+
+
+# Loaded once at import; parser.ALL_SKILLS and the compiled skill matcher are built from it
+SKILL_TAXONOMY = load_skill_taxonomy()
@@ -0,0 +1,35 @@
+# tests/conftest.py
+import os
+import random
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.corpus import make_job_lines, make_resume_lines # noqa: E402
+
+DATA_DIR = os.path.join(REPO_ROOT, 'data')
+
+
+@pytest.fixture
+def write_resumes(tmp_path):
+    """
+    Writes synthetic .txt resumes (benchmarks/corpus.py) into a directory and returns their paths.
+    """
+    def write(num_resumes, directory='resumes', seed=0):
+        resumes_dir = tmp_path / directory
+        resumes_dir.mkdir(exist_ok=True)
+        paths = []
+        for i in range(num_resumes):
+            path = resumes_dir / f'resume_{i:04d}.txt'
+            path.write_text('\n'.join(make_resume_lines(random.Random(f"{seed}:resumes:{i}"))), encoding='utf-8')
+            paths.append(str(path))
+        return paths
+    return write
+
+
+@pytest.fixture
+def job_text():
+    return '\n'.join(make_job_lines(random.Random("0:jobs:0")))
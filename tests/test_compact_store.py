@@ -0,0 +1,50 @@
+# tests/test_compact_store.py
+import numpy as np
+import pytest
+
+from compact_store import CompactStore
+from matcher import match_resumes_to_job, match_resumes_to_jobs, rank_resumes_two_stage, two_stage_recall_report
+from test_matcher import job_from_text, resume_from_text
+
+
+@pytest.fixture
+def resumes_data(write_resumes):
+    resumes_data = []
+    for path in write_resumes(30):
+        with open(path, encoding='utf-8') as f:
+            resumes_data.append(resume_from_text(f.read()))
+    return resumes_data
+
+
+@pytest.fixture
+def store(resumes_data):
+    store = CompactStore()
+    for resume_data in resumes_data:
+        store.add(resume_data)
+    return store
+
+
+def test_scores_match_pool_scoring(resumes_data, store, job_text):
+    job = job_from_text(job_text)
+    scores = store.score_job(job)
+    assert scores.tolist() == pytest.approx(match_resumes_to_job(resumes_data, job).tolist(), abs=1e-9)
+    # A subset is scored with the whole store's IDF
+    assert store.score_job(job, [7, 3]).tolist() == pytest.approx(scores[[7, 3]].tolist(), abs=1e-12)
+
+
+def test_score_jobs_and_two_stage_match_dicts(resumes_data, store, job_text):
+    jobs = [job_from_text(job_text), job_from_text("Requirements: Java, Zookeeper, Kafka"), {'full_text': '', 'required_skills': {'java'}}]
+    assert store.score_jobs(jobs) == pytest.approx(match_resumes_to_jobs(resumes_data, jobs), abs=1e-9)
+    skill_index = store.skill_index()
+    for candidate_pool_size in (5, 30):
+        indices, scores = rank_resumes_two_stage(store, jobs[0], 5, candidate_pool_size, skill_index)
+        expected_indices, expected_scores = rank_resumes_two_stage(resumes_data, jobs[0], 5, candidate_pool_size)
+        assert indices.tolist() == expected_indices.tolist()
+        assert scores == pytest.approx(expected_scores, abs=1e-9)
+    assert two_stage_recall_report(store, jobs[0], 5, [5, 30]) == two_stage_recall_report(resumes_data, jobs[0], 5, [5, 30])
+
+
+def test_empty_store(job_text):
+    store = CompactStore()
+    assert store.score_job(job_from_text(job_text)).shape == (0,)
+    assert np.asarray(store.score_jobs([job_from_text(job_text)] * 2)).shape == (2, 0)
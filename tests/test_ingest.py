@@ -0,0 +1,41 @@
+# tests/test_ingest.py
+import itertools
+
+import instrumentation
+from ingest import parse_resumes_parallel
+
+
+def test_warm_parallel_parse(tmp_path, write_resumes):
+    # Regression: workers opening a warm cache used to fail with "database is locked"
+    paths = write_resumes(200)
+    cache_path = str(tmp_path / 'cache.sqlite')
+
+    instrumentation.reset()
+    cold = list(parse_resumes_parallel(paths, max_workers=8, cache_path=cache_path))
+    assert instrumentation.collect()['counters'].get('cache_hits', 0) == 0
+    warm = list(parse_resumes_parallel(paths, max_workers=8, cache_path=cache_path))
+    assert instrumentation.collect()['counters']['cache_hits'] == len(paths)
+
+    assert [file_path for file_path, _ in warm] == paths
+    assert all(resume_data is not None for _, resume_data in warm)
+    for (_, cold_data), (_, warm_data) in zip(cold, warm):
+        assert warm_data['skills'] == cold_data['skills']
+        assert warm_data['skill_sections'] == cold_data['skill_sections']
+        assert warm_data['full_text'] == cold_data['full_text']
+
+
+def test_parallel_matches_in_process(write_resumes):
+    paths = write_resumes(40)
+    in_process = list(parse_resumes_parallel(paths, max_workers=1))
+    parallel = list(parse_resumes_parallel(paths, max_workers=4, chunksize=3))
+    assert [(path, data['skills']) for path, data in parallel] == [(path, data['skills']) for path, data in in_process]
+
+
+def test_cancelled_parse_leaves_cache_usable(tmp_path, write_resumes):
+    paths = write_resumes(60)
+    cache_path = str(tmp_path / 'cache.sqlite')
+    # Stop consuming part way through: the pool is shut down and the cache must stay readable
+    partial = list(itertools.islice(parse_resumes_parallel(paths, max_workers=4, cache_path=cache_path), 10))
+    assert len(partial) == 10
+    results = list(parse_resumes_parallel(paths, max_workers=4, cache_path=cache_path))
+    assert all(resume_data is not None for _, resume_data in results)
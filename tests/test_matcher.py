@@ -0,0 +1,127 @@
+# tests/test_matcher.py
+import numpy as np
+import pytest
+
+from matcher import (build_skill_index, make_jobs_scorer, make_resume_scorer, match_resume_to_job, match_resumes_to_job,
+                     match_resumes_to_jobs, rank_resumes_two_stage, required_skills_coverage, required_skills_coverage_matrix,
+                     top_k_indices, two_stage_recall_report)
+from parser import extract_required_skills, extract_skill_sections
+
+
+def resume_from_text(text):
+    skill_sections = extract_skill_sections(text)
+    return {'full_text': text.lower(), 'skills': set(skill_sections), 'skill_sections': skill_sections}
+
+
+def job_from_text(text):
+    return {'full_text': text.lower(), 'required_skills': extract_required_skills(text)}
+
+
+def test_large_vocabulary_keeps_rare_job_terms():
+    # More than 5000 distinct resume terms used to push the JD's rare terms out of a capped vocabulary
+    filler = ' '.join(f'term{i} term{i}' for i in range(6000))
+    resume = resume_from_text(f"Experience\nBuilt kubernetes operators in Python. {filler}")
+    job = job_from_text("Requirements: Python, Kubernetes, zookeeper")
+    score, _ = make_resume_scorer(job)(resume)
+    assert match_resume_to_job(resume, job) == pytest.approx(score, abs=1e-9)
+    assert make_jobs_scorer([job])([resume])[0, 0] == pytest.approx(score, abs=1e-9)
+    # 'zookeeper' is in no resume, so it lowers the pool score's similarity too
+    pool_score = match_resumes_to_job([resume], job)[0]
+    assert pool_score < match_resumes_to_job([resume], job_from_text("Requirements: Python, Kubernetes"))[0]
+    assert match_resumes_to_jobs([resume], [job])[0, 0] == pytest.approx(pool_score, abs=1e-9)
+
+
+@pytest.fixture
+def pool(write_resumes, job_text):
+    resumes_data = []
+    for path in write_resumes(60):
+        with open(path, encoding='utf-8') as f:
+            resumes_data.append(resume_from_text(f.read()))
+    return resumes_data, job_from_text(job_text)
+
+
+def test_pool_scores_do_not_depend_on_other_jobs(pool):
+    resumes_data, job = pool
+    expected = match_resumes_to_job(resumes_data, job)
+    other_job = job_from_text("Requirements: Java, Spring, PostgreSQL. Zookeeper and Kafka a plus.")
+    scores = match_resumes_to_jobs(resumes_data, [other_job, job, {'full_text': '', 'required_skills': {'python'}}])
+    assert scores[1] == pytest.approx(expected, abs=1e-9)
+    assert scores[0] == pytest.approx(match_resumes_to_job(resumes_data, other_job), abs=1e-9)
+    assert not scores[2].any()
+
+
+def test_multi_job_scores_match_single_jobs(pool):
+    resumes_data, job = pool
+    resumes_data = resumes_data[:15]
+    jobs = [job, job_from_text("Requirements: Java, Spring, PostgreSQL and Docker. Zookeeper a plus."),
+            {'full_text': 'python python python', 'required_skills': {'python', 'frobnication'}},
+            {'full_text': '', 'required_skills': {'python'}}]
+    coverage = required_skills_coverage_matrix(resumes_data, jobs)
+    pool_scores = match_resumes_to_jobs(resumes_data, jobs)
+    pair_scores = make_jobs_scorer(jobs)(resumes_data)
+    assert coverage.shape == pool_scores.shape == pair_scores.shape == (len(jobs), len(resumes_data))
+    for j, job_data in enumerate(jobs):
+        assert coverage[j] == pytest.approx(required_skills_coverage(resumes_data, job_data), abs=1e-12)
+        assert pool_scores[j] == pytest.approx(match_resumes_to_job(resumes_data, job_data), abs=1e-9)
+        for i, resume_data in enumerate(resumes_data):
+            assert coverage[j, i] == pytest.approx(required_skills_coverage([resume_data], job_data)[0], abs=1e-12)
+            assert pair_scores[j, i] == pytest.approx(match_resume_to_job(resume_data, job_data), abs=1e-9)
+    assert not pool_scores[3].any() and not pair_scores[3].any()
+
+
+def test_top_k_indices():
+    scores = np.array([[1.0, 3.0, 3.0, 2.0, 3.0],
+                       [0.0, 0.0, 0.0, 0.0, 0.0],
+                       [5.0, 4.0, 3.0, 2.0, 1.0]])
+    # Ties keep column order, also when only some of the tied columns fit
+    assert top_k_indices(scores, 2).tolist() == [[1, 2], [0, 1], [0, 1]]
+    assert top_k_indices(scores, 4).tolist() == [[1, 2, 4, 3], [0, 1, 2, 3], [0, 1, 2, 3]]
+    assert top_k_indices(scores, 0).shape == (3, 0)
+    assert top_k_indices(scores, -1).shape == (3, 0)
+    # k beyond the number of columns returns every column, best first
+    assert top_k_indices(scores, 10).tolist() == [[1, 2, 4, 3, 0], [0, 1, 2, 3, 4], [0, 1, 2, 3, 4]]
+    # Per-resume best fit on the transpose
+    assert top_k_indices(scores.T, 1).ravel().tolist() == [2, 2, 0, 0, 0]
+    assert top_k_indices(np.zeros((0, 4)), 2).shape == (0, 2)
+    assert top_k_indices(np.zeros((2, 0)), 2).shape == (2, 0)
+    rng = np.random.default_rng(0)
+    tied = rng.integers(0, 4, size=(20, 50)).astype(float)
+    for k in (1, 5, 50):
+        assert top_k_indices(tied, k).tolist() == np.argsort(-tied, axis=1, kind='stable')[:, :k].tolist()
+
+
+def test_two_stage_scores_do_not_depend_on_pool_size(pool):
+    resumes_data, job = pool
+    exhaustive = match_resumes_to_job(resumes_data, job)
+    for candidate_pool_size in (5, 20, 60):
+        indices, scores = rank_resumes_two_stage(resumes_data, job, 5, candidate_pool_size)
+        assert scores == pytest.approx(exhaustive[indices], abs=1e-12)
+    # With the whole pool shortlisted, two-stage ranking is exhaustive ranking
+    indices, _ = rank_resumes_two_stage(resumes_data, job, 10, len(resumes_data))
+    assert indices.tolist() == top_k_indices(exhaustive[np.newaxis, :], 10)[0].tolist()
+
+
+def test_two_stage_shortlists_from_skill_index(pool):
+    resumes_data, job = pool
+    coverage = required_skills_coverage(resumes_data, job)
+    skill_index = build_skill_index(resumes_data)
+    # Top-1 of a shortlist that is its only candidate is the stage-1 pick itself
+    indices, _ = rank_resumes_two_stage(resumes_data, job, 1, 1, skill_index)
+    assert indices.tolist() == [int(np.argmax(coverage))]
+    for candidate_pool_size in (5, 20):
+        expected = rank_resumes_two_stage(resumes_data, job, 5, candidate_pool_size)
+        indices, scores = rank_resumes_two_stage(resumes_data, job, 5, candidate_pool_size, skill_index)
+        assert indices.tolist() == expected[0].tolist()
+        shortlist = np.argsort(-coverage, kind='stable')[:candidate_pool_size]
+        assert set(indices.tolist()) <= set(shortlist.tolist())
+
+
+def test_recall_report(pool):
+    resumes_data, job = pool
+    report = two_stage_recall_report(resumes_data, job, 5, [5, 10, 20, 60])
+    assert list(report) == [5, 10, 20, 60]
+    assert report[60] == 1.0
+    # Shortlists are nested and scores are pool-independent, so recall can only grow with M
+    recalls = list(report.values())
+    assert recalls == sorted(recalls)
+    assert two_stage_recall_report([], job, 5, [5]) == {5: 1.0}
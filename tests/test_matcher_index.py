@@ -0,0 +1,86 @@
+# tests/test_matcher_index.py
+import os
+
+import numpy as np
+import pytest
+
+import matcher_index
+from matcher import match_resumes_to_job
+from matcher_index import MatcherIndex
+from parser import parse_job_description, parse_resume
+
+
+@pytest.fixture
+def job(tmp_path, job_text):
+    job_path = tmp_path / 'job_description.txt'
+    job_path.write_text(job_text, encoding='utf-8')
+    return parse_job_description(str(job_path))
+
+
+def test_sync_directory_tracks_changes(tmp_path, write_resumes, job):
+    paths = write_resumes(6)
+    resumes_dir = os.path.dirname(paths[0])
+    index = MatcherIndex()
+    assert index.sync_directory(resumes_dir, max_workers=1) == {'added': 6, 'updated': 0, 'removed': 0, 'unchanged': 0, 'failed': 0}
+    assert index.sync_directory(resumes_dir, max_workers=1)['unchanged'] == 6
+
+    os.remove(paths[0])
+    with open(paths[1], 'a', encoding='utf-8') as f:
+        f.write('\nKubernetes operators\n')
+    os.utime(paths[2], (0, 0)) # touched, same content
+    stats = index.sync_directory(resumes_dir, max_workers=1)
+    assert stats == {'added': 0, 'updated': 1, 'removed': 1, 'unchanged': 4, 'failed': 0}
+    assert os.path.abspath(paths[1]) in index.skill_index.all_of(['kubernetes'])
+
+    # Incremental updates give the same scores as indexing the final directory from scratch
+    rebuilt = MatcherIndex()
+    rebuilt.sync_directory(resumes_dir, max_workers=1)
+    keys, scores = index.score_job(job)
+    rebuilt_keys, rebuilt_scores = rebuilt.score_job(job)
+    rebuilt_order = [rebuilt_keys.index(key) for key in keys]
+    assert scores == pytest.approx(np.asarray(rebuilt_scores)[rebuilt_order], abs=1e-12)
+
+
+def test_scores_match_pool_scoring(write_resumes, job):
+    paths = write_resumes(8)
+    index = MatcherIndex()
+    index.sync_directory(os.path.dirname(paths[0]), max_workers=1)
+    keys, scores = index.score_job(job)
+    expected = match_resumes_to_job([parse_resume(key) for key in keys], job)
+    assert scores == pytest.approx(expected, abs=1e-9)
+
+
+def test_empty_index(job):
+    keys, scores = MatcherIndex().score_job(job)
+    assert keys == [] and np.asarray(scores).shape == (0,)
+
+
+def test_save_load_round_trip(tmp_path, write_resumes, job):
+    paths = write_resumes(5)
+    index = MatcherIndex()
+    index.sync_directory(os.path.dirname(paths[0]), max_workers=1)
+    index.save(str(tmp_path / 'index'))
+    loaded = MatcherIndex.open(str(tmp_path / 'index'))
+    assert loaded.parse_version == index.parse_version
+    keys, scores = index.score_job(job)
+    loaded_keys, loaded_scores = loaded.score_job(job)
+    assert loaded_keys == keys
+    assert loaded_scores == pytest.approx(scores, abs=1e-12)
+    assert loaded.sync_directory(os.path.dirname(paths[0]), max_workers=1)['unchanged'] == 5
+
+
+def test_parser_version_change_reparses_everything(tmp_path, write_resumes, monkeypatch):
+    paths = write_resumes(4)
+    other_paths = write_resumes(2, directory='other', seed=1)
+    index = MatcherIndex()
+    index.sync_directory(os.path.dirname(paths[0]), max_workers=1)
+    index.sync_directory(os.path.dirname(other_paths[0]), max_workers=1)
+    index.save(str(tmp_path / 'index'))
+
+    monkeypatch.setattr(matcher_index, 'parse_cache_version', lambda: 'new-parser')
+    loaded = MatcherIndex.open(str(tmp_path / 'index'))
+    stats = loaded.sync_directory(os.path.dirname(paths[0]), max_workers=1)
+    # Unchanged files are re-parsed; documents from the other directory can't be, so they are dropped
+    assert stats == {'added': 0, 'updated': 4, 'removed': 2, 'unchanged': 0, 'failed': 0}
+    assert loaded.parse_version == 'new-parser'
+    assert loaded.sync_directory(os.path.dirname(paths[0]), max_workers=1)['unchanged'] == 4
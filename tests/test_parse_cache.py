@@ -0,0 +1,93 @@
+# tests/test_parse_cache.py
+import time
+
+import utils
+from parse_cache import ParseCache
+from parser import parse_cache_version
+
+SKILL_SECTIONS = {'python': ('skills',), 'docker': ('experience', 'skills')}
+
+
+def put(cache, content_hash, text='x' * 100):
+    cache.put(content_hash, text, text.lower(), SKILL_SECTIONS)
+
+
+def stored_size(cache):
+    return cache.conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+
+def test_round_trip(tmp_path):
+    with ParseCache(str(tmp_path / 'cache.sqlite'), 'v1') as cache:
+        put(cache, 'a', 'Python and Docker')
+        # Buffered writes are visible before they are flushed
+        assert cache.get('a')['skills'] == set(SKILL_SECTIONS)
+    with ParseCache(str(tmp_path / 'cache.sqlite'), 'v1') as cache:
+        cached = cache.get('a')
+        assert cached['raw_text'] == 'Python and Docker'
+        assert cached['processed_text'] == 'python and docker'
+        assert cached['skill_sections'] == SKILL_SECTIONS
+        assert cache.get('missing') is None
+
+
+def test_version_change_invalidates(tmp_path):
+    db_path = str(tmp_path / 'cache.sqlite')
+    with ParseCache(db_path, 'v1') as cache:
+        put(cache, 'a')
+        put(cache, 'b')
+    with ParseCache(db_path, 'v2') as cache:
+        assert cache.get('a') is None
+        assert cache.total_size() == 0
+        put(cache, 'a')
+    with ParseCache(db_path, 'v2') as cache:
+        assert cache.get('a') is not None
+
+
+def test_running_total_matches_table(tmp_path):
+    db_path = str(tmp_path / 'cache.sqlite')
+    with ParseCache(db_path, 'v1', batch_size=3) as cache:
+        for i in range(10):
+            put(cache, f'h{i}', 'y' * (10 * i))
+        put(cache, 'h3', 'z' * 500) # replacing an entry adjusts the total by the size difference
+    with ParseCache(db_path, 'v1') as cache:
+        assert cache.total_size() == stored_size(cache) > 0
+    with ParseCache(db_path, 'v2') as cache:
+        assert cache.total_size() == stored_size(cache) == 0
+
+
+def test_eviction_follows_hits_from_read_only_runs(tmp_path):
+    db_path = str(tmp_path / 'cache.sqlite')
+    with ParseCache(db_path, 'v1') as cache:
+        for content_hash in 'abc':
+            put(cache, content_hash)
+            time.sleep(0.01)
+        cache.flush()
+        entry_size = cache.total_size() // 3
+    # An all-hit run: the only writes are last-used times, which must still be persisted
+    with ParseCache(db_path, 'v1') as cache:
+        assert cache.get('a') is not None
+    time.sleep(0.01)
+    with ParseCache(db_path, 'v1', max_bytes=3 * entry_size) as cache:
+        put(cache, 'd')
+    with ParseCache(db_path, 'v1') as cache:
+        assert cache.get('b') is None # least recently used
+        assert all(cache.get(content_hash) is not None for content_hash in 'acd')
+        assert cache.total_size() <= 3 * entry_size
+
+
+def test_pdf_budget_change_invalidates(tmp_path, monkeypatch):
+    db_path = str(tmp_path / 'cache.sqlite')
+    with ParseCache(db_path, parse_cache_version) as cache:
+        put(cache, 'a', 'full document')
+        put(cache, 'b')
+        cache.flush()
+        put(cache, 'c') # Still buffered
+        monkeypatch.setattr(utils, 'PDF_MAX_PAGES', 1)
+        # Parses under the old budget are not served, flushed or buffered
+        assert cache.get('a') is None and cache.get('c') is None
+        put(cache, 'a', 'first page')
+        assert cache.get('a')['raw_text'] == 'first page'
+    with ParseCache(db_path, parse_cache_version) as cache:
+        assert cache.get('a')['raw_text'] == 'first page'
+        assert cache.get('b') is None
+        monkeypatch.setattr(utils, 'PDF_MAX_PAGES', None)
+        assert cache.get('a') is None
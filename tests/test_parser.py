@@ -0,0 +1,93 @@
+# tests/test_parser.py
+import random
+import re
+
+import pytest
+
+import utils
+from benchmarks.corpus import LINES_PER_PDF_PAGE, write_pdf
+from parse_cache import ParseCache
+from parser import SkillMatcher, extract_skill_sections, parse_cache_version, parse_resume, segment_sections
+from skill_taxonomy import SKILL_TAXONOMY
+
+SEPARATORS = [' ', ', ', '. ', '\n', ' / ', '-', '(', ') ', '+', '#', '']
+OVERLAPPING_SKILLS = ['c', 'c++', 'c#', '.net', 'node.js', 'bash', 'bash scripting', 'scripting', 'java', 'javascript', 'sql',
+                      'no sql', 'r']
+
+
+def regex_matches(aliases, text_lower):
+    # Baseline: one r'\b' + re.escape(alias) + r'\b' scan per alias (every start, so overlaps count too)
+    matches = set()
+    for alias, canonical in aliases.items():
+        for match in re.finditer(r'(?=\b(' + re.escape(alias) + r')\b)', text_lower):
+            matches.update((match.start(1), match.end(1), skill) for skill in canonical)
+    return matches
+
+
+def synthetic_texts(aliases, num_texts, seed=0):
+    rng = random.Random(seed)
+    alias_list = sorted(aliases)
+    for _ in range(num_texts):
+        words = [rng.choice(alias_list) if rng.random() < 0.6 else rng.choice(['experience', 'built', 'x', 'a1', 'scripts'])
+                 for _ in range(rng.randint(1, 40))]
+        yield ''.join(word + rng.choice(SEPARATORS) for word in words)
+
+
+@pytest.mark.parametrize('aliases', [
+    SKILL_TAXONOMY.aliases,
+    {skill: (skill,) for skill in OVERLAPPING_SKILLS},
+], ids=['taxonomy', 'overlapping'])
+def test_skill_matcher_matches_per_alias_regex(aliases):
+    matcher = SkillMatcher(aliases)
+    for text in synthetic_texts(aliases, 300):
+        assert set(matcher.finditer(text)) == regex_matches(aliases, text), text
+
+
+def test_skill_matcher_accepts_plain_skill_sets():
+    matcher = SkillMatcher(OVERLAPPING_SKILLS)
+    text = 'bash scripting in c++ and c, node.js; no sql'
+    assert set(matcher.finditer(text)) == regex_matches({skill: (skill,) for skill in OVERLAPPING_SKILLS}, text)
+    assert SkillMatcher([]).skills == frozenset()
+    assert list(SkillMatcher([]).finditer(text)) == []
+
+
+def test_segment_sections_detects_headers():
+    text = ('Jane Doe\nWORK EXPERIENCE:\nBuilt Docker images with Python\n  Technical Skills  \nPython, Kubernetes\n'
+            'Skills in leading teams\nEducation\nBSc')
+    sections = segment_sections(text)
+    assert [section for section, _, _ in sections] == ['other', 'experience', 'skills', 'education']
+    # Spans are contiguous offsets into the text, each starting at its header line
+    assert sections[0][1] == 0 and sections[-1][2] == len(text)
+    assert all(previous[2] == current[1] for previous, current in zip(sections, sections[1:]))
+    assert [text[start:end].split('\n')[0] for _, start, end in sections] == ['Jane Doe', 'WORK EXPERIENCE:', '  Technical Skills  ', 'Education']
+    assert segment_sections('No headers here\nat all') == [('other', 0, 22)]
+    assert segment_sections('') == [('other', 0, 0)]
+    assert segment_sections('Skills\n') == [('skills', 0, 7)]
+
+
+def test_extract_skill_sections_tags_matches_by_section():
+    text = 'Summary\nPython developer\nExperience\nBuilt Docker images with Python\nSkills\nPython, Kubernetes\n'
+    assert extract_skill_sections(text) == {'python': ('experience', 'other', 'skills'), 'docker': ('experience',),
+                                            'kubernetes': ('skills',)}
+    # Spans from a caller are used as given
+    assert extract_skill_sections(text, [('projects', 0, len(text))]) == {'python': ('projects',), 'docker': ('projects',),
+                                                                           'kubernetes': ('projects',)}
+
+
+def test_extract_skill_sections_when_lowercasing_changes_length():
+    # 'İ' lowercases to two characters, so offsets into text.lower() no longer line up with the spans
+    text = 'İİİİİİİİİİ İstanbul\nExperience\nDocker\nSkills\nKubernetes'
+    assert len(text.lower()) != len(text)
+    expected = {'docker': ('experience',), 'kubernetes': ('skills',)}
+    assert extract_skill_sections(text) == expected
+    assert extract_skill_sections(text.replace('İ', 'I')) == expected
+
+
+def test_cached_parse_follows_pdf_budget(tmp_path, monkeypatch):
+    pdf_path = str(tmp_path / 'resume.pdf')
+    write_pdf(pdf_path, ['Skills: Python'] + ['filler'] * (LINES_PER_PDF_PAGE - 1) + ['Kubernetes operators'])
+    with ParseCache(str(tmp_path / 'cache.sqlite'), parse_cache_version) as cache:
+        assert parse_resume(pdf_path, cache=cache)['skills'] == {'python', 'kubernetes'}
+        monkeypatch.setattr(utils, 'PDF_MAX_PAGES', 1)
+        assert parse_resume(pdf_path, cache=cache)['skills'] == {'python'}
+        assert parse_resume(pdf_path)['skills'] == {'python'}
@@ -0,0 +1,139 @@
+# tests/test_service.py
+import asyncio
+import base64
+import json
+import os
+import time
+
+import pytest
+
+import service
+from matcher import make_jobs_scorer, term_counts
+from parser import parse_job_description, parse_resume
+from service import HTTPError, ScoringService
+
+
+def run_with_service(coroutine_function, **kwargs):
+    async def main():
+        scoring_service = ScoringService(max_workers=2, **kwargs)
+        try:
+            return await coroutine_function(scoring_service)
+        finally:
+            scoring_service.close()
+    return asyncio.run(main())
+
+
+def test_register_score_and_delete(tmp_path, write_resumes, job_text):
+    resume_path, = write_resumes(1)
+    with open(resume_path, 'rb') as f:
+        resume_content = f.read()
+
+    async def scenario(scoring_service):
+        status, payload = await scoring_service.handle('POST', '/jobs', {'id': ['backend eng'], 'filename': ['jd.txt']},
+                                                       job_text.encode('utf-8'))
+        assert payload['job_id'] == 'backend eng'
+        _, scored = await scoring_service.handle('POST', '/score', {'filename': ['cv.txt']}, resume_content)
+        # IDs arrive URL-encoded in the path
+        _, remaining = await scoring_service.handle('DELETE', '/jobs/backend%20eng', {}, b'')
+        return scored, remaining
+
+    scored, remaining = run_with_service(scenario)
+    assert remaining == {'jobs': []}
+    job_path = tmp_path / 'jd.txt'
+    job_path.write_text(job_text, encoding='utf-8')
+    expected = make_jobs_scorer([parse_job_description(str(job_path))])([parse_resume(resume_path)])[0, 0]
+    assert scored['scores'][0]['job_id'] == 'backend eng'
+    assert scored['scores'][0]['score'] == pytest.approx(round(float(expected), 2))
+
+
+def test_batch_scoring_runs_off_the_event_loop(write_resumes, job_text):
+    uploads = []
+    for path in write_resumes(4):
+        with open(path, 'rb') as f:
+            uploads.append({'filename': os.path.basename(path), 'content_base64': base64.b64encode(f.read()).decode()})
+
+    async def scenario(scoring_service):
+        await scoring_service.handle('POST', '/jobs', {'id': ['jd']}, job_text.encode('utf-8'))
+        scoring_service._score_batch = slow_scorer(scoring_service._score_batch)
+        batch = asyncio.ensure_future(scoring_service.handle('POST', '/score/batch', {}, json.dumps({'resumes': uploads}).encode()))
+        # While the (slow) batch is being scored, the loop keeps running other tasks
+        longest_stall = 0.0
+        while not batch.done():
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            longest_stall = max(longest_stall, time.perf_counter() - start)
+        return longest_stall, batch.result()[1]
+
+    longest_stall, payload = run_with_service(scenario)
+    assert longest_stall < 0.3
+    assert [result['scores'][0]['job_id'] for result in payload['results']] == ['jd'] * 4
+
+
+def slow_scorer(score_batch):
+    def score(resumes_data):
+        time.sleep(0.5)
+        return score_batch(resumes_data)
+    return score
+
+
+def test_parse_upload_times_out(monkeypatch):
+    def slow_parse(file_path):
+        time.sleep(5)
+    monkeypatch.setattr(service, 'parse_resume', slow_parse)
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError, match='cv.txt'):
+        service._parse_upload('resume', 'cv.txt', b'Python developer', timeout=0.2)
+    assert time.perf_counter() - start < 2
+
+
+def test_unknown_job_is_404():
+    async def scenario(scoring_service):
+        await scoring_service.handle('DELETE', '/jobs/missing%2Fjob', {}, b'')
+
+    with pytest.raises(HTTPError, match='missing/job'):
+        run_with_service(scenario)
+
+
+def test_registration_counts_each_job_once_and_runs_off_the_event_loop(job_text, monkeypatch):
+    counted, builds = [], []
+
+    def counting_term_counts(job_description_data):
+        counted.append(job_description_data['file_name'])
+        return term_counts(job_description_data)
+
+    def slow_make_jobs_scorer(jobs_data, jobs_term_counts):
+        builds.append(len(jobs_data))
+        time.sleep(0.5)
+        return make_jobs_scorer(jobs_data, jobs_term_counts)
+
+    monkeypatch.setattr(service, 'term_counts', counting_term_counts)
+    monkeypatch.setattr(service, 'make_jobs_scorer', slow_make_jobs_scorer)
+    jobs = {f'jd{i}': {'file_name': f'jd{i}.txt', 'full_text': f'{job_text.lower()} extra{i}', 'required_skills': {'python'}}
+            for i in range(3)}
+
+    async def scenario(scoring_service):
+        await scoring_service.register_jobs(dict(list(jobs.items())[:2]))
+        registration = asyncio.ensure_future(scoring_service.register_job('jd2', jobs['jd2']))
+        longest_stall = 0.0
+        while not registration.done():
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            longest_stall = max(longest_stall, time.perf_counter() - start)
+        await registration
+        await scoring_service.unregister_job('jd0')
+        return longest_stall, scoring_service._job_ids
+
+    longest_stall, job_ids = run_with_service(scenario)
+    assert longest_stall < 0.3
+    assert job_ids == ['jd1', 'jd2']
+    assert counted == ['jd0.txt', 'jd1.txt', 'jd2.txt'] # Never counted again on later rebuilds
+    assert builds == [2, 3, 2] # One build for the two JDs registered together
+
+
+def test_batch_filenames_must_be_strings():
+    content = base64.b64encode(b'Python developer').decode()
+    with pytest.raises(HTTPError, match='filename must be a string') as raised:
+        service._decode_batch(json.dumps({'resumes': [{'filename': 5, 'content_base64': content}]}).encode())
+    assert raised.value.status == 400
+    assert service._decode_batch(json.dumps({'resumes': [{'filename': 'cv.txt', 'content_base64': content}]}).encode()) == \
+        [('cv.txt', b'Python developer')]
@@ -0,0 +1,88 @@
+# tests/test_skill_index.py
+import pytest
+
+from skill_index import SkillIndex
+
+
+@pytest.fixture
+def index():
+    index = SkillIndex()
+    index.add('a', ['python', 'sql'])
+    index.add('b', ['python', 'kubernetes', 'docker'])
+    index.add('c', ['java'])
+    return index
+
+
+def test_queries(index):
+    assert len(index) == 3 and 'b' in index
+    assert index.all_of(['python']) == ['a', 'b']
+    assert index.all_of(['python', 'docker']) == ['b']
+    assert index.all_of(['python', 'java']) == []
+    assert index.all_of([]) == ['a', 'b', 'c']
+    assert sorted(index.any_of(['sql', 'java', 'rust'])) == ['a', 'c']
+    assert index.any_of([]) == []
+    assert index.match_counts(['python', 'docker', 'rust']).tolist() == [1, 2, 0]
+
+
+def test_coverage_and_at_least(index):
+    keys, coverage = index.coverage(['python', 'docker'])
+    assert keys == ['a', 'b', 'c']
+    assert coverage.tolist() == [0.5, 1.0, 0.0]
+    assert index.at_least(['python', 'docker'], 0.5) == ['b', 'a']
+    assert index.at_least(['python', 'docker'], 1.0) == ['b']
+    keys, coverage = index.coverage([])
+    assert coverage.tolist() == [0.0, 0.0, 0.0]
+
+
+def test_remove_and_replace(index):
+    index.remove('a')
+    assert 'a' not in index and len(index) == 2
+    assert index.all_of(['python']) == ['b']
+    assert 'sql' not in index.postings # Empty postings are dropped
+    index.add('b', ['sql']) # Replaces b's skills
+    assert index.all_of(['python']) == []
+    assert index.all_of(['sql']) == ['b']
+    with pytest.raises(KeyError):
+        index.remove('missing')
+
+
+def test_free_ids_are_reused(index):
+    candidate_id = index.ids['a']
+    index.remove('a')
+    assert index.add('d', ['rust']) == candidate_id
+    assert index.keys[candidate_id] == 'd'
+    assert index.all_of(['rust']) == ['d']
+    # The reused ID carries none of the removed candidate's skills
+    assert index.any_of(['python', 'sql']) == ['b']
+    keys, coverage = index.coverage(['rust'])
+    assert dict(zip(keys, coverage.tolist())) == {'b': 0.0, 'c': 0.0, 'd': 1.0}
+
+
+def test_many_candidates():
+    index = SkillIndex()
+    for i in range(1000):
+        index.add(i, ['python'] if i % 3 == 0 else ['java'])
+    assert index.all_of(['python']) == list(range(0, 1000, 3))
+    for i in range(0, 1000, 2):
+        index.remove(i)
+    assert index.all_of(['python']) == list(range(3, 1000, 6))
+    keys, coverage = index.coverage(['java'])
+    assert keys == list(range(1, 1000, 2))
+    assert coverage.tolist() == [0.0 if key % 3 == 0 else 1.0 for key in keys]
+
+
+def test_save_and_load(index, tmp_path):
+    index.remove('a')
+    index.add('d', ['go', 'python'])
+    index.add('e', ['sql'])
+    path = str(tmp_path / 'skills.npz')
+    index.save(path)
+    loaded = SkillIndex.load(path)
+    assert sorted(loaded.ids) == sorted(index.ids)
+    for skills in (['python'], ['sql'], ['go', 'python'], ['java', 'docker']):
+        assert sorted(loaded.all_of(skills)) == sorted(index.all_of(skills))
+        assert sorted(loaded.any_of(skills)) == sorted(index.any_of(skills))
+    # Loaded indexes keep accepting updates
+    loaded.remove('e')
+    assert loaded.add('f', ['sql']) == index.ids['e'] # Reuses e's ID
+    assert loaded.all_of(['sql']) == ['f']
@@ -0,0 +1,60 @@
+# tests/test_skill_taxonomy.py
+import json
+
+import pytest
+
+from matcher import make_resume_scorer, required_skills_coverage
+from parser import extract_skills
+from skill_taxonomy import SKILL_TAXONOMY, SkillTaxonomy, load_skill_taxonomy
+
+
+def test_aliases_report_canonical_skills():
+    assert extract_skills("Ran services on Amazon Web Services and wrote CPP") >= {'aws', 'c++'}
+    # One alias can stand for several skills
+    assert extract_skills("Ability to quickly grasp concepts") >= {'adaptability', 'analytical skills'}
+    # An alias and its canonical skill in one document count once
+    assert extract_skills("AWS (Amazon Web Services)") & {'aws', 'amazon web services'} == {'aws'}
+
+
+def test_load_taxonomy_file(tmp_path):
+    path = tmp_path / 'taxonomy.json'
+    path.write_text(json.dumps({
+        '_comment': 'ignored',
+        'skills': {'software': ['Kubernetes', 'Java'], 'soft': ['Teamwork']},
+        'aliases': {'kubernetes': ['k8s', 'kube']},
+        'weights': {'java': 3},
+    }), encoding='utf-8')
+    taxonomy = load_skill_taxonomy(str(path))
+    assert taxonomy.skills == ['java', 'kubernetes', 'teamwork']
+    assert taxonomy.aliases['k8s'] == ('kubernetes',)
+    assert taxonomy.weight('java') == 3.0 and taxonomy.weight('teamwork') == 1.0
+    assert taxonomy.ids_of(['teamwork', 'java', 'java', 'unknown']).tolist() == [0, 2]
+    assert taxonomy.skill_id('unknown') is None
+
+
+def test_version_tracks_aliases_not_weights():
+    groups = {'software': ['kubernetes', 'java']}
+    base = SkillTaxonomy(groups)
+    assert SkillTaxonomy(groups, weights={'java': 2}).version == base.version
+    assert SkillTaxonomy(groups, aliases={'kubernetes': ['k8s']}).version != base.version
+
+
+def test_invalid_aliases_and_weights():
+    with pytest.raises(ValueError, match='unknown skill'):
+        SkillTaxonomy({'software': ['java']}, aliases={'go': ['golang']})
+    with pytest.raises(ValueError, match='both a skill and an alias'):
+        SkillTaxonomy({'software': ['java', 'kotlin']}, aliases={'java': ['kotlin']})
+    with pytest.raises(ValueError, match='unknown skill'):
+        SkillTaxonomy({'software': ['java']}, weights={'go': 2})
+
+
+def test_unknown_skills_do_not_grow_the_taxonomy():
+    num_skills = len(SKILL_TAXONOMY)
+    job = {'full_text': 'java and frobnication', 'required_skills': {'java', 'frobnication-1', 'frobnication-2'}}
+    resume = {'full_text': 'java frobnication', 'skills': {'java', 'frobnication-1', 'other-unknown'}}
+    coverage = required_skills_coverage([resume], job)
+    # Skills outside the taxonomy still count, with the default weight, as in the streaming scorer
+    assert coverage[0] == pytest.approx(2 / 3)
+    assert make_resume_scorer(job)(resume)[1] == {'java', 'frobnication-1'}
+    assert len(SKILL_TAXONOMY) == num_skills
+    assert 'frobnication-1' not in SKILL_TAXONOMY
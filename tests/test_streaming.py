@@ -0,0 +1,46 @@
+# tests/test_streaming.py
+import os
+import subprocess
+import sys
+
+from conftest import REPO_ROOT
+import pytest
+
+import ingest
+from ingest import iter_resume_scores, top_k_resumes
+from matcher import make_required_skills_scorer, match_resumes_to_job
+from parser import parse_resume
+
+
+def test_top_k_matches_full_sort(write_resumes, job_text):
+    paths = write_resumes(30)
+    job = {'full_text': job_text.lower(), 'required_skills': {'python', 'docker', 'sql'}}
+    records = list(iter_resume_scores(paths, job, max_workers=1))
+    assert top_k_resumes(iter(records), 5) == sorted(records, key=lambda record: record[1], reverse=True)[:5]
+    # Scores are the pool score over every file, as if the parsed pool had been held in memory
+    resumes_data = [parse_resume(path) for path in paths]
+    assert [record[0] for record in records] == paths
+    assert [record[1] for record in records] == pytest.approx(match_resumes_to_job(resumes_data, job).tolist(), abs=1e-9)
+    score_required_skills = make_required_skills_scorer(job)
+    assert [record[2] for record in records] == [score_required_skills(resume_data)[1] for resume_data in resumes_data]
+
+
+def test_scores_do_not_depend_on_batching(write_resumes, job_text, monkeypatch):
+    paths = write_resumes(12)
+    job = {'full_text': job_text.lower(), 'required_skills': {'python', 'docker', 'sql'}}
+    expected = list(iter_resume_scores(paths, job, max_workers=1))
+    monkeypatch.setattr(ingest, 'SCORE_BATCH_SIZE', 5)
+    records = list(iter_resume_scores(paths, job, max_workers=1))
+    assert [record[1] for record in records] == pytest.approx([record[1] for record in expected], abs=1e-12)
+    assert list(iter_resume_scores([], job, max_workers=1)) == []
+
+
+def test_streaming_rss_stays_flat():
+    # Small run of the benchmarks/streaming.py gate (which defaults to a 100k-document stream),
+    # in a fresh interpreter so earlier tests don't set the peak RSS
+    result = subprocess.run(
+        [sys.executable, os.path.join(REPO_ROOT, 'benchmarks', 'streaming.py'),
+         '--resumes', '3000', '--distinct', '300', '--workers', '1', '--max-growth-mb', '16'],
+        capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
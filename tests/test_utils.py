@@ -0,0 +1,25 @@
+# tests/test_utils.py
+import pytest
+
+import utils
+from benchmarks.corpus import LINES_PER_PDF_PAGE, write_pdf
+
+
+@pytest.fixture
+def three_page_pdf(tmp_path):
+    path = tmp_path / 'resume.pdf'
+    write_pdf(str(path), [f'page {i // LINES_PER_PDF_PAGE} line {i}' for i in range(3 * LINES_PER_PDF_PAGE)])
+    return str(path)
+
+
+def test_pdf_budgets_are_read_at_call_time(three_page_pdf, monkeypatch):
+    full_text = utils.extract_text_from_pdf(three_page_pdf)
+    assert 'page 2 line' in full_text
+    monkeypatch.setattr(utils, 'PDF_MAX_PAGES', 1)
+    first_page = utils.extract_text_from_pdf(three_page_pdf)
+    assert 'page 0 line' in first_page and 'page 1 line' not in first_page
+    # Explicit arguments still win over the module settings
+    assert 'page 2 line' in utils.extract_text_from_pdf(three_page_pdf, max_pages=3)
+    monkeypatch.setattr(utils, 'PDF_MAX_PAGES', None)
+    monkeypatch.setattr(utils, 'PDF_MAX_CHARS', 10)
+    assert 'page 1 line' not in utils.extract_text_from_pdf(three_page_pdf)
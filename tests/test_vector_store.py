@@ -0,0 +1,90 @@
+# tests/test_vector_store.py
+import os
+
+import numpy as np
+import pytest
+
+import vector_store
+from matcher_index import MatcherIndex
+from parser import parse_job_description, parse_resume
+from vector_store import VectorStore
+
+
+def test_scores_match_matcher_index(tmp_path, write_resumes, job_text):
+    paths = write_resumes(8)
+    job_path = tmp_path / 'job_description.txt'
+    job_path.write_text(job_text, encoding='utf-8')
+    job = parse_job_description(str(job_path))
+
+    store = VectorStore.build(str(tmp_path / 'store'), ((path, parse_resume(path)) for path in paths))
+    index = MatcherIndex()
+    index.sync_directory(os.path.dirname(paths[0]), max_workers=1)
+    keys, index_scores = index.score_job(job)
+    # Same pooled IDF; the store keeps float32 weights
+    store_scores = dict(zip((store.key(row) for row in range(len(store))), store.score_job(job)))
+    assert [store_scores[key] for key in keys] == pytest.approx(index_scores, abs=1e-4)
+
+
+def test_terms_and_keys_round_trip(tmp_path):
+    resumes = [('/résumés/ünïcode.txt', {'full_text': 'python zürich kubernetes', 'skills': {'python', 'kubernetes'}}),
+               ('/resumes/' + 'long' * 50 + '.txt', {'full_text': 'a' * 300 + ' python', 'skills': {'python'}})]
+    store = VectorStore.open(VectorStore.build(str(tmp_path / 'store'), resumes).store_dir)
+    assert [store.key(row) for row in range(len(store))] == [key for key, _ in resumes]
+    # Terms of any length are stored unpadded; longer or missing terms are not found
+    term_ids = store.lookup_term_ids(['python', 'kubernetes', 'a' * 300, 'a' * 301, 'missing', ''])
+    assert term_ids[3:].tolist() == [-1, -1, -1]
+    assert [store._terms[term_id].decode('utf-8') for term_id in term_ids[:3]] == ['python', 'kubernetes', 'a' * 300]
+
+
+def test_parser_version_change_requires_rebuild(tmp_path, monkeypatch):
+    store_dir = str(tmp_path / 'store')
+    VectorStore.build(store_dir, [('a.txt', {'full_text': 'python', 'skills': {'python'}})])
+    assert VectorStore.is_current(store_dir)
+    monkeypatch.setattr(vector_store, 'parse_cache_version', lambda: 'new-parser')
+    assert not VectorStore.is_current(store_dir)
+    with pytest.raises(ValueError, match='parser version'):
+        VectorStore.open(store_dir)
+    assert len(VectorStore.build(store_dir, [('b.txt', {'full_text': 'java', 'skills': {'java'}})])) == 1
+
+
+def test_empty_store(tmp_path):
+    store = VectorStore.build(str(tmp_path / 'store'), [])
+    assert len(store) == 0
+    assert store.lookup_term_ids(['python']).tolist() == [-1]
+    assert np.asarray(store.score_job({'full_text': 'python developer', 'required_skills': {'python'}})).shape == (0,)
+
+
+def test_store_opened_before_a_rebuild_keeps_reading(tmp_path, write_resumes, job_text):
+    store_dir = str(tmp_path / 'store')
+    paths = write_resumes(6)
+    job = {'full_text': job_text.lower(), 'required_skills': {'python', 'kubernetes'}}
+    old = VectorStore.build(store_dir, ((path, parse_resume(path)) for path in paths[:3]))
+    old_keys = [old.key(row) for row in range(len(old))]
+    old_scores = old.score_job(job).tolist()
+
+    # Two rebuilds: the second one deletes the generation 'old' has mapped
+    for num_resumes in (6, 2):
+        new = VectorStore.build(store_dir, ((path, parse_resume(path)) for path in paths[:num_resumes]))
+        assert len(new) == num_resumes
+    assert len(VectorStore.open(store_dir)) == 2
+    assert len([name for name in os.listdir(store_dir) if name.startswith('generation-')]) == 2
+
+    assert [old.key(row) for row in range(len(old))] == old_keys
+    assert old.score_job(job).tolist() == old_scores
+
+
+def test_opens_and_replaces_unversioned_store(tmp_path):
+    store_dir = tmp_path / 'store'
+    VectorStore.build(str(store_dir), [('a.txt', {'full_text': 'python', 'skills': {'python'}})])
+    # Layout of stores built before generations: the files directly in the store directory
+    generation_dir = store_dir / (store_dir / 'CURRENT').read_text()
+    for path in generation_dir.iterdir():
+        path.rename(store_dir / path.name)
+    generation_dir.rmdir()
+    (store_dir / 'CURRENT').unlink()
+    assert VectorStore.is_current(str(store_dir))
+    assert VectorStore.open(str(store_dir)).key(0) == 'a.txt'
+
+    VectorStore.build(str(store_dir), [('b.txt', {'full_text': 'java', 'skills': {'java'}})])
+    assert sorted(path.name for path in store_dir.iterdir() if not path.name.startswith('generation-')) == ['CURRENT']
+    assert VectorStore.open(str(store_dir)).key(0) == 'b.txt'
@@ -1,16 +1,136 @@
 # utils.py
-import docx
-from pdfminer.high_level import extract_text
+# pdfminer, PyMuPDF and python-docx are imported inside the extractors, so they only load when a file of that type is read
+import importlib.util
+import io
+import logging
+import mmap
 
-def extract_text_from_pdf(pdf_path):
+from instrumentation import stage
+
+logger = logging.getLogger(__name__)
+
+# --- PDF extraction configuration ---
+# Backends in order of preference; the first one that is installed is used, and later ones are
+# tried if it fails on a file. pdfminer (full layout analysis) is the reference and the fallback.
+# PyMuPDF (pip install pymupdf) is an order of magnitude faster on typical CVs.
+PDF_BACKENDS = ('pymupdf', 'pdfminer')
+PDF_MAX_PAGES = None # Stop after this many pages (None = no limit)
+PDF_MAX_CHARS = None # Stop after the page on which the text reaches this many characters (None = no limit)
+
+
+def _iter_pdf_pages_pdfminer(pdf_path):
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+
+    # Same pipeline as pdfminer.high_level.extract_text, one page at a time, so the
+    # concatenated pages are identical to its output. pdfminer's parser seeks and reads
+    # the file in small chunks; the memory map serves those without a syscall each.
+    with open(pdf_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as pdf_data:
+        output = io.StringIO()
+        resource_manager = PDFResourceManager(caching=True)
+        device = TextConverter(resource_manager, output, codec='utf-8', laparams=LAParams())
+        try:
+            interpreter = PDFPageInterpreter(resource_manager, device)
+            for page in PDFPage.get_pages(pdf_data, caching=True):
+                interpreter.process_page(page)
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
+        finally:
+            device.close()
+
+
+def _iter_pdf_pages_pymupdf(pdf_path):
+    import pymupdf
+
+    # Layout-free extraction in C; MuPDF reads the file itself
+    with pymupdf.open(pdf_path, filetype='pdf') as document:
+        if not document.is_pdf: # MuPDF also renders e-books, images and markdown
+            raise ValueError("not a PDF file")
+        for page in document:
+            yield page.get_text() + '\f' # Page separator, as in pdfminer's output
+
+
+# name -> (page iterator, module that must be importable for the backend to be available)
+_PDF_BACKENDS = {
+    'pdfminer': (_iter_pdf_pages_pdfminer, 'pdfminer'),
+    'pymupdf': (_iter_pdf_pages_pymupdf, 'pymupdf'),
+}
+
+
+def register_pdf_backend(name, iter_pages, module=None):
+    """
+    Registers a PDF backend: iter_pages(pdf_path) is a generator function yielding the text of each page in order.
+    The backend counts as available only if 'module' (when given) is installed.
+    Add the name to PDF_BACKENDS to use it by default.
+    """
+    _PDF_BACKENDS[name] = (iter_pages, module)
+
+
+def available_pdf_backends(backends=None):
+    """
+    The names in 'backends' (default: every registered backend) that are registered and installed.
+    Checking does not import the backend.
+    """
+    backends = _PDF_BACKENDS if backends is None else backends
+    return [name for name in backends
+            if name in _PDF_BACKENDS and (_PDF_BACKENDS[name][1] is None or importlib.util.find_spec(_PDF_BACKENDS[name][1]))]
+
+
+def pdf_extraction_version():
+    """
+    Identifies the PDF backend and budgets in effect, so cached text extracted under different settings is not reused.
+    """
+    backend = next(iter(available_pdf_backends(PDF_BACKENDS)), None)
+    return f"{backend}:{PDF_MAX_PAGES}:{PDF_MAX_CHARS}"
+
+
+def iter_pdf_pages(pdf_path, backend='pdfminer', max_pages=None):
+    """
+    Lazily yields the text of each page of a PDF with the given backend. Pages after the
+    ones consumed are never parsed, so stopping early skips the rest of the document.
+    """
+    iter_pages, _ = _PDF_BACKENDS[backend]
+    pages = iter_pages(pdf_path)
     try:
-        text = extract_text(pdf_path)
-        return text
-    except Exception as e:
-        print(f"Error reading PDF {pdf_path}: {e}")
-        return ""
+        for page_number, page_text in enumerate(pages):
+            if max_pages is not None and page_number >= max_pages:
+                break
+            yield page_text
+    finally:
+        pages.close()
+
+
+def extract_text_from_pdf(pdf_path, backends=None, max_pages=None, max_chars=None):
+    """
+    Extracts the text of a PDF page by page, stopping after max_pages pages or once max_chars
+    characters have been read. Uses the first installed backend in 'backends' and falls back to
+    the next one if it fails on this file.
+    Arguments left as None use PDF_BACKENDS, PDF_MAX_PAGES and PDF_MAX_CHARS as they are at call time,
+    so changing those settings takes effect (and matches pdf_extraction_version, which keys the parse cache).
+    """
+    backends = PDF_BACKENDS if backends is None else backends
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+    max_chars = PDF_MAX_CHARS if max_chars is None else max_chars
+    for backend in available_pdf_backends(backends):
+        try:
+            text_parts = []
+            num_chars = 0
+            for page_text in iter_pdf_pages(pdf_path, backend, max_pages):
+                text_parts.append(page_text)
+                num_chars += len(page_text)
+                if max_chars is not None and num_chars >= max_chars:
+                    break
+            return ''.join(text_parts)
+        except Exception as e:
+            logger.warning("PDF backend %s failed on %s: %s", backend, pdf_path, e)
+    logger.error("Error reading PDF %s: no PDF backend could extract it (tried %s)", pdf_path, ', '.join(backends))
+    return ""
 
 def extract_text_from_docx(docx_path):
+    import docx
     try:
         doc = docx.Document(docx_path)
         full_text = []
@@ -18,7 +138,7 @@ def extract_text_from_docx(docx_path):
             full_text.append(para.text)
         return '\n'.join(full_text)
     except Exception as e:
-        print(f"Error reading DOCX {docx_path}: {e}")
+        logger.error("Error reading DOCX %s: %s", docx_path, e)
         return ""
 
 def extract_text_from_txt(txt_path):
@@ -26,19 +146,20 @@ def extract_text_from_txt(txt_path):
         with open(txt_path, 'r', encoding='utf-8') as f:
             return f.read()
     except Exception as e:
-        print(f"Error reading TXT {txt_path}: {e}")
+        logger.error("Error reading TXT %s: %s", txt_path, e)
         return ""
 
 def extract_text_from_file(file_path):
-    if file_path.lower().endswith('.pdf'):
-        return extract_text_from_pdf(file_path)
-    elif file_path.lower().endswith('.docx'):
-        return extract_text_from_docx(file_path)
-    elif file_path.lower().endswith('.txt'):
-        return extract_text_from_txt(file_path)
-    else:
-        print(f"Unsupported file format: {file_path}")
-        return ""
+    with stage('extract'):
+        if file_path.lower().endswith('.pdf'):
+            return extract_text_from_pdf(file_path)
+        elif file_path.lower().endswith('.docx'):
+            return extract_text_from_docx(file_path)
+        elif file_path.lower().endswith('.txt'):
+            return extract_text_from_txt(file_path)
+        else:
+            logger.warning("Unsupported file format: %s", file_path)
+            return ""
 
 if __name__ == '__main__':
     # Example usage (assuming you have a sample.pdf, sample.docx, sample.txt in the 'data' folder)
@@ -47,4 +168,4 @@ if __name__ == '__main__':
     txt_text = extract_text_from_file('data/sample.txt')
     print("PDF Text (first 200 chars):\n", pdf_text[:200] if pdf_text else "No PDF text")
     print("\nDOCX Text (first 200 chars):\n", docx_text[:200] if docx_text else "No DOCX text")
-    print("\nTXT Text (first 200 chars):\n", txt_text[:200] if txt_text else "No TXT text")
\ No newline at end of file
+    print("\nTXT Text (first 200 chars):\n", txt_text[:200] if txt_text else "No TXT text")
@@ -0,0 +1,362 @@
+# vector_store.py
+import bisect
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from collections import Counter
+
+import numpy as np
+
+from instrumentation import stage
+from matcher import combine_scores, pooled_idf, preprocess_text_for_tfidf, tfidf_analyzer, vectorize_job_description
+from parser import parse_cache_version
+from skill_taxonomy import SKILL_TAXONOMY
+
+logger = logging.getLogger(__name__)
+
+VECTOR_STORE_VERSION = 3
+FINALIZE_CHUNK_NNZ = 1 << 24 # Stored entries normalized per step while building (bounds build memory)
+
+# A build writes a new generation of the store into its own subdirectory; this file in the store
+# directory names the current one and is replaced atomically once the generation is complete
+_CURRENT_FILE = 'CURRENT'
+_GENERATION_PREFIX = 'generation-'
+
+# name -> .npy file; every array is opened with mmap_mode='r'
+_ARRAY_FILES = {
+    'data': 'data.npy', # L2-normalized TF-IDF weights (float32), CSR order
+    'indices': 'indices.npy', # Term IDs of 'data'
+    'indptr': 'indptr.npy', # Row offsets into data/indices (num_resumes + 1)
+    'idf': 'idf.npy', # Term ID -> smoothed IDF over the stored pool
+    'terms': 'vocabulary.npy', # Sorted terms, UTF-8, concatenated (uint8); the vocabulary file
+    'term_offsets': 'vocabulary_offsets.npy', # Term ID -> start of the term in 'terms' (num_terms + 1)
+    'keys': 'keys.npy', # Resume keys in row order, UTF-8, concatenated (uint8)
+    'key_offsets': 'keys_offsets.npy', # Row -> start of the key in 'keys' (num_resumes + 1)
+    'skill_ids': 'skill_ids.npy', # Interned skill IDs per resume (uint16), CSR order
+    'skill_indptr': 'skill_indptr.npy', # Row offsets into skill_ids
+}
+
+
+class _StringTable:
+    """
+    Read-only sequence of byte strings stored as one UTF-8 blob plus an offsets array (both mapped),
+    so variable-length strings take no padding. Supports bisect when the strings are sorted.
+    """
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.blob[int(self.offsets[i]):int(self.offsets[i + 1])].tobytes()
+
+    @staticmethod
+    def arrays(strings):
+        """
+        (blob, offsets) arrays for a list of str.
+        """
+        encoded = [string.encode('utf-8') for string in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(string) for string in encoded], out=offsets[1:])
+        return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+
+class VectorStore:
+    """
+    Precomputed TF-IDF vectors and skill IDs of a resume pool, stored as CSR arrays in .npy files
+    and opened with numpy.memmap. Opening maps the files without reading them, so it takes about the
+    same time for 1k or 1M resumes, and processes that open the same store share the page cache.
+    Scoring a JD vectorizes only the JD (vocabulary lookups are binary searches in the mapped, sorted
+    term blob) and runs one sparse matrix-vector product against the mapped matrix.
+    The store records the parser/taxonomy version (parse_cache_version()) it was built with and
+    refuses to open under another one, since its vectors and skill IDs would no longer match.
+    Files are never rewritten in place: a rebuild writes a new generation next to the current one
+    and switches to it atomically, so stores opened earlier (in this or other processes) keep
+    reading the arrays they mapped.
+    Scores are the same as MatcherIndex's for the same resumes, up to the float32 weights.
+    """
+
+    def __init__(self, store_dir, arrays, meta):
+        self.store_dir = store_dir
+        self.meta = meta
+        for name, array in arrays.items():
+            setattr(self, name, array)
+        self.num_terms = len(self.term_offsets) - 1
+        self._terms = _StringTable(self.terms, self.term_offsets)
+        self._keys = _StringTable(self.keys, self.key_offsets)
+        # Interned skill IDs as of build time: the default taxonomy's IDs plus any extra skills seen
+        self.skills = meta['skills']
+        self._skill_ids = None
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    @staticmethod
+    def generation_dir(store_dir):
+        """
+        Directory holding the arrays and meta.json of the store's current generation
+        (store_dir itself for stores built before generations were introduced).
+        """
+        try:
+            with open(os.path.join(store_dir, _CURRENT_FILE)) as f:
+                return os.path.join(store_dir, f.read().strip())
+        except FileNotFoundError:
+            return store_dir
+
+    @staticmethod
+    def read_meta(data_dir):
+        with open(os.path.join(data_dir, 'meta.json')) as f:
+            return json.load(f)
+
+    @classmethod
+    def is_current(cls, store_dir):
+        """
+        True if store_dir holds a store that open() accepts: same store format and parser/taxonomy version.
+        """
+        data_dir = cls.generation_dir(store_dir)
+        if not os.path.exists(os.path.join(data_dir, 'meta.json')):
+            return False
+        meta = cls.read_meta(data_dir)
+        return meta.get('version') == VECTOR_STORE_VERSION and meta.get('parse_version') == parse_cache_version()
+
+    @classmethod
+    def open(cls, store_dir):
+        data_dir = cls.generation_dir(store_dir)
+        meta = cls.read_meta(data_dir)
+        if meta.get('version') != VECTOR_STORE_VERSION:
+            raise ValueError(f"{store_dir} was built by an incompatible version ({meta.get('version')}); rebuild it")
+        parse_version = parse_cache_version()
+        if meta.get('parse_version') != parse_version:
+            raise ValueError(f"{store_dir} was built with parser version {meta.get('parse_version')} "
+                             f"(now {parse_version}); rebuild it")
+        arrays = {name: np.load(os.path.join(data_dir, file_name), mmap_mode='r') for name, file_name in _ARRAY_FILES.items()}
+        return cls(store_dir, arrays, meta)
+
+    @classmethod
+    def build(cls, store_dir, resumes):
+        """
+        Builds a store from an iterable of (key, resume_data) pairs (e.g. ingest.parse_resumes_parallel
+        output) and returns it opened. Resumes are consumed one at a time: term counts are spooled to
+        disk and only the vocabulary and document frequencies are kept in memory.
+        The store is written as a new generation and replaces any existing store in store_dir only
+        once complete; see publish().
+        """
+        os.makedirs(store_dir, exist_ok=True)
+        data_dir = os.path.join(store_dir, f'{_GENERATION_PREFIX}{time.time_ns()}-{os.getpid()}')
+        os.makedirs(data_dir)
+        try:
+            cls._build(data_dir, resumes)
+        except BaseException:
+            shutil.rmtree(data_dir, ignore_errors=True)
+            raise
+        cls.publish(store_dir, data_dir)
+        return cls.open(store_dir)
+
+    @classmethod
+    def _build(cls, data_dir, resumes):
+        analyzer = tfidf_analyzer()
+        vocabulary = {} # term -> build-time term ID
+        document_frequencies = []
+        skill_ids = dict(SKILL_TAXONOMY.ids) # Canonical taxonomy IDs; skills outside it get IDs after these
+        extra_skills = []
+        keys, row_lengths, skill_row_lengths = [], [], []
+
+        with tempfile.TemporaryDirectory(dir=data_dir) as spool_dir:
+            spool_term_ids_path = os.path.join(spool_dir, 'term_ids.bin')
+            spool_counts_path = os.path.join(spool_dir, 'counts.bin')
+            spool_skills_path = os.path.join(spool_dir, 'skills.bin')
+            with open(spool_term_ids_path, 'wb') as term_ids_file, open(spool_counts_path, 'wb') as counts_file, \
+                    open(spool_skills_path, 'wb') as skills_file:
+                for key, resume_data in resumes:
+                    if resume_data is None:
+                        continue
+                    term_counts = Counter(analyzer(preprocess_text_for_tfidf(resume_data.get('full_text', ''))))
+                    row_term_ids = []
+                    for term in term_counts:
+                        term_id = vocabulary.setdefault(term, len(vocabulary))
+                        if term_id == len(document_frequencies):
+                            document_frequencies.append(0)
+                        document_frequencies[term_id] += 1
+                        row_term_ids.append(term_id)
+                    term_ids_file.write(np.array(row_term_ids, dtype=np.int64).tobytes())
+                    counts_file.write(np.fromiter(term_counts.values(), dtype=np.float32, count=len(term_counts)).tobytes())
+                    row_lengths.append(len(term_counts))
+
+                    row_skill_ids = []
+                    for skill in set(resume_data.get('skills', [])):
+                        if skill not in skill_ids:
+                            skill_ids[skill] = len(skill_ids)
+                            extra_skills.append(skill)
+                        row_skill_ids.append(skill_ids[skill])
+                    skills_file.write(np.array(sorted(row_skill_ids), dtype=np.uint16).tobytes())
+                    skill_row_lengths.append(len(row_skill_ids))
+                    keys.append(key)
+
+            with stage('vectorize'):
+                cls._write_arrays(data_dir, vocabulary, document_frequencies, keys, row_lengths, skill_row_lengths,
+                                  spool_term_ids_path, spool_counts_path, spool_skills_path)
+
+        meta = {
+            'version': VECTOR_STORE_VERSION,
+            'parse_version': parse_cache_version(),
+            'num_resumes': len(keys),
+            'num_terms': len(vocabulary),
+            'skills': list(SKILL_TAXONOMY.skills) + extra_skills,
+        }
+        with open(os.path.join(data_dir, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def publish(cls, store_dir, data_dir):
+        """
+        Makes the generation in data_dir (a subdirectory of store_dir) the current one, by atomically
+        replacing the CURRENT file. The generation it replaces is kept, for readers that looked it up just
+        before the switch; older ones, and the files of a store built before generations, are deleted.
+        Deleting does not disturb processes that still have them mapped: on POSIX the pages stay valid
+        until unmapped, and where a mapped file can't be deleted it is left for the next build.
+        """
+        previous_dir = cls.generation_dir(store_dir)
+        current_path = os.path.join(store_dir, _CURRENT_FILE)
+        with open(f'{current_path}.{os.getpid()}.tmp', 'w') as f:
+            f.write(os.path.basename(data_dir))
+        os.replace(f.name, current_path)
+
+        keep = {os.path.basename(data_dir), os.path.basename(previous_dir)}
+        unversioned_files = set(_ARRAY_FILES.values()) | {'meta.json'} if previous_dir == store_dir else set()
+        for name in os.listdir(store_dir):
+            path = os.path.join(store_dir, name)
+            if name.startswith(_GENERATION_PREFIX) and name not in keep:
+                shutil.rmtree(path, ignore_errors=True)
+            elif name in unversioned_files:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _write_arrays(data_dir, vocabulary, document_frequencies, keys, row_lengths, skill_row_lengths,
+                      spool_term_ids_path, spool_counts_path, spool_skills_path):
+        def open_output(name, dtype, shape):
+            return np.lib.format.open_memmap(os.path.join(data_dir, _ARRAY_FILES[name]), mode='w+', dtype=dtype, shape=shape)
+
+        def save(name, array):
+            np.save(os.path.join(data_dir, _ARRAY_FILES[name]), array)
+
+        # Term IDs follow the sorted vocabulary, so lookups can binary-search the term array
+        sorted_terms = sorted(vocabulary)
+        remap = np.empty(len(vocabulary), dtype=np.int64)
+        remap[[vocabulary[term] for term in sorted_terms]] = np.arange(len(sorted_terms))
+        terms_blob, term_offsets = _StringTable.arrays(sorted_terms)
+        save('terms', terms_blob)
+        save('term_offsets', term_offsets)
+
+        idf = np.empty(len(vocabulary), dtype=np.float64)
+        idf[remap] = pooled_idf(document_frequencies, len(keys))
+        save('idf', idf)
+
+        indptr = np.zeros(len(keys) + 1, dtype=np.int64)
+        np.cumsum(row_lengths, out=indptr[1:])
+        nnz = int(indptr[-1])
+        # int32 indices where they fit, so scipy uses the mapped arrays without converting them
+        index_dtype = np.int32 if nnz < 2 ** 31 and len(vocabulary) < 2 ** 31 else np.int64
+        save('indptr', indptr.astype(index_dtype))
+        data = open_output('data', np.float32, (nnz,))
+        indices = open_output('indices', index_dtype, (nnz,))
+        if nnz:
+            spool_term_ids = np.memmap(spool_term_ids_path, dtype=np.int64, mode='r')
+            spool_counts = np.memmap(spool_counts_path, dtype=np.float32, mode='r')
+            # Whole rows per step, so each row's L2 norm is computed within one step
+            row_start = 0
+            while row_start < len(keys):
+                row_end = int(np.searchsorted(indptr, indptr[row_start] + FINALIZE_CHUNK_NNZ, side='right')) - 1
+                row_end = min(max(row_end, row_start + 1), len(keys))
+                start, end = int(indptr[row_start]), int(indptr[row_end])
+                term_ids = remap[spool_term_ids[start:end]]
+                weights = spool_counts[start:end] * idf[term_ids]
+                squared_sums = np.concatenate(([0.0], np.cumsum(weights * weights)))
+                local_indptr = indptr[row_start:row_end + 1] - start
+                row_norms = np.sqrt(squared_sums[local_indptr[1:]] - squared_sums[local_indptr[:-1]])
+                row_norms[row_norms == 0] = 1.0
+                weights /= np.repeat(row_norms, np.diff(local_indptr))
+                data[start:end] = weights
+                indices[start:end] = term_ids
+                row_start = row_end
+            del spool_term_ids, spool_counts
+        data.flush()
+        indices.flush()
+        del data, indices
+
+        skill_indptr = np.zeros(len(keys) + 1, dtype=np.int64)
+        np.cumsum(skill_row_lengths, out=skill_indptr[1:])
+        save('skill_indptr', skill_indptr)
+        save('skill_ids', np.fromfile(spool_skills_path, dtype=np.uint16))
+        keys_blob, key_offsets = _StringTable.arrays(keys)
+        save('keys', keys_blob)
+        save('key_offsets', key_offsets)
+
+    def key(self, row):
+        return self._keys[row].decode('utf-8')
+
+    def lookup_term_ids(self, terms):
+        """
+        Term IDs of 'terms' in the stored vocabulary (-1 where absent), by binary search in the mapped term blob.
+        UTF-8 bytes sort in code point order, the same order the vocabulary was sorted in.
+        """
+        term_ids = np.full(len(terms), -1, dtype=np.int64)
+        for i, term in enumerate(terms):
+            encoded = term.encode('utf-8')
+            position = bisect.bisect_left(self._terms, encoded)
+            if position < self.num_terms and self._terms[position] == encoded:
+                term_ids[i] = position
+        return term_ids
+
+    def _matrix(self):
+        from scipy.sparse import csr_matrix
+
+        # Built over the mapped arrays without copying them (dtypes already match what scipy expects)
+        return csr_matrix((self.data, self.indices, self.indptr), shape=(len(self), self.num_terms), copy=False)
+
+    def required_skills_coverage(self, required_skills):
+        """
+        (Weighted) fraction of 'required_skills' each stored resume has, from the mapped skill-ID arrays.
+        """
+        required_skills = set(required_skills)
+        required_weight = sum(SKILL_TAXONOMY.weight(skill) for skill in required_skills)
+        if required_weight <= 0:
+            return np.zeros(len(self))
+        if self._skill_ids is None:
+            self._skill_ids = {skill: skill_id for skill_id, skill in enumerate(self.skills)}
+        required_weights = np.zeros(len(self.skills))
+        for skill in required_skills:
+            if skill in self._skill_ids:
+                required_weights[self._skill_ids[skill]] = SKILL_TAXONOMY.weight(skill)
+        matched = np.concatenate(([0], np.cumsum(required_weights[self.skill_ids])))
+        return (matched[self.skill_indptr[1:]] - matched[self.skill_indptr[:-1]]) / required_weight
+
+    def score_job(self, job_description_data):
+        """
+        Scores every stored resume against a job description.
+        Returns scores (0-100) as a NumPy array in row order; see key(row) for the resume behind each row.
+        """
+        num_resumes = len(self)
+        if not preprocess_text_for_tfidf(job_description_data.get('full_text', '')):
+            logger.error("Job description text is empty. Cannot perform matching.")
+            return np.zeros(num_resumes)
+
+        with stage('vectorize'):
+            job_term_ids, job_weights = vectorize_job_description(job_description_data, self.lookup_term_ids, self.idf,
+                                                                  pooled_idf(0, num_resumes))
+
+        with stage('score'):
+            job_vector = np.zeros(self.num_terms, dtype=np.float32)
+            job_vector[job_term_ids] = job_weights
+            general_similarity = self._matrix() @ job_vector
+            required_skills_score_component = self.required_skills_coverage(job_description_data.get('required_skills', []))
+            final_scores = combine_scores(required_skills_score_component, general_similarity.astype(np.float64))
+        return final_scores